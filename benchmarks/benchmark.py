@@ -0,0 +1,162 @@
+"""Benchmarks selective and full parsing against json.loads across document shapes.
+
+Every document shape is parsed by json.loads, by Parser without a pattern and by
+Parser with a pattern that selects a small part of the document. For each case
+the script records the best wall-clock time and throughput of several runs, the
+peak traced memory, and the memory blocks and bytes allocated while parsing that
+the result still holds. CPython keeps no count of blocks that are freed again
+before the parse returns; those show in the peak. The results are written as JSON
+so runs can be compared across releases:
+
+    python benchmarks/benchmark.py --size 1000000 --output results.json
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from selectivejsonparser import Parser, __version__
+
+
+def wide_object(size: int, rng: random.Random) -> Tuple[Any, str]:
+    """One flat object with many keys of mixed scalar values."""
+    document: Dict[str, Any] = {}
+    while len(document) * 24 < size:
+        index: int = len(document)
+        document[f"key{index}"] = rng.choice((index, index * 0.5, f"value{index}", True, None))
+    return document, "key0|key1"
+
+def deep_nesting(size: int, rng: random.Random) -> Tuple[Any, str]:
+    """Many subtrees of objects and arrays nested a hundred levels deep."""
+    subtrees: List[Any] = []
+    while len(subtrees) * 3000 < size:
+        subtree: Any = {"leaf": len(subtrees)}
+        for depth in range(100):
+            subtree = {"child": subtree, "data": [depth, depth + 1]} if depth % 2 else [{"child": subtree}, depth]
+        subtrees.append(subtree)
+    return {"count": len(subtrees), "subtrees": subtrees}, "count"
+
+def record_array(size: int, rng: random.Random) -> Tuple[Any, str]:
+    """A large array of small, uniform records."""
+    records: List[Dict[str, Any]] = []
+    while len(records) * 110 < size:
+        index: int = len(records)
+        records.append({"id": index, "name": f"user{index}", "active": index % 3 == 0, "score": rng.random(),
+                        "tags": ["a", "b"], "address": {"city": "Springfield", "zip": f"{index % 99999:05d}"}})
+    return {"records": records}, "records[id]"
+
+def string_heavy(size: int, rng: random.Random) -> Tuple[Any, str]:
+    """Records dominated by long strings, some with escape sequences."""
+    alphabet: str = string.ascii_letters + string.digits + ' "\\/\n\t'
+    records: List[Dict[str, Any]] = []
+    total: int = 0
+    while total < size:
+        text: str = "".join(rng.choice(alphabet) for _ in range(rng.randint(50, 400)))
+        records.append({"id": len(records), "title": text[:40], "body": text})
+        total += len(text) * 2
+    return records, "[id]"
+
+def number_heavy(size: int, rng: random.Random) -> Tuple[Any, str]:
+    """Arrays of integers and floats, as in numeric time series."""
+    series: List[List[Any]] = []
+    total: int = 0
+    while total < size:
+        series.append([rng.randint(-10 ** 6, 10 ** 6) if rng.random() < 0.5 else rng.uniform(-1e3, 1e3) for _ in range(100)])
+        total += 1400
+    return {"count": len(series), "series": series}, "count"
+
+SHAPES: Dict[str, Callable[[int, random.Random], Tuple[Any, str]]] = {
+    "wide_object": wide_object,
+    "deep_nesting": deep_nesting,
+    "record_array": record_array,
+    "string_heavy": string_heavy,
+    "number_heavy": number_heavy,
+}
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Times function, then runs it once more under tracemalloc to measure memory."""
+    best: float = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    before: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result: Any = function()
+    _, peak = tracemalloc.get_traced_memory()
+    after: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    # The snapshots are traced as well, so what tracemalloc allocates is left out.
+    ignored: List[tracemalloc.Filter] = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained: List[tracemalloc.StatisticDiff] = after.filter_traces(ignored).compare_to(before.filter_traces(ignored), "filename")
+    return {
+        "seconds": best,
+        "peak_bytes": peak,
+        "retained_blocks": sum(statistic.count_diff for statistic in retained),
+        "retained_bytes": sum(statistic.size_diff for statistic in retained),
+    }
+
+def run(shapes: List[str], size: int, repeat: int, seed: int) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for shape in shapes:
+        document, pattern = SHAPES[shape](size, random.Random(seed))
+        text: str = json.dumps(document)
+        cases: List[Tuple[str, Optional[str], Callable[[], Any]]] = [
+            ("json.loads", None, lambda: json.loads(text)),
+            ("Parser", None, lambda: Parser(text).parse()),
+            ("Parser", pattern, lambda: Parser(text, pattern).parse()),
+        ]
+        for name, case_pattern, function in cases:
+            measurement: Dict[str, Any] = measure(function, repeat)
+            measurement.update({
+                "shape": shape,
+                "parser": name,
+                "pattern": case_pattern,
+                "bytes": len(text.encode("utf-8")),
+                "megabytes_per_second": len(text.encode("utf-8")) / measurement["seconds"] / 1e6,
+            })
+            results.append(measurement)
+            print(f"{shape:>14} {name:>10} {case_pattern or '-':>14} {measurement['seconds'] * 1000:10.1f} ms "
+                  f"{measurement['megabytes_per_second']:8.2f} MB/s {measurement['peak_bytes'] / 1e6:10.2f} MB peak "
+                  f"{measurement['retained_blocks']:10d} blocks retained",
+                  file=sys.stderr)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "size": size,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1 << 20, help="approximate document size in bytes")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case; the best is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the document generators")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES), help="document shapes to run")
+    parser.add_argument("--output", help="write the JSON results to this file instead of standard output")
+    options: argparse.Namespace = parser.parse_args(arguments)
+    report: Dict[str, Any] = run(options.shapes, options.size, options.repeat, options.seed)
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,7 @@ SelectiveJSONParser - A memory-efficient JSON parser that extracts only the data
 
 __version__ = "0.0.8"
 
-__all__ = ["Parser", "Pattern", "parse", "__version__"]
\ No newline at end of file
+from selectivejsonparser.parser import Parser, StreamParser, MappedParser, LinesParser, ParallelParser, LazyParser, MultiParser, AsyncParser, ColumnParser, Column, IndexedParser, StructuralIndex, ParseStats, RecordParser, ResultCache, parse, parse_lines, parse_many, parse_columns, build_index, parse_records, instrument, iter_matches
+from selectivejsonparser.pattern import Pattern, compile
+
+__all__ = ["Parser", "StreamParser", "MappedParser", "LinesParser", "ParallelParser", "LazyParser", "MultiParser", "AsyncParser", "ColumnParser", "Column", "IndexedParser", "StructuralIndex", "ParseStats", "RecordParser", "ResultCache", "Pattern", "compile", "parse", "parse_lines", "parse_many", "parse_columns", "build_index", "parse_records", "instrument", "iter_matches", "__version__"]
\ No newline at end of file
@@ -1 +1,13 @@
-from .parser import Parser, json
\ No newline at end of file
+from .parser import Parser, json, parse, iter_matches
+from .stream_parser import StreamParser
+from .mapped_parser import MappedParser
+from .lines_parser import LinesParser, parse_lines
+from .parallel_parser import ParallelParser
+from .lazy_parser import LazyParser, LazyDict, LazyList
+from .multi_parser import MultiParser, parse_many
+from .async_parser import AsyncParser
+from .column_parser import ColumnParser, Column, parse_columns
+from .indexed_parser import IndexedParser, StructuralIndex, build_index
+from .record_parser import RecordParser, parse_records
+from .result_cache import ResultCache, FrozenDict, FrozenList
+from .instrument import ParseStats, instrument
@@ -0,0 +1,136 @@
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.parser import Path, _SKIP_TO_BRACKET, _WHITESPACE
+from selectivejsonparser.parser.stream_parser import Chunk, StreamParser
+from selectivejsonparser.pattern import Pattern
+
+# Consumes whitespace and a comma, then a key and its colon; only complete when followed by more text.
+_KEY = re.compile(r'[ \t\n\r]*(?:,[ \t\n\r]*)?(?:("[^"\\]*(?:\\.[^"\\]*)*")[ \t\n\r]*:[ \t\n\r]*)?')
+# Consumes everything up to the next comma, bracket or brace, stepping over complete strings.
+_SKIP_TO_BOUNDARY = re.compile(r'[^",\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^",\[\]{}]*)*', re.DOTALL)
+# The longest time, in seconds, spent parsing buffered input before control returns to the event loop.
+_SLICE = 0.01
+
+
+class AsyncParser(StreamParser):
+    """A selective JSON parser fed incrementally from asyncio code.
+
+    Chunks are pushed with feed() and close(), or pulled from an async iterator of
+    byte chunks such as an aiohttp or httpx response stream. Iterating with
+    `async for` yields the pairs of iter_matches() as soon as the input holding
+    each one has arrived. The walk through the document carries over from chunk to
+    chunk: before a member is parsed, the buffered text is scanned for its end, and
+    until that has arrived the parser waits for input rather than parsing, so the
+    event loop is only held for as long as it takes to parse what was received.
+
+    Attributes:
+        source (AsyncIterable[bytes] | None): The chunks to read, or None if they are fed.
+        chunk_size (int): How much parsed text is kept before it is released.
+    """
+    def __init__(self, source: Optional[AsyncIterable[Chunk]] = None, pattern: Optional[Union[str, Pattern]] = None,
+                 chunk_size: int = 65536) -> None:
+        super().__init__((), pattern, chunk_size)
+        self.source: Optional[AsyncIterable[Chunk]] = source
+        self._received: asyncio.Event = asyncio.Event()
+        # The position and extent of a scan that ran out of text, where it stopped, and its depth there.
+        self._scan: Optional[List[Any]] = None
+        # A comma or bracket that ends whatever value the position is in, at any depth.
+        self._horizon: int = 0
+
+    def feed(self, chunk: Chunk) -> None:
+        """Appends a chunk of the document."""
+        if self._exhausted:
+            raise ValueError("Cannot feed a closed parser")
+        self.text += chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+        self._received.set()
+
+    def close(self) -> None:
+        """Marks the end of the document."""
+        if not self._exhausted:
+            self.text += self._decoder.decode(b"", final=True)
+            self._exhausted = True
+            self._received.set()
+
+    def __aiter__(self) -> AsyncIterator[Tuple[Path, Any]]:
+        return self._matches()
+
+    async def _matches(self) -> AsyncIterator[Tuple[Path, Any]]:
+        chunks: Optional[AsyncIterator[Chunk]] = None if self.source is None else self.source.__aiter__()
+        while not self._exhausted and _WHITESPACE.match(self.text, self.position).end() == len(self.text):
+            await self._receive(chunks)
+        deadline: float = time.monotonic() + _SLICE
+        for match in self.iter_matches():
+            if match is None:
+                await self._receive(chunks)
+                deadline = time.monotonic() + _SLICE
+                continue
+            yield match
+            if time.monotonic() >= deadline:
+                await asyncio.sleep(0)
+                deadline = time.monotonic() + _SLICE
+
+    async def _receive(self, chunks: Optional[AsyncIterator[Chunk]]) -> None:
+        """Waits for the next chunk, or for the end of the document."""
+        if chunks is None:
+            self._received.clear()
+            await self._received.wait()
+            return
+        try:
+            chunk: Chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            self.close()
+        else:
+            self.feed(chunk)
+
+    def _available(self, extent: str) -> bool:
+        if self._exhausted:
+            return True
+        if extent == "input":
+            return False
+        text: str = self.text
+        if extent == "key" or extent == "item":
+            match: re.Match = _KEY.match(text, self.position)
+            char: str = text[match.end():match.end() + 1]
+            # A key, or a comma, may be cut off by the end of the text.
+            return char != "" and (extent == "item" or match.lastindex is not None or (char != ',' and char != '"'))
+        if extent == "value" and self.position < self._horizon:
+            return True
+        scan: Optional[List[Any]] = self._scan
+        if scan is None or scan[0] != self.position or scan[1] != extent:
+            scan = self._scan = [self.position, extent, self.position, 0]
+        _, _, position, depth = scan
+        found: bool = False
+        while True:
+            end: int = (_SKIP_TO_BOUNDARY if depth == 0 else _SKIP_TO_BRACKET).match(text, position).end()
+            char = text[end:end + 1]
+            if not char or char == '"':
+                if found:
+                    return True
+                # The text ends, possibly inside a string: resume from here once more arrives.
+                scan[2:] = [end, depth]
+                return False
+            if char == '{' or char == '[':
+                depth += 1
+            elif char == '}' or char == ']':
+                if depth == 0:
+                    self._horizon = end
+                    return True
+                depth -= 1
+            elif extent == "value":
+                # Values up to the last comma of the container in the text are complete as well.
+                self._horizon = end
+                found = True
+            position = end + 1
+
+    def _fill(self) -> bool:
+        # Text is appended by feed(), and only parsed once it is complete.
+        return False
+
+    def _discard(self) -> None:
+        position: int = self.position
+        super()._discard()
+        self._horizon -= position - self.position
+        self._scan = None
@@ -0,0 +1,365 @@
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.parser import Parser, null, unexpected, _STRING_BODY, _WHITESPACE
+from selectivejsonparser.pattern import Pattern
+from selectivejsonparser.pattern.element import Array, Dictionary, Element, Filter, Value
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Column:
+    """The values of one field, with one entry per selected item.
+
+    Integers are stored in an array.array of type "q" and floats in one of type "d";
+    a column holding both stores floats. Any other value, such as a string, a boolean,
+    an object or an integer too large for 64 bits, turns the column into a list. Where
+    an item lacks the field or it is null, `valid` holds 0 and `values` holds 0, or
+    None in a list.
+
+    Attributes:
+        name (str): The path of the field within an item, with nested keys joined by dots.
+        values (array | list | numpy.ndarray): The values of the field.
+        valid (bytearray | numpy.ndarray): 1 where an item has a value for the field, 0 where it does not.
+    """
+    __slots__ = ("name", "values", "valid")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.values: Any = array("q")
+        self.valid: Any = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def __repr__(self) -> str:
+        return f"Column({self.name!r}, {self.values!r})"
+
+    def _put(self, row: int, value: Any) -> None:
+        """Stores the value of the field in row, unless the row already has one."""
+        if len(self.valid) < row:
+            self._pad(row)
+        elif len(self.valid) > row:
+            return  # A key repeated in an object keeps its first value.
+        values: Any = self.values
+        if value is None:
+            values.append(None if values.__class__ is list else 0)
+            self.valid.append(0)
+            return
+        kind: type = value.__class__
+        if values.__class__ is array and (kind is int or kind is float):
+            if kind is float and values.typecode == "q":
+                values = self.values = array("d", values)
+            try:
+                values.append(value)
+            except OverflowError:
+                values = self._listed()
+                values.append(value)
+        else:
+            if values.__class__ is not list:
+                values = self._listed()
+            values.append(value)
+        self.valid.append(1)
+
+    def _pad(self, rows: int) -> None:
+        """Marks the field as missing in every row up to rows."""
+        missing: int = rows - len(self.valid)
+        if missing > 0:
+            self.values.extend([None if self.values.__class__ is list else 0] * missing)
+            self.valid.extend(bytes(missing))
+
+    def _listed(self) -> List[Any]:
+        self.values = [value if valid else None for value, valid in zip(self.values, self.valid)]
+        return self.values
+
+class _Field:
+    """A selected member of the objects at one path: the column its values go to, or the fields of its own members."""
+    __slots__ = ("element", "column", "fields", "prefix", "others", "row")
+
+    def __init__(self, element: Element, name: str) -> None:
+        self.element: Element = element
+        nested: bool = isinstance(element, Dictionary)
+        self.column: Optional[Column] = None if nested else Column(name)
+        self.fields: Optional[Dict[str, _Field]] = {} if nested else None
+        self.prefix: str = name + "."
+        # For a nested field, the column of the values that are not objects, which Parser keeps as they are.
+        self.others: Optional[Column] = None
+        # The last row the member was found in.
+        self.row: int = -1
+
+class ColumnParser(Parser):
+    """Selects fields of the items of an array into one column per field.
+
+    The pattern leads to an array through single keys and names the fields of its
+    items, as in "data[id|price|ts]". Slices and predicates select the items as they
+    do for Parser, nested fields such as "[meta.ts|source]" give columns named by their
+    dotted path, and a wildcard adds a column for every key it meets. As "|" binds
+    tighter than ".", "[id|meta.ts]" reads "ts" from both "id" and "meta"; where a
+    nested field holds a value that is not an object, as "id" would, Parser keeps the
+    value itself, and so it goes to a column named by the field's path. Each selected
+    item is one row. Its values are written straight into their columns, so no object
+    is built per item; items that are not objects are rows in which every field is
+    missing. Only the array is read, and once an item has every member the pattern
+    names, the rest of it is skipped without being validated.
+
+    Attributes:
+        text (str): The JSON string to parse.
+        pattern (Pattern): The compiled pattern.
+        numpy (bool): Whether numeric columns and validity masks are returned as NumPy arrays.
+            By default they are when NumPy is installed.
+    """
+    def __init__(self, text: str, pattern: Union[str, Pattern], numpy: Optional[bool] = None) -> None:
+        super().__init__(text, pattern)
+        self.numpy: bool = _numpy_installed() if numpy is None else numpy
+        if self.numpy and not _numpy_installed():
+            raise ImportError("NumPy is not installed")
+        self.columns: Dict[str, Column] = {}
+
+    def parse(self) -> Dict[str, Column]:
+        """Returns the columns by name, in the order the pattern names them, then as they are met."""
+        keys, items, item = _layout(self.pattern)
+        self.columns = {}
+        fields: Dict[str, _Field] = {}
+        self._declare(item, fields, "")
+        self._skip_whitespace()
+        char: Optional[str] = self._char()
+        if char != '{' and char != '[':
+            raise ValueError("No JSON object or array found")
+        rows: int = self._read_items(items, item, fields) if self._locate(keys) else 0
+        for column in self.columns.values():
+            column._pad(rows)
+            if self.numpy:
+                _to_numpy(column)
+        return self.columns
+
+    def _locate(self, keys: Tuple[str, ...]) -> bool:
+        """Moves to the value at the keys, returning whether it is an array."""
+        for key in keys:
+            if self._char() != '{':
+                return False
+            self.position += 1
+            self._skip_whitespace()
+            if self._char() == '}':
+                return False
+            while True:
+                name: Optional[str] = self._parse_string()
+                if name is None:
+                    raise ValueError("Expected string key")
+                self._colon()
+                if name == key:
+                    break
+                if self._skip_value() is None:
+                    raise ValueError("Expected value after colon")
+                if not self._next_member():
+                    return False
+        return self._char() == '['
+
+    def _read_items(self, element: Array, item: Dictionary, fields: Dict[str, _Field]) -> int:
+        """Writes the selected items of the array at the current position into their rows,
+        moves past it and returns how many rows there are."""
+        rows: int = 0
+        if element.from_end:
+            starts: List[int] = self._item_starts()
+            end: int = self.position + 1
+            for index in element.indices(len(starts)):
+                self.position = starts[index]
+                if self._read_item(element.item(index, len(starts)), item, fields, rows):
+                    rows += 1
+            self.position = end
+            return rows
+        self.position += 1
+        self._skip_whitespace()
+        if self._char() == ']':
+            self.position += 1
+            return rows
+        index: int = 0
+        while True:
+            child: Optional[Element] = element[index]
+            if child is not None:
+                if self._read_item(child, item, fields, rows):
+                    rows += 1
+            elif element.exhausted(index):
+                self._skip_container(1)
+                return rows
+            elif self._skip_value() is None:
+                raise ValueError("Expected closing square brace")
+            self._skip_whitespace()
+            char: Optional[str] = self._char()
+            if char == ']':
+                self.position += 1
+                return rows
+            if char != ',':
+                raise ValueError("Expected closing square brace")
+            self.position += 1
+            self._skip_whitespace()
+            index += 1
+
+    def _read_item(self, element: Element, item: Dictionary, fields: Dict[str, _Field], row: int) -> bool:
+        """Writes the item at the current position into row, returning whether it is selected."""
+        char: Optional[str] = self._char()
+        if element.predicates is not None and (char == '{' or char == '['):
+            if self._filter(element, self.position) is None:
+                return False
+        elif element.predicates is not None:
+            if self._skip_value() is None:
+                raise ValueError("Expected closing square brace")
+            return False
+        if char == '{':
+            self._read_object(item, fields, "", row)
+        elif self._skip_value() is None:
+            raise ValueError("Expected closing square brace")
+        return True
+
+    def _read_object(self, element: Element, fields: Dict[str, _Field], prefix: str, row: int) -> None:
+        """Writes the selected members of the object at the current position into row."""
+        whitespace: Any = _WHITESPACE.match
+        text: str = self.text
+        position: int = whitespace(text, self.position + 1).end()
+        if text[position:position + 1] == '}':
+            self.position = position + 1
+            return
+        found: int = 0
+        while True:
+            if text[position:position + 1] != '"':
+                raise ValueError("Expected string key")
+            end: int = _STRING_BODY.match(text, position + 1).end()
+            if text[end:end + 1] != '"':
+                raise ValueError("Unterminated string")
+            key: str = text[position + 1:end]
+            position = end + 1
+            char: str = text[position:position + 1]
+            if char != ':':
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+                if char != ':':
+                    raise ValueError("Expected colon after key")
+            position += 1
+            char = text[position:position + 1]
+            if char in ' \t\n\r':
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+            field: Optional[_Field] = fields.get(key)
+            if field is None:
+                child: Optional[Element] = element[key]
+                if child is not None:
+                    field = fields[key] = self._field(child, prefix + key)
+            if field is not None and field.column is not None and char != '{' and char != '[':
+                value: Any = self._parse_scalar(text, position, char) if char else None
+                if value is None:
+                    raise ValueError("Expected value after colon")
+                field.column._put(row, None if value is null else value)
+                position = self.position
+            elif field is None and char == '"':
+                end = _STRING_BODY.match(text, position + 1).end()
+                if text[end:end + 1] != '"':
+                    raise ValueError("Unterminated string")
+                position = end + 1
+            else:
+                self.position = position
+                if field is None:
+                    if self._skip_value() is None:
+                        raise ValueError("Expected value after colon")
+                elif field.column is None and char == '{':
+                    self._read_object(field.element, field.fields, field.prefix, row)
+                else:
+                    value = self._parse_member(field.element, char, True)
+                    if value is not unexpected:
+                        (field.column if field.column is not None else self._others(field))._put(row, value)
+                position = self.position
+            if field is not None and field.row != row:
+                field.row = row
+                found += 1
+                if found == element.selected_keys:
+                    # Every selected member is found, and a repeated key keeps its first value.
+                    self.position = position
+                    self._skip_container(1)
+                    return
+            char = text[position:position + 1]
+            if char in ' \t\n\r':
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+            if char == ',':
+                position += 1
+                char = text[position:position + 1]
+                if char in ' \t\n\r':
+                    position = whitespace(text, position).end()
+            elif char == '}':
+                self.position = position + 1
+                return
+            else:
+                raise ValueError("Expected closing curly brace")
+
+    def _declare(self, element: Dictionary, fields: Dict[str, _Field], prefix: str) -> None:
+        """Adds the fields the pattern names, so their columns exist even if no item has them."""
+        for key, child in element.children.items():
+            field: _Field = self._field(child, prefix + key)
+            fields[key] = field
+            if field.fields is not None:
+                self._declare(child, field.fields, field.prefix)
+
+    def _field(self, element: Element, name: str) -> _Field:
+        field: _Field = _Field(element, name)
+        if field.column is not None:
+            self.columns[name] = field.column
+        return field
+
+    def _others(self, field: _Field) -> Column:
+        """Returns the column of the values of a nested field that are not objects, adding it the first time."""
+        if field.others is None:
+            field.others = self.columns[field.prefix[:-1]] = Column(field.prefix[:-1])
+        return field.others
+
+    def _colon(self) -> None:
+        self._skip_whitespace()
+        if self._char() != ':':
+            raise ValueError("Expected colon after key")
+        self.position += 1
+        self._skip_whitespace()
+
+    def _next_member(self) -> bool:
+        """Moves past the separator after a member, returning whether another member follows."""
+        self._skip_whitespace()
+        char: Optional[str] = self._char()
+        if char == '}':
+            self.position += 1
+            return False
+        if char != ',':
+            raise ValueError("Expected closing curly brace")
+        self.position += 1
+        self._skip_whitespace()
+        return True
+
+def parse_columns(text: str, pattern: Union[str, Pattern], numpy: Optional[bool] = None) -> Dict[str, Column]:
+    """Parses a JSON string, returning the selected fields of the items of an array as columns."""
+    return ColumnParser(text, pattern, numpy).parse()
+
+def _layout(pattern: Pattern) -> Tuple[Tuple[str, ...], Array, Dictionary]:
+    """Returns the keys that lead to the array the pattern selects items of, its element,
+    and the element of the fields of its items."""
+    keys: List[str] = []
+    element: Optional[Element] = pattern.element
+    while isinstance(element, Dictionary) and element.wildcard is None and len(element.children) == 1:
+        key, element = next(iter(element.children.items()))
+        keys.append(key)
+    if isinstance(element, Array) and element.children:
+        item: Element = element.children[0]
+        if isinstance(item, Filter):
+            item = item.element
+        if item.leaf:
+            # Whole items are selected, so every field is.
+            item = Dictionary()
+            item['*'] = Value()
+        if isinstance(item, Dictionary):
+            return tuple(keys), element, item
+    raise ValueError(f"Pattern does not select fields of array items: {pattern.pattern}")
+
+def _numpy_installed() -> bool:
+    return numpy is not None
+
+def _to_numpy(column: Column) -> None:
+    if column.values.__class__ is array:
+        column.values = numpy.frombuffer(column.values, numpy.int64 if column.values.typecode == "q" else numpy.float64)
+    column.valid = numpy.frombuffer(column.valid, numpy.bool_)
@@ -0,0 +1,286 @@
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import Any, List, Optional, Sequence, Union
+
+from selectivejsonparser.parser.parser import Parser, json, null, unexpected, _SKIP_SCALAR, _STRING_BODY, _WHITESPACE
+from selectivejsonparser.pattern import Pattern
+from selectivejsonparser.pattern.element import Element
+
+PathLike = Union[str, bytes, os.PathLike]
+
+# Magic, version, text length, fingerprint, number of containers, number of members and table type code.
+_HEADER = struct.Struct("=4sIqQqq4s")
+_MAGIC = b"SJPI"
+_VERSION = 1
+# How much of each end of the text the fingerprint covers.
+_FINGERPRINT_SPAN = 1 << 16
+_TABLES = ("starts", "ends", "first", "counts", "key_starts", "key_ends", "values", "children")
+
+
+class StructuralIndex:
+    """The offsets of every container of a JSON text and of its members.
+
+    Containers are numbered in the order they open, the root being 0. For each one the
+    index holds where it starts and ends, and the range of its members in the member
+    tables. For each member it holds where its key starts and ends (-1 for array items),
+    where its value starts, and the number of the container the value is, or -1 for a
+    scalar. Every table is an array of integers, so the index can be saved next
+    to the document and mapped back into memory without being parsed. Offsets take
+    four bytes each in texts shorter than 2 GiB and eight bytes in longer ones.
+
+    Building the index validates the structure of the text, but not its scalars.
+
+    Attributes:
+        length (int): The length of the indexed text.
+        fingerprint (int): A checksum of the first and last 64 KiB of the indexed text. An
+            edit elsewhere that keeps the length of the text is not detected, so an index must
+            be rebuilt whenever its document changes.
+    """
+    def __init__(self, length: int, fingerprint: int, tables: Sequence[Sequence[int]], mapped: Optional[mmap.mmap] = None) -> None:
+        self.length: int = length
+        self.fingerprint: int = fingerprint
+        self.starts, self.ends, self.first, self.counts, self.key_starts, self.key_ends, self.values, self.children = tables
+        self._mapped: Optional[mmap.mmap] = mapped
+
+    @classmethod
+    def build(cls, text: str) -> "StructuralIndex":
+        """Indexes a JSON text in one pass."""
+        typecode: str = "i" if len(text) < 1 << 31 else "q"
+        tables: List[array] = [array(typecode) for _ in _TABLES]
+        starts, ends, first, counts, key_starts, key_ends, values, children = tables
+        whitespace: Any = _WHITESPACE.match
+        position: int = whitespace(text, 0).end()
+        if text[position:position + 1] not in ('{', '['):
+            raise ValueError("No JSON object or array found")
+        # Each frame holds the number of a container, whether it is an object, and its members
+        # as key start, key end, value start and container number, flattened into an array
+        # so that a large container does not hold a Python int per offset until it closes.
+        stack: List[Any] = []
+        opening: bool = True
+        while True:
+            if opening:
+                stack.append((len(starts), text[position] == '{', array(typecode)))
+                starts.append(position)
+                ends.append(0)
+                first.append(0)
+                counts.append(0)
+                position = whitespace(text, position + 1).end()
+                number, is_dict, members = stack[-1]
+                opening = False
+                char: str = text[position:position + 1]
+                if char != ('}' if is_dict else ']'):
+                    char = ''
+            if char == '':
+                # Read a member.
+                key_start: int = -1
+                key_end: int = -1
+                if is_dict:
+                    if text[position:position + 1] != '"':
+                        raise ValueError("Expected string key")
+                    key_start = position + 1
+                    key_end = _STRING_BODY.match(text, key_start).end()
+                    if text[key_end:key_end + 1] != '"':
+                        raise ValueError("Unterminated string")
+                    position = whitespace(text, key_end + 1).end()
+                    if text[position:position + 1] != ':':
+                        raise ValueError("Expected colon after key")
+                    position = whitespace(text, position + 1).end()
+                char = text[position:position + 1]
+                if char == '{' or char == '[':
+                    members.extend((key_start, key_end, position, len(starts)))
+                    opening = True
+                    continue
+                members.extend((key_start, key_end, position, -1))
+                if char == '"':
+                    end: int = _STRING_BODY.match(text, position + 1).end()
+                    if text[end:end + 1] != '"':
+                        raise ValueError("Unterminated string")
+                    position = end + 1
+                else:
+                    end = _SKIP_SCALAR.match(text, position).end()
+                    if end == position:
+                        raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+                    position = end
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+            # Move past the separator, or close containers until one has more members.
+            while True:
+                if char == ',':
+                    position = whitespace(text, position + 1).end()
+                    char = ''
+                    break
+                if char != ('}' if is_dict else ']'):
+                    raise ValueError("Expected closing curly brace" if is_dict else "Expected closing square brace")
+                position += 1
+                ends[number] = position
+                first[number] = len(values)
+                counts[number] = len(members) // 4
+                key_starts.extend(members[0::4])
+                key_ends.extend(members[1::4])
+                values.extend(members[2::4])
+                children.extend(members[3::4])
+                stack.pop()
+                if not stack:
+                    if whitespace(text, position).end() != len(text):
+                        raise ValueError("Unexpected data after JSON value")
+                    return cls(len(text), _fingerprint(text), tables)
+                number, is_dict, members = stack[-1]
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+
+    def save(self, path: PathLike) -> None:
+        """Writes the index to a file, such as a sidecar next to the document."""
+        with open(path, "wb") as file:
+            typecode: str = self.starts.format if isinstance(self.starts, memoryview) else self.starts.typecode
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self.length, self.fingerprint, len(self.starts), len(self.values), typecode.encode()))
+            for name in _TABLES:
+                file.write(getattr(self, name))
+
+    @classmethod
+    def load(cls, path: PathLike) -> "StructuralIndex":
+        """Maps an index written by save(). The tables are read from the mapping as they are used,
+        which stays open until the index is closed.
+
+        Only the length and fingerprint of the text are kept, so a file that was not rebuilt
+        after an edit of the middle of its document that kept its length is not detected as stale.
+        """
+        with open(path, "rb") as file:
+            mapped: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(mapped) < _HEADER.size:
+                raise ValueError(f"Truncated index file: {os.fsdecode(path)}")
+            magic, version, length, fingerprint, containers, members, typecode = _HEADER.unpack_from(mapped)
+            typecode = typecode.rstrip(b"\0").decode("ascii", "replace")
+            if magic != _MAGIC or version != _VERSION or typecode not in ("i", "q"):
+                raise ValueError(f"Unsupported index file: {os.fsdecode(path)}")
+            if len(mapped) != _HEADER.size + array(typecode).itemsize * 4 * (containers + members):
+                raise ValueError(f"Truncated index file: {os.fsdecode(path)}")
+            view: memoryview = memoryview(mapped)[_HEADER.size:].cast(typecode)
+            tables: List[memoryview] = []
+            offset: int = 0
+            for size in (containers,) * 4 + (members,) * 4:
+                tables.append(view[offset:offset + size])
+                offset += size
+        except BaseException:
+            mapped.close()
+            raise
+        return cls(length, fingerprint, tables, mapped)
+
+    def close(self) -> None:
+        """Releases the mapping of a loaded index."""
+        if self._mapped is not None:
+            for name in _TABLES:
+                getattr(self, name).release()
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self) -> "StructuralIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def matches(self, text: str) -> bool:
+        """Returns whether the index was built from the text, as far as its length and fingerprint tell.
+
+        The fingerprint covers the first and last 64 KiB only, which keeps the check cheap
+        for large documents: a stale index whose text was edited in the middle without
+        changing its length passes, and IndexedParser would then return wrong values.
+        """
+        return self.length == len(text) and self.fingerprint == _fingerprint(text)
+
+class IndexedParser(Parser):
+    """A selective JSON parser that answers patterns from a structural index of the text.
+
+    Objects and arrays on the way to the selected values are not scanned: their
+    members are found in the index, and only selected values are parsed, so a query
+    costs about as much as its result however large the document is. Building the
+    index costs one pass over the text, which pays off when several patterns are
+    selected from the same document. The result is the one Parser returns.
+
+    Recursive searches are answered by parsing the containers they apply to.
+
+    Attributes:
+        text (str): The JSON string to parse.
+        pattern (Pattern): The compiled pattern.
+        index (StructuralIndex): The index of the text; built from the text if not given.
+    """
+    def __init__(self, text: str, pattern: Optional[Union[str, Pattern]] = None, index: Optional[StructuralIndex] = None) -> None:
+        super().__init__(text, pattern)
+        if index is None:
+            index = StructuralIndex.build(text)
+        elif not index.matches(text):
+            raise ValueError("Index does not match the text")
+        self.index: StructuralIndex = index
+
+    def parse(self) -> json:
+        value: Any = self._select(0, self.pattern.element if self.pattern.has_pattern else None)
+        if value is unexpected:
+            return {} if self.text[self.index.starts[0]] == '{' else []
+        return value
+
+    def _select(self, number: int, element: Optional[Element]) -> Any:
+        """Returns what the element selects from a container, or unexpected if nothing is kept."""
+        index: StructuralIndex = self.index
+        text: str = self.text
+        start: int = index.starts[number]
+        if element is not None and element.predicates is not None:
+            element = self._filter(element, start)
+            if element is None:
+                return unexpected
+        if element is None or element.leaf or element.has_descendants:
+            self.position = start
+            container: Any = self._parse_container(element)
+            return container if container or element is None or element.accepts else unexpected
+        if element.needles is not None and not any(text.find(needle, start, index.ends[number]) >= 0 for needle in element.needles):
+            return unexpected
+        first: int = index.first[number]
+        count: int = index.counts[number]
+        result: Any
+        if text[start] == '{':
+            result = {}
+            for member in range(first, first + count):
+                key: str = text[index.key_starts[member]:index.key_ends[member]]
+                child: Optional[Element] = element[key]
+                if child is not None:
+                    value: Any = self._member(member, child)
+                    if value is not unexpected:
+                        result[key] = value
+        else:
+            result = []
+            for position in element.indices(count):
+                child = element.item(position, count)
+                if child is not None:
+                    value = self._member(first + position, child)
+                    if value is not unexpected:
+                        result.append(value)
+                elif element.exhausted(position):
+                    break
+        return result if result or element.accepts else unexpected
+
+    def _member(self, member: int, element: Element) -> Any:
+        number: int = self.index.children[member]
+        if number >= 0:
+            return self._select(number, element)
+        if not element.accepts:
+            return unexpected
+        position: int = self.index.values[member]
+        value: Any = self._parse_scalar(self.text, position, self.text[position])
+        if value is None:
+            raise ValueError("Expected value after colon")
+        return None if value is null else value
+
+def build_index(text: str, path: Optional[PathLike] = None) -> StructuralIndex:
+    """Indexes a JSON text, and saves the index to path if one is given."""
+    index: StructuralIndex = StructuralIndex.build(text)
+    if path is not None:
+        index.save(path)
+    return index
+
+def _fingerprint(text: str) -> int:
+    head: str = text[:_FINGERPRINT_SPAN]
+    tail: str = text[-_FINGERPRINT_SPAN:]
+    return zlib.crc32(tail.encode("utf-8", "surrogatepass"), zlib.crc32(head.encode("utf-8", "surrogatepass")))
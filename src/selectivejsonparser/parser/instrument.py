@@ -0,0 +1,235 @@
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from selectivejsonparser.parser.parser import Parser, Path
+from selectivejsonparser.pattern.element import Array, Element
+
+Hook = Callable[["ParseStats"], None]
+
+
+class ParseStats:
+    """Counters and timings of one parse of an instrumented parser.
+
+    Attributes:
+        characters (int): How much of the input the parse read, in characters (bytes for MappedParser).
+        skipped (int): How much of it was passed over by skipping values and the rest of containers
+            instead of being parsed. A scan that the parser returns from, to parse what it passed over,
+            is counted in `backtracks` instead.
+        containers (int): The objects and arrays in the result.
+        atoms (int): The strings, numbers, booleans and nulls in the result.
+        max_depth (int): The nesting depth of the result.
+        containers_skipped (int): The objects and arrays passed over without being built.
+        atoms_skipped (int): The scalars passed over without being built.
+        tests (int): The objects whose fields were tested against predicates.
+        rejected (int): The objects that failed their predicates.
+        searches (int): The containers searched for the keys of a recursive search.
+        misses (int): The searched containers that did not contain any of the keys, and were skipped.
+        backtracks (int): The times the parser returned to an earlier position: after a predicate test
+            that passed, a search that found a key, or the scan for where the items of an array start.
+        timings (Dict[str, float]): Seconds spent in each phase: "parse" for the whole parse, and "prefilter",
+            "filter", "search" and "range" for the parts spent on them, which may nest.
+    """
+    __slots__ = ("characters", "skipped", "containers", "atoms", "max_depth", "containers_skipped", "atoms_skipped",
+                 "tests", "rejected", "searches", "misses", "backtracks", "timings")
+
+    def __init__(self) -> None:
+        self.characters: int = 0
+        self.skipped: int = 0
+        self.containers: int = 0
+        self.atoms: int = 0
+        self.max_depth: int = 0
+        self.containers_skipped: int = 0
+        self.atoms_skipped: int = 0
+        self.tests: int = 0
+        self.rejected: int = 0
+        self.searches: int = 0
+        self.misses: int = 0
+        self.backtracks: int = 0
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def scanned(self) -> int:
+        """How much of the input was parsed rather than skipped."""
+        return self.characters - self.skipped
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the counters and timings by name, for a metrics or tracing system."""
+        stats: Dict[str, Any] = {name: getattr(self, name) for name in self.__slots__ if name != "timings"}
+        stats["scanned"] = self.scanned
+        stats.update((f"{phase}_seconds", seconds) for phase, seconds in self.timings.items())
+        return stats
+
+    def __repr__(self) -> str:
+        return f"ParseStats({', '.join(f'{name}={value!r}' for name, value in self.as_dict().items())})"
+
+    def _count(self, value: Any, depth: int) -> None:
+        """Adds a selected value, at a depth within the result, to the counters."""
+        stack: List[Tuple[Any, int]] = [(value, depth)]
+        while stack:
+            value, depth = stack.pop()
+            if isinstance(value, (dict, list)):
+                self.containers += 1
+                if depth + 1 > self.max_depth:
+                    self.max_depth = depth + 1
+                stack.extend((member, depth + 1) for member in (value.values() if isinstance(value, dict) else value))
+            else:
+                self.atoms += 1
+                if depth > self.max_depth:
+                    self.max_depth = depth
+
+def instrument(parser: Parser, hook: Optional[Hook] = None) -> Parser:
+    """Makes a parser collect statistics in `parser.stats`, and returns it.
+
+    The parser's class is replaced with a subclass that measures each parse and,
+    once it ends, calls hook with its ParseStats. Parsers that are not instrumented
+    run no measuring code at all.
+    """
+    if not isinstance(parser, Parser):
+        raise TypeError(f"Cannot instrument {type(parser).__name__}")
+    if not isinstance(parser, _Instrumented):
+        parser.__class__ = _instrumented(type(parser))
+    parser.stats = ParseStats()
+    parser.hook = hook
+    parser._released = 0
+    return parser
+
+_classes: Dict[type, type] = {}
+# Marks the end of the matches of the instrumented parser.
+_done: Any = object()
+
+def _instrumented(cls: type) -> type:
+    if cls not in _classes:
+        _classes[cls] = type(f"Instrumented{cls.__name__}", (_Instrumented, cls), {"__module__": cls.__module__})
+    return _classes[cls]
+
+class _Instrumented(Parser):
+    """Measures the parses of the parser class it is combined with."""
+    stats: ParseStats
+    hook: Optional[Hook]
+    # How much input a stream parser has released before its current text.
+    _released: int
+
+    def parse(self) -> Any:
+        self._begin()
+        start: float = time.perf_counter()
+        try:
+            result: Any = super().parse()
+            self.stats._count(result, 0)
+            return result
+        finally:
+            self._end(time.perf_counter() - start)
+
+    def iter_matches(self) -> Iterator[Tuple[Path, Any]]:
+        # Only the time spent producing matches is measured, not the time the caller holds them.
+        self._begin()
+        matches: Iterator[Tuple[Path, Any]] = super().iter_matches()
+        elapsed: float = 0.0
+        try:
+            while True:
+                start: float = time.perf_counter()
+                try:
+                    match: Any = next(matches, _done)
+                finally:
+                    elapsed += time.perf_counter() - start
+                if match is _done:
+                    return
+                if match is not None:
+                    self.stats._count(match[1], len(match[0]))
+                yield match
+        finally:
+            matches.close()
+            self._end(elapsed)
+
+    def _begin(self) -> None:
+        self.stats = ParseStats()
+        self._released = -self.position
+
+    def _end(self, elapsed: float) -> None:
+        self.stats.timings["parse"] = elapsed
+        self.stats.characters = self._offset()
+        if self.hook is not None:
+            self.hook(self.stats)
+
+    def _offset(self) -> int:
+        return self._released + self.position
+
+    def _time(self, phase: str, start: float) -> None:
+        timings: Dict[str, float] = self.stats.timings
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def _discard(self) -> None:
+        position: int = self.position
+        super()._discard()
+        self._released += position - self.position
+
+    def _skip_value(self) -> Any:
+        char: Optional[str] = self._char()
+        if char == '{' or char == '[':
+            return super()._skip_value()
+        offset: int = self._offset()
+        skipped: Any = super()._skip_value()
+        if skipped is not None:
+            self.stats.atoms_skipped += 1
+            self.stats.skipped += self._offset() - offset
+        return skipped
+
+    def _skip_container(self, depth: int = 0) -> None:
+        offset: int = self._offset()
+        super()._skip_container(depth)
+        self.stats.containers_skipped += 1
+        self.stats.skipped += self._offset() - offset
+
+    def _contains(self, needles: Optional[Tuple[str, ...]]) -> bool:
+        start: float = time.perf_counter()
+        try:
+            return super()._contains(needles)
+        finally:
+            self._time("prefilter", start)
+
+    def _search(self, needles: Tuple[str, ...], position: int) -> bool:
+        start: float = time.perf_counter()
+        stats: ParseStats = self.stats
+        skipped: Tuple[int, int] = (stats.skipped, stats.containers_skipped)
+        try:
+            found: bool = super()._search(needles, position)
+        finally:
+            self._time("search", start)
+        if self._rewindable:
+            stats.searches += 1
+            if found:
+                stats.skipped, stats.containers_skipped = skipped
+                stats.backtracks += 1
+            else:
+                stats.misses += 1
+        return found
+
+    def _filter(self, element: Element, position: int) -> Optional[Element]:
+        start: float = time.perf_counter()
+        stats: ParseStats = self.stats
+        skipped: Tuple[int, int, int] = (stats.skipped, stats.containers_skipped, stats.atoms_skipped)
+        try:
+            state: Optional[Element] = super()._filter(element, position)
+        finally:
+            self._time("filter", start)
+        stats.tests += 1
+        if state is None:
+            stats.rejected += 1
+        else:
+            stats.skipped, stats.containers_skipped, stats.atoms_skipped = skipped
+            stats.backtracks += 1
+        return state
+
+    def _item_starts(self) -> List[int]:
+        stats: ParseStats = self.stats
+        skipped: Tuple[int, int, int] = (stats.skipped, stats.containers_skipped, stats.atoms_skipped)
+        starts: List[int] = super()._item_starts()
+        stats.skipped, stats.containers_skipped, stats.atoms_skipped = skipped
+        stats.backtracks += 1
+        return starts
+
+    def _parse_range(self, element: Array) -> List[Any]:
+        start: float = time.perf_counter()
+        try:
+            return super()._parse_range(element)
+        finally:
+            self._time("range", start)
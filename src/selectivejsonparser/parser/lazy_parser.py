@@ -0,0 +1,215 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.parser import Parser, null, unexpected
+from selectivejsonparser.pattern.element import Element, Value
+
+
+class LazyParser(Parser):
+    """A selective JSON parser whose result is decoded on demand.
+
+    parse() only scans past the document to check that its brackets and strings are
+    balanced, and returns a LazyDict or LazyList that records offsets into the text.
+    A container indexes its own members the first time it is accessed, and a member
+    is decoded the first time it is read, then cached. Other malformed content is
+    reported when the part containing it is accessed.
+
+    A container that is kept only if something inside it is selected, as while searching
+    with "..key", is indexed together with its parent to tell, so that the result has the
+    members Parser would keep.
+    """
+    def parse(self) -> Union["LazyDict", "LazyList"]:
+        self._skip_whitespace()
+        start: int = self.position
+        char: Optional[str] = self._char()
+        if char == '{' or char == '[':
+            self._skip_container()
+        self._skip_whitespace()
+        if self._char() is not None:
+            raise ValueError("Unexpected data after JSON value")
+        if char != '{' and char != '[':
+            raise ValueError("No JSON object or array found")
+        return _lazy(self.text, start, self.pattern.element, self.pattern.has_pattern)
+
+
+class LazyDict(Mapping):
+    """A read-only mapping over an object in the source text, decoded member by member."""
+    def __init__(self, text: str, start: int, element: Optional[Element], selective: bool) -> None:
+        self._text: str = text
+        self._start: int = start
+        self._element: Optional[Element] = element
+        self._selective: bool = selective
+        self._members: Optional[Dict[str, Tuple[int, Optional[Element]]]] = None
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        start, element = self._index()[key]
+        value: Any = _decode(self._text, start, element, self._selective, "Expected closing curly brace")
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+    def materialize(self) -> Dict[str, Any]:
+        """Decodes the whole object into plain dicts and lists."""
+        return {key: _materialize(value) for key, value in self.items()}
+
+    def _index(self) -> Dict[str, Tuple[int, Optional[Element]]]:
+        if self._members is not None:
+            return self._members
+        members: Dict[str, Tuple[int, Optional[Element]]] = {}
+        parser: Parser = Parser(self._text)
+        parser.position = self._start + 1
+        parser._skip_whitespace()
+        if parser._char() == '}':
+            self._members = members
+            return members
+        while True:
+            key: Optional[str] = parser._parse_string()
+            if key is None:
+                raise ValueError("Expected string key")
+            parser._skip_whitespace()
+            if parser._char() != ':':
+                raise ValueError("Expected colon after key")
+            parser.position += 1
+            parser._skip_whitespace()
+            start: int = parser.position
+            element: Optional[Element] = self._element[key] if self._selective else None
+            if parser._skip_value() is None:
+                raise ValueError("Expected value after colon")
+            kept: Any = _probe(self._text, start, parser.position, element) if self._selective else None
+            if kept is not unexpected:
+                members[key] = (start, element)
+                if kept is not None:
+                    self._values[key] = kept
+            parser._skip_whitespace()
+            char: Optional[str] = parser._char()
+            if char == '}':
+                break
+            if char != ',':
+                raise ValueError("Expected closing curly brace")
+            parser.position += 1
+            parser._skip_whitespace()
+        self._members = members
+        return members
+
+
+class LazyList(Sequence):
+    """A read-only sequence over an array in the source text, decoded item by item."""
+    def __init__(self, text: str, start: int, element: Optional[Element], selective: bool) -> None:
+        self._text: str = text
+        self._start: int = start
+        self._element: Optional[Element] = element
+        self._selective: bool = selective
+        self._items: Optional[List[Tuple[int, Optional[Element]]]] = None
+        self._values: Dict[int, Any] = {}
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        items: List[Tuple[int, Optional[Element]]] = self._index()
+        if index < 0:
+            index += len(items)
+        if index in self._values:
+            return self._values[index]
+        start, element = items[index]
+        value: Any = _decode(self._text, start, element, self._selective, "Expected closing square brace")
+        self._values[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyList)):
+            return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+    def materialize(self) -> List[Any]:
+        """Decodes the whole array into plain dicts and lists."""
+        return [_materialize(value) for value in self]
+
+    def _index(self) -> List[Tuple[int, Optional[Element]]]:
+        if self._items is not None:
+            return self._items
+        spans: List[Tuple[int, int]] = []
+        parser: Parser = Parser(self._text)
+        parser.position = self._start + 1
+        while True:
+            parser._skip_whitespace()
+            start: int = parser.position
+            if parser._skip_value() is None:
+                break
+            spans.append((start, parser.position))
+            parser._skip_whitespace()
+            if parser._char() != ',':
+                break
+            parser.position += 1
+        if parser._char() != ']':
+            raise ValueError("Expected closing square brace")
+        items: List[Tuple[int, Optional[Element]]] = []
+        if not self._selective:
+            items = [(start, None) for start, _ in spans]
+        else:
+            for index in self._element.indices(len(spans)):
+                element: Optional[Element] = self._element.item(index, len(spans))
+                start, end = spans[index]
+                if element is not None and element.predicates is not None and self._text[start] in '{[':
+                    element = parser._filter(element, start)
+                kept: Any = _probe(self._text, start, end, element)
+                if kept is not unexpected:
+                    if kept is not None:
+                        self._values[len(items)] = kept
+                    items.append((start, element))
+        self._items = items
+        return items
+
+def _lazy(text: str, start: int, element: Optional[Element], selective: bool) -> Union[LazyDict, LazyList]:
+    # A leaf element selects the whole container.
+    selective = selective and element.__class__ is not Value
+    return LazyDict(text, start, element, selective) if text[start] == '{' else LazyList(text, start, element, selective)
+
+def _probe(text: str, start: int, end: int, element: Optional[Element]) -> Any:
+    """Returns unexpected if the value between start and end is dropped by its element.
+
+    A container the element does not accept is kept only if it has members, as in
+    Parser, so it is indexed to tell and returned when kept. Anything else kept gives None.
+    """
+    if element is None:
+        return unexpected
+    if element.accepts:
+        return None
+    if text[start] != '{' and text[start] != '[':
+        return unexpected
+    if element.needles is not None and all(text.find(needle, start, end) < 0 for needle in element.needles):
+        return unexpected
+    container: Union[LazyDict, LazyList] = _lazy(text, start, element, True)
+    return container if len(container) else unexpected
+
+def _decode(text: str, start: int, element: Optional[Element], selective: bool, closing: str) -> Any:
+    char: str = text[start]
+    if char == '{' or char == '[':
+        return _lazy(text, start, element, selective)
+    parser: Parser = Parser(text)
+    value: Any = parser._parse_scalar(text, start, char)
+    if value is None:
+        raise ValueError("Expected value after colon")
+    # The index skipped the whole token, so anything left of it is malformed.
+    if text[parser.position] not in ' \t\n\r,]}':
+        raise ValueError(closing)
+    return None if value is null else value
+
+def _materialize(value: Any) -> Any:
+    return value.materialize() if isinstance(value, (LazyDict, LazyList)) else value
@@ -0,0 +1,146 @@
+import re
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.parser import Parser, json
+from selectivejsonparser.pattern import Pattern, compile
+
+_INLINE_WHITESPACE = re.compile(r'[ \t\r]*')
+
+Source = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+
+class LinesParser:
+    """Parses newline-delimited JSON (JSON Lines / NDJSON), selecting the same pattern from every record.
+
+    The input is decoded in large blocks that end on a line boundary, and each record
+    is parsed in place within its block, so no string is created per line.
+
+    Attributes:
+        source (str | bytes | BinaryIO): The records as text, a UTF-8 bytes-like buffer or a binary file object.
+        pattern (Pattern): The compiled pattern applied to every record.
+        errors (str): What to do with malformed records: "raise" raises a ValueError naming the line,
+            "skip" drops the record and "collect" drops it and records the failure in `malformed`.
+        chunk_size (int): The approximate number of bytes decoded at a time.
+        first_line (int): The line number of the first line of the source, used in error reports.
+        malformed (List[Tuple[int, ValueError]]): The line numbers and errors of collected malformed records.
+        prefilter (bool): Whether to search each record for the keys the pattern needs before parsing it.
+            A record that contains none of them is neither parsed nor validated, and its result is an
+            empty object or array.
+    """
+    def __init__(self, source: Source, pattern: Optional[Union[str, Pattern]] = None, errors: str = "raise", chunk_size: int = 1 << 20, first_line: int = 1,
+                 prefilter: bool = False) -> None:
+        if errors not in ("raise", "skip", "collect"):
+            raise ValueError(f"Unknown error handling: {errors}")
+        self.source: Source = source
+        self.pattern: Pattern = pattern if isinstance(pattern, Pattern) else compile(pattern)
+        self.errors: str = errors
+        self.chunk_size: int = chunk_size
+        self.first_line: int = first_line
+        self.malformed: List[Tuple[int, ValueError]] = []
+        self.prefilter: bool = prefilter
+
+    def __iter__(self) -> Iterator[json]:
+        return self.parse()
+
+    def parse(self) -> Iterator[json]:
+        """Yields the selected result of every record, in order. Blank lines are ignored."""
+        parser: Parser = Parser("", self.pattern)
+        line: int = self.first_line
+        for block in self._blocks():
+            if isinstance(block, str):
+                yield from self._parse_block(parser, block, line)
+                line += block.count("\n")
+                continue
+            try:
+                text: str = str(block, "utf-8")
+            except UnicodeDecodeError:
+                # Fall back to decoding line by line, so only the offending records fail.
+                for raw in bytes(block).split(b"\n"):
+                    try:
+                        text = str(raw, "utf-8")
+                    except UnicodeDecodeError as exc:
+                        self._malformed(line, exc)
+                    else:
+                        yield from self._parse_block(parser, text, line)
+                    line += 1
+                line -= 1
+                continue
+            yield from self._parse_block(parser, text, line)
+            line += text.count("\n")
+
+    def _parse_block(self, parser: Parser, text: str, line: int) -> Iterator[json]:
+        parser.text = text
+        needles: Optional[Tuple[str, ...]] = self.pattern.needles if self.prefilter else None
+        position: int = 0
+        while position < len(text):
+            end: int = text.find("\n", position)
+            if end < 0:
+                end = len(text)
+            start: int = _INLINE_WHITESPACE.match(text, position, end).end()
+            if start < end:
+                if needles is not None and text[start] in '{[' and not any(text.find(needle, start, end) >= 0 for needle in needles):
+                    # The record cannot contain anything the pattern selects.
+                    yield {} if text[start] == '{' else []
+                else:
+                    try:
+                        yield self._parse_record(parser, start, end)
+                    except ValueError as exc:
+                        self._malformed(line + text.count("\n", 0, start), exc)
+            position = end + 1
+
+    def _parse_record(self, parser: Parser, start: int, end: int) -> json:
+        char: str = parser.text[start]
+        if char != '{' and char != '[':
+            raise ValueError("No JSON object or array found")
+        parser.position = start
+        result: json = parser._parse_container()
+        if parser.position > end:
+            # The record went on past the end of its line.
+            raise ValueError("Unterminated record")
+        position: int = _INLINE_WHITESPACE.match(parser.text, parser.position, end).end()
+        if position != end:
+            raise ValueError("Unexpected data after JSON value")
+        return result
+
+    def _malformed(self, line: int, exc: ValueError) -> None:
+        if self.errors == "raise":
+            raise ValueError(f"Malformed record on line {line}: {exc}") from exc
+        if self.errors == "collect":
+            self.malformed.append((line, exc))
+
+    def _blocks(self) -> Iterator[Any]:
+        """Yields the input in blocks of whole lines, as text or as undecoded bytes."""
+        source: Source = self.source
+        if isinstance(source, str):
+            yield source
+        elif hasattr(source, "read"):
+            pending: Any = b""
+            while True:
+                chunk: Any = source.read(self.chunk_size)
+                if not chunk:
+                    break
+                pending = pending + chunk if pending else chunk
+                cut: int = pending.rfind(b"\n" if isinstance(pending, bytes) else "\n")
+                if cut >= 0:
+                    yield pending[:cut + 1]
+                    pending = pending[cut + 1:]
+            if pending:
+                yield pending
+        else:
+            if not hasattr(source, "rfind"):
+                source = bytes(source)
+            buffer: memoryview = memoryview(source)
+            start: int = 0
+            while start < len(buffer):
+                stop: int = min(start + self.chunk_size, len(buffer))
+                if stop < len(buffer):
+                    cut = source.rfind(b"\n", start, stop)
+                    if cut < 0:
+                        cut = source.find(b"\n", stop)
+                    stop = len(buffer) if cut < 0 else cut + 1
+                yield buffer[start:stop]
+                start = stop
+
+def parse_lines(source: Source, pattern: Optional[Union[str, Pattern]] = None, errors: str = "raise", prefilter: bool = False) -> Iterator[json]:
+    """Yields the selected result of every record in newline-delimited JSON."""
+    return LinesParser(source, pattern, errors, prefilter=prefilter).parse()
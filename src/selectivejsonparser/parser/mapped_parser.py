@@ -0,0 +1,103 @@
+import codecs
+import contextlib
+import mmap
+import os
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.parser import Path, json
+from selectivejsonparser.parser.stream_parser import StreamParser
+from selectivejsonparser.pattern import Pattern
+
+PathLike = Union[str, bytes, os.PathLike]
+
+
+class MappedParser(StreamParser):
+    """A selective JSON parser over a memory-mapped UTF-8 file.
+
+    The mapped bytes are scanned window by window as Latin-1 text, which maps every
+    byte to one character, so positions are byte offsets and multi-byte sequences can
+    never be mistaken for JSON syntax. Only the keys and strings that end up in the
+    result are decoded as UTF-8, and the pattern's keys are encoded the same way to
+    be matched against the raw bytes. Invalid UTF-8 outside the selection goes unnoticed.
+    With prefilter, the whole mapped file is searched for the keys the pattern needs.
+
+    Attributes:
+        path (str): The path of the file to parse.
+        chunk_size (int): The number of bytes scanned per window.
+    """
+    def __init__(self, path: PathLike, pattern: Optional[Union[str, Pattern]] = None, chunk_size: int = 1 << 20, early_exit: bool = False,
+                 prefilter: bool = False) -> None:
+        super().__init__((), pattern, chunk_size, early_exit)
+        self.path: PathLike = path
+        self.prefilter = prefilter
+        self._map: Optional[mmap.mmap] = None
+        self._decoder = codecs.getincrementaldecoder("latin-1")()
+        if self.pattern.element is not None:
+            self.pattern = self.pattern.map_keys(_encode)
+
+    def parse(self) -> json:
+        with self._mapped():
+            result: json = super().parse()
+        return _decode(result)
+
+    def iter_matches(self) -> Iterator[Tuple[Path, Any]]:
+        with self._mapped():
+            for path, value in super().iter_matches():
+                path = tuple(_decode_string(key) if isinstance(key, str) else key for key in path)
+                yield path, _decode_string(value) if isinstance(value, str) else _decode(value)
+
+    @contextlib.contextmanager
+    def _mapped(self) -> Iterator[None]:
+        """Maps the file and reads its windows as chunks; an empty file, which cannot be mapped, has none."""
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                self._chunks = self._windows(mapped)
+                self._map = mapped
+                try:
+                    yield
+                finally:
+                    self._map = None
+                    self._chunks.close()
+
+    def _contains(self, needles: Optional[Tuple[str, ...]]) -> bool:
+        if needles is None or self._map is None:
+            return True
+        return any(self._map.find(needle.encode("latin-1"), self.position) >= 0 for needle in needles)
+
+    def _windows(self, mapped: mmap.mmap) -> Iterator[memoryview]:
+        with memoryview(mapped) as view:
+            for start in range(0, len(view), self.chunk_size):
+                with view[start:start + self.chunk_size] as window:
+                    yield window
+
+def _encode(key: str) -> str:
+    return key if key.isascii() else key.encode("utf-8").decode("latin-1")
+
+def _decode(result: json) -> json:
+    """Decodes the Latin-1 scanned keys and strings of a result as UTF-8, in place."""
+    stack: List[Any] = [result] if isinstance(result, (dict, list)) else []
+    while stack:
+        container: Any = stack.pop()
+        if isinstance(container, dict):
+            if not all(key.isascii() for key in container):
+                items: List[Tuple[str, Any]] = list(container.items())
+                container.clear()
+                container.update((_decode_string(key), item) for key, item in items)
+            entries: Iterator[Tuple[Any, Any]] = iter(container.items())
+        else:
+            entries = enumerate(container)
+        for key, item in entries:
+            if isinstance(item, str):
+                if not item.isascii():
+                    container[key] = _decode_string(item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
+    return result
+
+def _decode_string(string: str) -> str:
+    return string if string.isascii() else string.encode("latin-1").decode("utf-8")
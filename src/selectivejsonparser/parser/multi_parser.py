@@ -0,0 +1,145 @@
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from selectivejsonparser.parser.parser import Parser, json
+from selectivejsonparser.pattern import Pattern, compile
+from selectivejsonparser.pattern.element import Array, Descendant, Dictionary, Element, Filter, Value, union
+
+# The ids of the values that selections from one document took whole, and of the containers they walked through.
+Claims = Tuple[Set[int], Set[int]]
+
+
+class MultiParser:
+    """Selects several patterns from one document in a single pass over its text.
+
+    The patterns are merged into one matcher whose states combine the states of every
+    pattern, and the document is parsed once with it. Each pattern's result is then
+    selected from that merged result, which holds only what at least one pattern
+    selects, so the text is scanned once however many patterns there are. Slices are
+    widened to whole arrays in the merged matcher, so that items keep their indices, and
+    predicates select every item along with the fields they test. A value selected whole
+    goes into the first result that selects it as it is, and is copied into any other,
+    so no two results share a container.
+
+    Attributes:
+        text (str): The JSON string to parse.
+        patterns (List[Pattern]): The compiled patterns, in the order their results are returned.
+    """
+    def __init__(self, text: str, patterns: Iterable[Optional[Union[str, Pattern]]]) -> None:
+        self.text: str = text
+        self.patterns: List[Pattern] = [pattern if isinstance(pattern, Pattern) else compile(pattern) for pattern in patterns]
+
+    def parse(self) -> List[json]:
+        """Returns the result of every pattern, as Parser would return it."""
+        if not self.patterns:
+            return []
+        if len(self.patterns) == 1:
+            return [Parser(self.text, self.patterns[0]).parse()]
+        document: json = Parser(self.text, self._merge()).parse()
+        claims: Claims = (set(), set())
+        return [_select(document, pattern.element if pattern.has_pattern else None, claims) for pattern in self.patterns]
+
+    def _merge(self) -> Pattern:
+        if not all(pattern.has_pattern for pattern in self.patterns):
+            return compile(None)
+        element: Optional[Element] = union(_widen(pattern.element) for pattern in self.patterns)
+        return Pattern.from_element(" , ".join(pattern.pattern for pattern in self.patterns), element)
+
+def parse_many(text: str, patterns: Iterable[Optional[Union[str, Pattern]]]) -> List[json]:
+    """Parses a JSON string once and returns the values selected by each pattern."""
+    return MultiParser(text, patterns).parse()
+
+def _widen(element: Element) -> Element:
+    """Returns a copy of the pattern tree that selects every item of sliced and filtered arrays."""
+    if isinstance(element, Dictionary):
+        widened: Dictionary = Dictionary()
+        for key, child in element.children.items():
+            widened[key] = _widen(child)
+        if element.wildcard is not None:
+            widened['*'] = _widen(element.wildcard)
+        return widened
+    if isinstance(element, Array):
+        array: Array = Array()
+        for child in element.children:
+            widened: Element = _widen(child)
+            if not element.any_index and not widened.accepts:
+                # Items in which a search finds nothing are kept, so that the others keep their indices.
+                widened = union((widened, Dictionary()))
+            array.append(widened)
+        return array
+    if isinstance(element, Descendant):
+        return Descendant(_widen(element.target))
+    if isinstance(element, Filter):
+        fields: Dictionary = Dictionary()
+        for predicate in element.predicates:
+            fields[predicate.field] = Value()
+        return union((_widen(element.element), fields))
+    return Value()
+
+def _select(document: json, element: Optional[Element], claims: Optional[Claims] = None) -> json:
+    """Applies a pattern tree to a parsed document as Parser applies it to text.
+
+    An element of None selects a whole value. Without claims, every container is
+    copied. Claims are shared by the selections from one document: a whole value that
+    no earlier selection took or walked through is then taken as it is instead of being
+    copied, and everything inside a value an earlier selection took is copied.
+    """
+    taken, walked = claims if claims is not None else (None, None)
+    if element is None and taken is not None and id(document) not in taken and id(document) not in walked:
+        taken.add(id(document))
+        return document
+    copying: bool = taken is None or id(document) in taken
+    if not copying:
+        walked.add(id(document))
+    root: Any = {} if isinstance(document, dict) else []
+    # Each frame holds the members left to select, the copy being built, its element,
+    # the container and key it is stored under when it is complete, and whether
+    # everything in it is copied.
+    stack: List[Tuple[Iterator[Tuple[Any, Any, Optional[Element]]], Any, Optional[Element], Any, Any, bool]] = [
+        (_members(document, element), root, element, None, None, copying)]
+    while stack:
+        members, target, parent, container, key, copying = stack[-1]
+        is_dict: bool = isinstance(target, dict)
+        for member, value, child in members:
+            if isinstance(value, (dict, list)):
+                if copying or id(value) in taken:
+                    stack.append((_members(value, child), {} if isinstance(value, dict) else [], child, target, member, True))
+                    break
+                if child is not None or id(value) in walked:
+                    walked.add(id(value))
+                    stack.append((_members(value, child), {} if isinstance(value, dict) else [], child, target, member, False))
+                    break
+                taken.add(id(value))
+            if child is None or child.accepts:
+                if is_dict:
+                    target[member] = value
+                else:
+                    target.append(value)
+        else:
+            stack.pop()
+            # Containers in which a search found nothing are dropped, as Parser drops them.
+            if container is not None and (target or parent is None or parent.accepts):
+                if isinstance(container, dict):
+                    container[key] = target
+                else:
+                    container.append(target)
+    return root
+
+def _members(value: Union[dict, list], element: Optional[Element]) -> Iterator[Tuple[Any, Any, Optional[Element]]]:
+    """Yields the key or index, value and element of every selected member of a container."""
+    if isinstance(value, dict):
+        pairs: Iterable[Tuple[Any, Any]] = value.items()
+        for key, member in pairs:
+            child: Optional[Element] = None if element is None else element[key]
+            if element is None or child is not None:
+                yield key, member, None if child is None or child.leaf else child
+    elif element is None:
+        for index, member in enumerate(value):
+            yield index, member, None
+    else:
+        for index in element.indices(len(value)):
+            child = element.item(index, len(value))
+            if child is not None and child.predicates is not None and isinstance(value[index], (dict, list)):
+                fields: Any = value[index] if isinstance(value[index], dict) else {}
+                child = child.passed if all(predicate.test(fields) for predicate in child.predicates) else child.failed
+            if child is not None:
+                yield index, value[index], None if child is None or child.leaf else child
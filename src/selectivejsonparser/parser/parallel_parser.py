@@ -0,0 +1,162 @@
+import os
+import re
+from mmap import mmap
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.lines_parser import LinesParser
+from selectivejsonparser.parser.parser import Parser
+from selectivejsonparser.pattern import Pattern, compile
+from selectivejsonparser.pattern.element import Array
+
+Buffer = Union[str, bytes, bytearray, mmap]
+
+# Separators between two container elements of an array: group 1 is the comma.
+_ELEMENT_SEPARATOR = re.compile(r'[}\]][ \t\n\r]*(,)[ \t\n\r]*[{\[]')
+_ELEMENT_SEPARATOR_BYTES = re.compile(rb'[}\]][ \t\n\r]*(,)[ \t\n\r]*[{\[]')
+_SCALAR_SEPARATOR = re.compile(r'(,)')
+_SCALAR_SEPARATOR_BYTES = re.compile(rb'(,)')
+_LEADING_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_LEADING_WHITESPACE_BYTES = re.compile(rb'[ \t\n\r]*')
+
+
+class ParallelParser:
+    """Parses a large top-level array, or newline-delimited JSON, on several processes.
+
+    The input is split into pieces at record boundaries, each piece is parsed with the
+    same pattern in a worker process, and the results are concatenated in input order.
+
+    Array boundaries are found speculatively: a piece ends at the first element separator
+    after `chunk_size` characters, without scanning what lies before it. A separator
+    inside a string or a nested container leaves its piece unbalanced, so it fails to
+    parse; the input is then split again with an exact, string-aware scan of the
+    top-level elements.
+
+    Attributes:
+        source (str | bytes | mmap): The JSON text, or UTF-8 bytes such as a memory-mapped file.
+        pattern (Pattern): The compiled pattern applied to every element or record.
+        workers (int): The number of worker processes, by default one per CPU.
+        chunk_size (int): The approximate size of the piece parsed by one task.
+        lines (bool): Whether the source is newline-delimited JSON rather than one array.
+        errors (str): How malformed records are handled in lines mode, as in LinesParser.
+        malformed (List[Tuple[int, ValueError]]): The collected malformed records in lines mode.
+    """
+    def __init__(self, source: Buffer, pattern: Optional[Union[str, Pattern]] = None, workers: Optional[int] = None,
+                 chunk_size: int = 1 << 22, lines: bool = False, errors: str = "raise") -> None:
+        self.source: Buffer = source
+        self.pattern: Pattern = pattern if isinstance(pattern, Pattern) else compile(pattern)
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size
+        self.lines: bool = lines
+        self.errors: str = errors
+        self.malformed: List[Tuple[int, ValueError]] = []
+
+    def parse(self) -> List[Any]:
+        """Returns the selected elements of the array, or the selected records in lines mode."""
+        if self.lines:
+            return self._parse_lines()
+        element: Any = self.pattern.element
+        # Pieces do not know the indices of their elements, so a slice of the array is parsed in one go.
+        ranged: bool = isinstance(element, Array) and (element.start is not None or element.stop is not None)
+        pieces: Optional[List[Buffer]] = None if ranged else self._split_array()
+        if pieces is None:
+            return Parser(self._text(), self.pattern).parse()
+        try:
+            return self._concatenate(self._map(_parse_elements, pieces, repeat(self.pattern)))
+        except ValueError:
+            pieces = self._split_array_exactly()
+            return self._concatenate(self._map(_parse_elements, pieces, repeat(self.pattern)))
+
+    def _parse_lines(self) -> List[Any]:
+        pieces: List[Buffer] = []
+        first_lines: List[int] = []
+        newline: Any = "\n" if isinstance(self.source, str) else b"\n"
+        start: int = 0
+        line: int = 1
+        while start < len(self.source):
+            stop: int = self.source.find(newline, start + self.chunk_size)
+            stop = len(self.source) if stop < 0 else stop + 1
+            pieces.append(self.source[start:stop])
+            first_lines.append(line)
+            line += self.source.count(newline, start, stop)
+            start = stop
+        results: List[Any] = []
+        for records, malformed in self._map(_parse_records, pieces, repeat(self.pattern), repeat(self.errors), first_lines):
+            results.extend(records)
+            self.malformed.extend(malformed)
+        return results
+
+    def _split_array(self) -> Optional[List[Buffer]]:
+        """Splits the array speculatively, or returns None when the source is not a single array."""
+        source: Buffer = self.source
+        text: bool = isinstance(source, str)
+        whitespace: re.Pattern = _LEADING_WHITESPACE if text else _LEADING_WHITESPACE_BYTES
+        start: int = whitespace.match(source).end()
+        end: int = len(source)
+        while end > start and source[end - 1:end] in ((" ", "\t", "\n", "\r") if text else (b" ", b"\t", b"\n", b"\r")):
+            end -= 1
+        if source[start:start + 1] != ("[" if text else b"[") or source[end - 1:end] != ("]" if text else b"]") or end - start < 2:
+            return None
+        start += 1
+        end -= 1
+        first: int = whitespace.match(source, start).end()
+        if source[first:first + 1] in (("{", "[") if text else (b"{", b"[")):
+            separator: re.Pattern = _ELEMENT_SEPARATOR if text else _ELEMENT_SEPARATOR_BYTES
+        else:
+            separator = _SCALAR_SEPARATOR if text else _SCALAR_SEPARATOR_BYTES
+        pieces: List[Buffer] = []
+        while True:
+            match: Optional[re.Match] = separator.search(source, start + self.chunk_size, end)
+            if match is None:
+                pieces.append(source[start:end])
+                return pieces
+            pieces.append(source[start:match.start(1)])
+            start = match.end(1)
+
+    def _split_array_exactly(self) -> List[str]:
+        """Splits the array at top-level commas found by skipping over every element."""
+        parser: Parser = Parser(self._text())
+        parser._skip_whitespace()
+        parser.position += 1
+        pieces: List[str] = []
+        start: int = parser.position
+        while True:
+            parser._skip_whitespace()
+            if parser._skip_value() is None:
+                break
+            parser._skip_whitespace()
+            if parser._char() != ',':
+                break
+            if parser.position - start >= self.chunk_size:
+                pieces.append(parser.text[start:parser.position])
+                start = parser.position + 1
+            parser.position += 1
+        pieces.append(parser.text[start:parser.text.rindex("]")])
+        return pieces
+
+    def _text(self) -> str:
+        return self.source if isinstance(self.source, str) else str(self.source, "utf-8")
+
+    def _map(self, function: Any, *iterables: Any) -> Iterator[Any]:
+        """Applies function to every piece, in worker processes unless there is only one worker or piece."""
+        tasks: List[Tuple[Any, ...]] = list(zip(*iterables))
+        if self.workers == 1 or len(tasks) == 1:
+            return (function(*arguments) for arguments in tasks)
+        executor: Executor = ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)))
+        with executor:
+            return iter(list(executor.map(function, *zip(*tasks))))
+
+    def _concatenate(self, parts: Iterator[List[Any]]) -> List[Any]:
+        result: List[Any] = []
+        for part in parts:
+            result.extend(part)
+        return result
+
+def _parse_elements(piece: Buffer, pattern: Pattern) -> List[Any]:
+    text: str = piece if isinstance(piece, str) else str(piece, "utf-8")
+    return Parser("[" + text + "]", pattern).parse()
+
+def _parse_records(piece: Buffer, pattern: Pattern, errors: str, first_line: int) -> Tuple[List[Any], List[Tuple[int, ValueError]]]:
+    parser: LinesParser = LinesParser(piece, pattern, errors, first_line=first_line)
+    return list(parser.parse()), parser.malformed
@@ -1,177 +1,468 @@
-from typing import Optional, Any, Dict, List, Iterator, Tuple, Union, TypeVar
+import re
+from typing import Optional, Any, Dict, Iterator, List, Set, Tuple, Union, TypeVar
 
-from selectivejsonparser.pattern import Pattern
+from selectivejsonparser.pattern import Pattern, compile
+from selectivejsonparser.pattern.element import Array, Descendant, Dictionary, Element, Filter, Value, Union as UnionElement
 
 null = TypeVar("null")
 unexpected = TypeVar("unexpected")
 json = TypeVar("json", Dict[str, Any], List[Any], None)
 atom = TypeVar("atom", str, int, float, bool, null, unexpected)
+# An enclosing container, whether it is a dict, its pattern element and the key or index of its open member.
+Frame = Tuple[Any, bool, Optional[Element], Union[str, int, None]]
+# The keys and indices that lead from the root to a value.
+Path = Tuple[Union[str, int], ...]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Consumes the body of a string up to its closing quote or the end of the text.
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# Groups: 1 is the decimal point, 2 the exponent marker and 3 the exponent digits.
+_NUMBER = re.compile(r'[-+]?[0-9]*(?:(\.)[0-9]*(?:([eE])[-+]?([0-9]*))?)?')
+# Consumes everything up to the next bracket or brace, stepping over complete strings.
+_SKIP_TO_BRACKET = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+# Consumes a number or literal up to the next delimiter.
+_SKIP_SCALAR = re.compile(r'[^\s,:\[\]{}"]*')
+# How many distinct keys a parser shares between objects; further keys are stored as read.
+_INTERNED_KEYS = 1 << 12
+
 class Parser:
     """A JSON parser that can selectively extract values based on a path pattern.
 
+    The parser walks the document with an explicit stack instead of recursion, so
+    the nesting depth is bounded only by memory.
+
     Attributes:
         text (str): The JSON string to parse.
         position (int): The current position in the string.
-        pattern (str): The path pattern to extract specific values or None to parse everything.
+        pattern (str | Pattern): The path pattern to extract specific values or None to parse everything.
+            Pattern strings are compiled once and cached.
+        early_exit (bool): Whether to stop as soon as every selected key has been found. The rest of
+            the document, including anything after the JSON value, is then left unread and unvalidated,
+            and a key repeated later in an object keeps its first value.
+        prefilter (bool): Whether to search the text for the keys the pattern needs before parsing.
+            A document that contains none of them is neither parsed nor validated, and its result
+            is an empty object or array, as it would be if it were parsed.
     """
-    def __init__(self, text: str, pattern: Optional[str] = None) -> None:
+    # Whether the whole input stays in memory, so the parser can return to an earlier position.
+    _rewindable: bool = True
+
+    def __init__(self, text: str, pattern: Optional[Union[str, Pattern]] = None, early_exit: bool = False,
+                 prefilter: bool = False) -> None:
         self.text: str = text
         self.position: int = 0
-        self.pattern: Optional[Pattern] = Pattern(pattern)
+        self.pattern: Pattern = pattern if isinstance(pattern, Pattern) else compile(pattern)
+        self.early_exit: bool = early_exit
+        self.prefilter: bool = prefilter
+        self._stopped: bool = False
+        self._pinned: int = 0
+        # The keys stored in results so far, so that a key repeated in many objects is kept once.
+        self._keys: Dict[str, str] = {}
 
     def parse(self) -> json:
+        return self._parse_document()
+
+    def _parse_document(self) -> json:
         self._skip_whitespace()
-        result: json = self._parse_dict()
-        if result is None:
-            result = self._parse_list()
+        char: Optional[str] = self._char()
+        result: json = None
+        if (char == '{' or char == '[') and self.prefilter and not self._contains(self.pattern.needles):
+            return {} if char == '{' else []
+        if char == '{' or char == '[':
+            result = self._parse_container()
+            if self._stopped:
+                return result
         self._skip_whitespace()
-        if self.position != len(self.text):
+        if self._char() is not None:
             raise ValueError("Unexpected data after JSON value")
         if result is None:
             raise ValueError("No JSON object or array found")
         return result
-    
-    def _parse_dict(self) -> Optional[Dict[str, Any]]:
-        if not self._opening_curly_brace():
-            return None
-        self._advance()
-        self._skip_whitespace()
-        parsed: Dict[str, Any] = dict(self._parse_dict_entries())
+
+    def iter_matches(self) -> Iterator[Tuple[Path, Any]]:
+        """Yields the path and value of every selected item of the arrays the pattern
+        addresses with brackets, as soon as the item has been parsed.
+
+        Items are not kept once yielded, so memory is bounded by the largest item rather
+        than by the length of the arrays. Only the outermost such arrays on a path are
+        streamed; arrays inside an item stay in it. Selected values that are not inside
+        one of these arrays are yielded whole at their own path, and a pattern without
+        brackets yields the whole result at the empty path. Without a pattern, the items
+        of a top-level array are yielded. early_exit does not apply.
+        """
+        self.early_exit = False
         self._skip_whitespace()
-        if not self._closing_curly_brace():
-            raise ValueError("Expected closing curly brace")
-        self._advance()
-        return parsed
-    
-    def _parse_dict_entries(self) -> Iterator[Tuple[str, Any]]:
-        more: bool = False
+        char: Optional[str] = self._char()
+        if char != '{' and char != '[':
+            raise ValueError("No JSON object or array found")
+        element: Optional[Element] = self.pattern.element
+        if not self.pattern.has_pattern and char == '[':
+            element = Array()
+            element.append(Value())
+        elif not self.pattern.has_pattern or not _addresses_array(element):
+            while not self._available("input"):
+                yield None
+            yield (), self._parse_document()
+            return
+        path: List[Union[str, int]] = []
+        # Each frame holds whether a container being walked is a dict, its element,
+        # whether its items are streamed, and the index of its last member.
+        stack: List[List[Any]] = []
+        leads: Dict[Element, bool] = {}
+        opened: Optional[Element] = element
         while True:
-            self._skip_whitespace()
-            key: Optional[str] = self._parse_string()
-            if key is None and not more:
+            if opened is not None:
+                if self._char() == '[' and opened.from_end:
+                    # The items of the array are streamed from a list of their offsets.
+                    while not self._available("value" if stack else "input"):
+                        yield None
+                    yield from self._iter_range(opened, path)
+                    if path:
+                        path.pop()
+                else:
+                    is_dict: bool = self._char() == '{'
+                    stack.append([is_dict, opened, not is_dict and _streams(opened), -1])
+                    self.position += 1
+                opened = None
+            if not stack:
                 break
-            elif key is None and more:
-                raise ValueError("Expected string key")
+            frame: List[Any] = stack[-1]
+            is_dict, current, streamed, index = frame
+            while not self._available("key" if is_dict else "item"):
+                yield None
             self._skip_whitespace()
-            if not self._colon():
-                raise ValueError("Expected colon after key")
-            self._advance()
-            self._skip_whitespace()
-            self.pattern.match(key)
-            value: Optional[Any] = self._parse_value()
-            self.pattern.backtrack()
-            if value is None:
-                raise ValueError("Expected value after colon")
+            char = self._char()
+            closing: str = '}' if is_dict else ']'
+            if index >= 0 and char == ',':
+                self.position += 1
+                self._skip_whitespace()
+                char = self._char()
+            elif char == closing or index >= 0:
+                if char != closing:
+                    raise ValueError("Expected closing curly brace" if is_dict else "Expected closing square brace")
+                self.position += 1
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            frame[3] = index = index + 1
+            key: Union[str, int] = index
+            if is_dict:
+                string: Optional[str] = self._parse_string()
+                if string is None:
+                    raise ValueError("Expected closing curly brace" if index == 0 else "Expected string key")
+                key = string
+                self._skip_whitespace()
+                if self._char() != ':':
+                    raise ValueError("Expected colon after key")
+                self.position += 1
+                self._skip_whitespace()
+                char = self._char()
+            child: Optional[Element] = current[key]
+            if child is None and not is_dict and current.exhausted(index):
+                while not self._available("container" if len(stack) > 1 else "input"):
+                    yield None
+                self._skip_container(1)
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            if (char == '{' or char == '[') and not streamed and child is not None:
+                if child not in leads:
+                    leads[child] = _addresses_array(child)
+                if leads[child]:
+                    path.append(key)
+                    opened = child
+                    continue
+            while not self._available("value"):
+                yield None
+            if child is not None and child.predicates is not None and (char == '{' or char == '['):
+                child = self._filter(child, self.position)
+                if child is None:
+                    continue
+            if child is None:
+                if self._skip_value() is None:
+                    raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+                continue
+            value: Any = self._parse_member(child, char, is_dict)
             if value is not unexpected:
-                yield (key, self._replace_with_none_if_is_null(value))
-            self._skip_whitespace()
-            if not self._comma():
-                break
-            more = True
-            self._advance()
-            self._skip_whitespace()
-        
-    def _parse_list(self) -> Optional[List[Any]]:
-        if not self._opening_square_brace():
-            return None
-        self._advance()
-        self._skip_whitespace()
-        parsed: List[Any] = list(self._parse_list_items())
+                yield (*path, key), value
+        while not self._available("input"):
+            yield None
         self._skip_whitespace()
-        if not self._closing_square_brace():
-            raise ValueError("Expected closing square brace")
-        self._advance()
-        return parsed
-    
-    def _parse_list_items(self) -> Iterator[Any]:
+        if self._char() is not None:
+            raise ValueError("Unexpected data after JSON value")
+
+    def _parse_container(self, element: Optional[Element] = None) -> Union[Dict[str, Any], List[Any]]:
+        """Parses the object or array at the current position, by default with the pattern's root element.
+        A leaf element selects the whole container.
+
+        Each frame on the stack holds an enclosing container, whether it is a dict,
+        its pattern element and the key or index the nested container will be stored
+        under. The pattern element of the innermost container lives in `element` and
+        the element of the value being parsed in `child`.
+
+        An array stops being read once its element selects no further index. In
+        early-exit mode, an object that holds every key its element selects is
+        closed without reading its remaining members too, and parsing stops
+        altogether once that completes every enclosing container as well.
+        """
+        if element is None:
+            element = self.pattern.element
+        selective: bool = self.pattern.has_pattern and not element.leaf
+        early_exit: bool = self.early_exit and selective
+        stack: List[Frame] = []
+        child: Optional[Element] = None
+        whitespace: Any = _WHITESPACE.match
+        keys: Dict[str, str] = self._keys
+        text: str = self.text
+        position: int = self.position
+        is_dict: bool = text[position] == '{'
+        if not is_dict and selective and element.from_end:
+            return self._parse_range(element)
+        container: Any = {} if is_dict else []
+        key: Union[str, int, None] = None if is_dict else 0
+        position += 1
         while True:
-            self._skip_whitespace()
-            self.pattern.match(0)
-            value: Optional[Any] = self._parse_value()
-            self.pattern.backtrack()
-            if value is None:
-                break
-            if value is not unexpected:
-                yield self._replace_with_none_if_is_null(value)
-            self._skip_whitespace()
-            if not self._comma():
-                break
-            self._advance()
-            self._skip_whitespace()
+            # Read the next member of the innermost container, if there is one.
+            char: str = text[position:position + 1]
+            if char in ' \t\n\r':  # Also true at the end of the text.
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+                if not char:
+                    position = self._next_token(position)
+                    text = self.text
+                    char = text[position:position + 1]
+            value: Any = unexpected
+            if is_dict:
+                if char != '"':
+                    if char == '}' and key is None:
+                        position += 1
+                        value = container
+                    elif key is None:
+                        raise ValueError("Expected closing curly brace")
+                    else:
+                        raise ValueError("Expected string key")
+                else:
+                    end: int = _STRING_BODY.match(text, position + 1).end()
+                    if text[end:end + 1] == '"':
+                        key = text[position + 1:end]
+                        position = end + 1
+                    else:
+                        self.position = position
+                        key = self._parse_string()
+                        text, position = self.text, self.position
+                    char = text[position:position + 1]
+                    if char in ' \t\n\r':
+                        position = whitespace(text, position).end()
+                        char = text[position:position + 1]
+                        if not char:
+                            position = self._next_token(position)
+                            text = self.text
+                            char = text[position:position + 1]
+                    if char != ':':
+                        raise ValueError("Expected colon after key")
+                    position += 1
+                    char = text[position:position + 1]
+                    if char in ' \t\n\r':
+                        position = whitespace(text, position).end()
+                        char = text[position:position + 1]
+                        if not char:
+                            position = self._next_token(position)
+                            text = self.text
+                            char = text[position:position + 1]
+                    if selective:
+                        child = element[key]
+                    if not selective or child is not None:
+                        # Keys that repeat across records share one string.
+                        interned: Optional[str] = keys.get(key)
+                        if interned is not None:
+                            key = interned
+                        elif len(keys) < _INTERNED_KEYS:
+                            keys[key] = key
+            elif char == ']':
+                position += 1
+                value = container
+            elif selective:
+                child = element.items if element.any_index else element[key]
+                if child is None and (element.any_index or element.exhausted(key)):
+                    self.position = position
+                    self._skip_container(1)
+                    text, position = self.text, self.position
+                    value = container
+            if value is unexpected:
+                if selective and child is None:
+                    self.position = position
+                    if self._skip_value() is None:
+                        raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+                    text, position = self.text, self.position
+                elif char == '{' or char == '[':
+                    if selective and not child.plain:
+                        child, value = self._enter(child, position)
+                        text, position = self.text, self.position
+                    if not selective or child is not None:
+                        stack.append((container, is_dict, element, key))
+                        element = child
+                        is_dict = char == '{'
+                        container = {} if is_dict else []
+                        key = None if is_dict else 0
+                        position += 1
+                        continue
+                elif selective and not child.accepts:
+                    self.position = position
+                    if self._skip_value() is None:
+                        raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+                    text, position = self.text, self.position
+                else:
+                    value = self._parse_scalar(text, position, char)
+                    if value is None:
+                        raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+                    text, position = self.text, self.position
+                if value is not unexpected:
+                    if is_dict:
+                        container[key] = None if value is null else value
+                    else:
+                        container.append(None if value is null else value)
+                    if early_exit and _full(container, is_dict, element, key):
+                        self.position = position
+                        if self._complete(stack):
+                            return self._stop(stack, container)
+                        self._skip_container(1)
+                        text, position = self.text, self.position
+                        value = container
+            # Move past the separator, or close containers until one has more members.
+            while True:
+                if value is not container:
+                    char = text[position:position + 1]
+                    if char in ' \t\n\r':
+                        position = whitespace(text, position).end()
+                        char = text[position:position + 1]
+                        if not char:
+                            position = self._next_token(position)
+                            text = self.text
+                            char = text[position:position + 1]
+                    if char == ',':
+                        position += 1
+                        key = '' if is_dict else key + 1  # An empty key marks that another member must follow.
+                        break
+                    if char != ('}' if is_dict else ']'):
+                        raise ValueError("Expected closing curly brace" if is_dict else "Expected closing square brace")
+                    position += 1
+                    value = container
+                if not stack:
+                    self.position = position
+                    return value
+                # Containers in which a search found nothing are dropped.
+                pruned: bool = selective and not value and not element.accepts
+                container, is_dict, element, key = stack.pop()
+                if pruned:
+                    value = unexpected
+                    continue
+                if is_dict:
+                    container[key] = value
+                else:
+                    container.append(value)
+                value = unexpected
+                if early_exit and _full(container, is_dict, element, key):
+                    self.position = position
+                    if self._complete(stack):
+                        return self._stop(stack, container)
+                    self._skip_container(1)
+                    text, position = self.text, self.position
+                    value = container
+
+    def _enter(self, element: Element, position: int) -> Tuple[Optional[Element], Any]:
+        """Applies the predicates, slice or search of the element of the container at position.
+
+        Returns the element to enter the container in, or None along with the parsed
+        container, or with unexpected if the container was skipped.
+        """
+        self.position = position
+        if element.predicates is not None:
+            element = self._filter(element, position)
+            if element is None or element.plain:
+                return element, unexpected
+        if element.leaf:
+            return None, self._parse_container(element)
+        if element.from_end and self.text[position] == '[':
+            return None, self._parse_range(element)
+        if element.needles is not None and not self._search(element.needles, position):
+            return None, unexpected
+        return element, unexpected
+
+    def _parse_scalar(self, text: str, position: int, char: str) -> Optional[atom]:
+        """Parses the string, number or literal at position and moves past it.
+
+        Complete tokens are read straight from the text; anything that runs into the
+        end of the buffered text goes through the atom parsers, which read more input.
+        """
+        if char == '"':
+            end: int = _STRING_BODY.match(text, position + 1).end()
+            if text[end:end + 1] == '"':
+                self.position = end + 1
+                return text[position + 1:end]
+        elif char != 't' and char != 'f' and char != 'n':
+            match: re.Match = _NUMBER.match(text, position)
+            end = match.end()
+            if end != len(text):
+                if end == position:
+                    return None
+                fraction: Optional[int] = match.lastindex
+                if fraction == 3 and match.start(3) == end:
+                    raise ValueError("Invalid number format")
+                self.position = end
+                number: str = text[position:end]
+                try:
+                    return float(number) if fraction else int(number)
+                except ValueError as exc:
+                    raise ValueError(f"Invalid number: {number}") from exc
+        self.position = position
+        return self._parse_atom()
 
-    def _parse_value(self) -> Optional[Union[atom, Dict[str, Any], List[Any]]]:
-        value: Any = self._parse_dict()
-        if value is None:
-            value = self._parse_list()
-        if value is None:
-            value = self._parse_atom()
-        return value
-    
     def _parse_atom(self) -> Optional[atom]:
-        value: Any = None
-        self.pattern.match()
-        value = self._parse_string()
-        if value is None:
-            value = self._parse_number()
-        if value is None:
-            value = self._parse_boolean()
-        if value is None:
-            value = self._parse_null()
-        self.pattern.backtrack()
-        if not self.pattern.matched():
-            return unexpected
-        return value
+        char: Optional[str] = self._char()
+        if char == '"':
+            return self._parse_string()
+        if char == 't' or char == 'f':
+            return self._parse_boolean()
+        if char == 'n':
+            return self._parse_null()
+        return self._parse_number()
     
     def _parse_string(self) -> Optional[str]:
         if not self._quote():
             return None
-        self._advance()
-        start = self.position
-        while not self._quote():
-            if self.position >= len(self.text):
+        start: int = self.position + 1
+        position: int = start
+        while True:
+            position = _STRING_BODY.match(self.text, position).end()
+            if self.text[position:position + 1] == '"':
+                break
+            # The string runs past the end of the text, possibly right after a backslash.
+            if not self._fill():
                 raise ValueError("Unterminated string")
-            if self._char() == '\\' and self._next_char() == '"':
-                self._advance()
-            self._advance()
-        string: str = self.text[start:self.position]
-        self._advance()  # Skip closing quote
+        string: str = self.text[start:position]
+        self.position = position + 1
         return string
     
     def _parse_number(self) -> Optional[Union[int, float]]:
-        start = self.position
-        if self._char() in ('-', '+'):
-            self._advance()
-        while self._char() and self._char().isdigit():
-            self._advance()
-        if self._char() == '.':
-            self._advance()
-            while self._char() and self._char().isdigit():
-                self._advance()
-            if self._char() == 'e' or self._char() == 'E':
-                self._advance()
-                sub: int = self.position
-                sign: bool = False
-                if self._char() in ('-', '+'):
-                    self._advance()
-                    sign = True
-                while self._char() is not None and self._char().isdigit():
-                    self._advance()
-                if sub == self.position or (sign and sub + 1 == self.position):
-                    raise ValueError("Invalid number format")
-            number: str = self.text[start:self.position]
-            try:
-                return float(number)
-            except ValueError as exc:
-                raise ValueError(f"Invalid number: {number}") from exc
-        elif start != self.position:
-            number: str = self.text[start:self.position]
-            try:
-                return int(number)
-            except ValueError as exc:
-                raise ValueError(f"Invalid number: {number}") from exc
-        return None
+        match: re.Match = _NUMBER.match(self.text, self.position)
+        while match.end() == len(self.text) and self._fill():
+            match = _NUMBER.match(self.text, self.position)
+        end: int = match.end()
+        if end == self.position:
+            return None
+        fraction: Optional[int] = match.lastindex
+        if fraction == 3 and match.start(3) == end:
+            raise ValueError("Invalid number format")
+        number: str = self.text[self.position:end]
+        self.position = end
+        try:
+            return float(number) if fraction else int(number)
+        except ValueError as exc:
+            raise ValueError(f"Invalid number: {number}") from exc
     
     def _parse_boolean(self) -> Optional[bool]:
+        self._ensure(5)
         if self.text.startswith("true", self.position):
             self.position += 4
             return True
@@ -181,58 +472,364 @@ class Parser:
         return None
     
     def _parse_null(self) -> Optional[null]:
+        self._ensure(4)
         if self.text.startswith("null", self.position):
             self.position += 4
             return null
         return None
     
-    def _replace_with_none_if_is_null(self, value: Any) -> Any:
-        if value is null:
-            return None
+    def _skip_value(self) -> Optional[unexpected]:
+        """Scans past the value at the current position without building it.
+
+        Containers are skipped by balancing brackets and stepping over strings, so
+        the content of a skipped subtree is not validated.
+        """
+        char: Optional[str] = self._char()
+        if char == '"':
+            self._skip_string()
+        elif char == '{' or char == '[':
+            self._skip_container()
+        else:
+            end: int = _SKIP_SCALAR.match(self.text, self.position).end()
+            while end == len(self.text) and self._fill():
+                end = _SKIP_SCALAR.match(self.text, end).end()
+            if end == self.position:
+                return None
+            self.position = end
+        return unexpected
+
+    def _skip_string(self) -> None:
+        position: int = self.position + 1
+        while True:
+            position = _STRING_BODY.match(self.text, position).end()
+            if self.text[position:position + 1] == '"':
+                break
+            # The string runs past the end of the text, possibly right after a backslash.
+            self.position = position
+            self._discard()
+            if not self._fill():
+                raise ValueError("Unterminated string")
+            position = self.position
+        self.position = position + 1
+
+    def _available(self, extent: str) -> bool:
+        """Returns whether iter_matches() can go on without running out of buffered text.
+
+        From the current position, the text must hold the next "key" of the innermost
+        object being walked up to its value, or the separator before the next "item" of
+        an array, or else the closing bracket; the rest of the "value" at the position
+        through the comma or bracket after it; the rest of the "container"; or the rest
+        of the "input". While it does not, iter_matches() yields None in place of a
+        match. The text of a string parser is always complete, and a stream parser
+        reads more as it needs it.
+        """
+        return True
+
+    def _iter_range(self, element: Element, path: List[Union[str, int]]) -> Iterator[Tuple[Path, Any]]:
+        """Yields the selected items of the array at the current position, whose element
+        counts items from the end, and moves past it."""
+        self._pinned += 1
+        try:
+            starts: List[int] = self._item_starts()
+            end: int = self.position + 1
+            for index in element.indices(len(starts)):
+                child: Optional[Element] = element.item(index, len(starts))
+                self.position = starts[index]
+                char: str = self.text[self.position]
+                if child is not None and child.predicates is not None and (char == '{' or char == '['):
+                    child = self._filter(child, self.position)
+                if child is None:
+                    continue
+                value: Any = self._parse_member(child, char, False)
+                if value is not unexpected:
+                    if char != '{' and char != '[' and self.text[self.position] not in ' \t\n\r,]':
+                        raise ValueError("Expected closing square brace")
+                    yield (*path, index), value
+            self.position = end
+        finally:
+            self._pinned -= 1
+
+    def _parse_member(self, element: Element, char: str, is_dict: bool) -> Any:
+        """Parses the value at the current position with its element, or skips it and
+        returns unexpected if nothing in it is kept."""
+        if char == '{' or char == '[':
+            if element.needles is not None and not element.leaf and not self._search(element.needles, self.position):
+                return unexpected
+            container: Union[Dict[str, Any], List[Any]] = self._parse_container(element)
+            return container if container or element.accepts else unexpected
+        if not element.accepts:
+            if self._skip_value() is None:
+                raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+            return unexpected
+        value: Optional[atom] = self._parse_scalar(self.text, self.position, char)
+        if value is None:
+            raise ValueError("Expected value after colon" if is_dict else "Expected closing square brace")
+        return None if value is null else value
+
+    def _parse_range(self, element: Array) -> List[Any]:
+        """Parses the array at the current position when its element counts items from the end.
+
+        The array is skipped once to find where its items start, and then only the
+        selected items are parsed. The array's text is pinned in the meantime.
+        """
+        self._pinned += 1
+        try:
+            starts: List[int] = self._item_starts()
+            end: int = self.position + 1
+            result: List[Any] = []
+            for index in element.indices(len(starts)):
+                child: Optional[Element] = element.item(index, len(starts))
+                self.position = starts[index]
+                char: str = self.text[self.position]
+                if child is None or (not child.accepts and char != '{' and char != '['):
+                    continue
+                if child.predicates is not None and (char == '{' or char == '['):
+                    child = self._filter(child, self.position)
+                    if child is None:
+                        continue
+                if char == '{' or char == '[':
+                    value: Any = self._parse_container(child)
+                    self._stopped = False
+                    if not value and not child.accepts:
+                        continue
+                else:
+                    value = self._parse_scalar(self.text, self.position, char)
+                    if value is None or self.text[self.position] not in ' \t\n\r,]':
+                        raise ValueError("Expected closing square brace")
+                result.append(None if value is null else value)
+            self.position = end
+            return result
+        finally:
+            self._pinned -= 1
+
+    def _contains(self, needles: Optional[Tuple[str, ...]]) -> bool:
+        """Returns whether the rest of the input may contain one of the needles."""
+        return needles is None or any(self.text.find(needle, self.position) >= 0 for needle in needles)
+
+    def _item_starts(self) -> List[int]:
+        """Skips the items of the array at the current position, returning where each of
+        them starts, and stops at its closing bracket."""
+        starts: List[int] = []
+        self.position += 1
+        while True:
+            self._skip_whitespace()
+            start: int = self.position
+            if self._skip_value() is None:
+                break
+            starts.append(start)
+            self._skip_whitespace()
+            if self._char() != ',':
+                break
+            self.position += 1
+        if self._char() != ']':
+            raise ValueError("Expected closing square brace")
+        return starts
+
+    def _search(self, needles: Tuple[str, ...], position: int) -> bool:
+        """Returns whether the container at position contains one of the needles, and moves past it if not.
+
+        Containers that cannot hold a key being searched for are skipped without parsing.
+        Parsers that release their input cannot return to the container, so they search all of them.
+        """
+        if not self._rewindable:
+            return True
+        self.position = position
+        self._skip_container()
+        for needle in needles:
+            if self.text.find(needle, position, self.position) >= 0:
+                self.position = position
+                return True
+        return False
+
+    def _filter(self, element: Element, position: int) -> Optional[Element]:
+        """Tests the predicates of element against the container at position.
+
+        Only the fields the predicates name are parsed, and only until every one of
+        them is found; the container's text is pinned in the meantime. Returns the
+        element to parse the container with, from position, or None after moving
+        past a container that nothing selects.
+        """
+        fields: Dict[str, Any] = {}
+        closed: bool = False
+        self._pinned += 1
+        try:
+            self.position = position
+            if self.text[position] == '{':
+                closed = self._fields({predicate.field for predicate in element.predicates}, fields)
+        finally:
+            self._pinned -= 1
+        state: Optional[Element] = element.passed if all(predicate.test(fields) for predicate in element.predicates) else element.failed
+        if state is not None:
+            self.position = position
+        elif not closed:
+            self._skip_container(1 if self.position > position else 0)
+        return state
+
+    def _fields(self, names: Set[str], fields: Dict[str, Any]) -> bool:
+        """Reads the members of the object at the current position into fields until every one
+        of names is found, skipping the others. Returns whether the end of the object was reached."""
+        self.position += 1
+        self._skip_whitespace()
+        if self._char() == '}':
+            self.position += 1
+            return True
+        while True:
+            key: Optional[str] = self._parse_string()
+            if key is None:
+                raise ValueError("Expected string key")
+            self._skip_whitespace()
+            if self._char() != ':':
+                raise ValueError("Expected colon after key")
+            self.position += 1
+            self._skip_whitespace()
+            char: Optional[str] = self._char()
+            if key in names and key not in fields and char is not None:
+                if char == '{' or char == '[':
+                    # Containers only exist; they never compare equal to a literal.
+                    self._skip_container()
+                    fields[key] = unexpected
+                else:
+                    value: Optional[atom] = self._parse_scalar(self.text, self.position, char)
+                    if value is None:
+                        raise ValueError("Expected value after colon")
+                    fields[key] = None if value is null else value
+                if len(fields) == len(names):
+                    return False
+            elif self._skip_value() is None:
+                raise ValueError("Expected value after colon")
+            self._skip_whitespace()
+            char = self._char()
+            if char == '}':
+                self.position += 1
+                return True
+            if char != ',':
+                raise ValueError("Expected closing curly brace")
+            self.position += 1
+            self._skip_whitespace()
+
+    def _complete(self, stack: List[Frame]) -> bool:
+        """Returns whether completing the innermost container completes every enclosing one."""
+        for container, is_dict, element, key in stack:
+            if is_dict and len(container) + (key not in container) < element.selected_keys:
+                return False
+            if not is_dict and not element.exhausted(key + 1):
+                return False
+        return True
+
+    def _stop(self, stack: List[Frame], value: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, Any], List[Any]]:
+        """Stores every open container in its parent and returns the outermost one."""
+        while stack:
+            container, is_dict, _, key = stack.pop()
+            if is_dict:
+                container[key] = value
+            else:
+                container.append(value)
+            value = container
+        self._stopped = True
         return value
 
+    def _skip_container(self, depth: int = 0) -> None:
+        """Moves past the container at the current position, or past the end of the
+        `depth` containers the current position is inside of."""
+        text: str = self.text
+        position: int = self.position
+        while True:
+            position = _SKIP_TO_BRACKET.match(text, position).end()
+            char: str = text[position:position + 1]
+            if char == '{' or char == '[':
+                depth += 1
+            elif char == '}' or char == ']':
+                depth -= 1
+                if depth == 0:
+                    break
+            elif char == '"':
+                self.position = position
+                self._skip_string()
+                text, position = self.text, self.position
+                continue
+            else:
+                self.position = position
+                self._discard()
+                if not self._fill():
+                    raise ValueError("Unterminated container")
+                text, position = self.text, self.position
+                continue
+            position += 1
+        self.position = position + 1
+
+    def _next_token(self, position: int) -> int:
+        """Skips the whitespace at position and returns the position of the next token.
+
+        Called between tokens only, so the text may be refilled and released here.
+        """
+        self.position = position
+        self._skip_whitespace()
+        return self.position
+
     def _skip_whitespace(self) -> None:
-        while self._whitespace():
-            self._advance()
+        if self.position < len(self.text) and self.text[self.position] not in ' \t\n\r':
+            return
+        position: int = _WHITESPACE.match(self.text, self.position).end()
+        while position == len(self.text) and self._fill():
+            position = _WHITESPACE.match(self.text, position).end()
+        self.position = position
     
+    def _fill(self) -> bool:
+        """Appends more input to the text. Returns False once the input is exhausted.
+
+        Positions into the text stay valid across a fill. The in-memory parser has
+        no further input.
+        """
+        return False
+
+    def _discard(self) -> None:
+        """Releases the text before the current position, which is no longer needed."""
+        pass
+
+    def _ensure(self, count: int) -> None:
+        while len(self.text) - self.position < count and self._fill():
+            pass
+
     def _char(self) -> Optional[str]:
-        if self.position >= len(self.text):
+        if self.position >= len(self.text) and not self._fill():
             return None
         return self.text[self.position]
-    
-    def _next_char(self) -> Optional[str]:
-        if self.position + 1 >= len(self.text):
-            return None
-        return self.text[self.position + 1]
-    
-    def _previous_char(self) -> Optional[str]:
-        if self.position - 1 < 0:
-            return None
-        return self.text[self.position - 1]
-
-    def _opening_curly_brace(self) -> bool:
-        return self._char() == '{'
-    
-    def _closing_curly_brace(self) -> bool:
-        return self._char() == '}'
-    
-    def _opening_square_brace(self) -> bool:
-        return self._char() == '['
 
-    def _closing_square_brace(self) -> bool:
-        return self._char() == ']'
-    
-    def _comma(self) -> bool:
-        return self._char() == ','
-    
-    def _colon(self) -> bool:
-        return self._char() == ':'
-    
     def _quote(self) -> bool:
         return self._char() == '"'
-    
-    def _whitespace(self) -> bool:
-        return self._char() in (' ', '\t', '\n', '\r')
-    
-    def _advance(self) -> None:
-        self.position += 1
\ No newline at end of file
+
+def parse(text: str, pattern: Optional[Union[str, Pattern]] = None) -> json:
+    """Parses a JSON string, keeping only the values selected by the pattern."""
+    return Parser(text, pattern).parse()
+
+def iter_matches(text: str, pattern: Optional[Union[str, Pattern]] = None) -> Iterator[Tuple[Path, Any]]:
+    """Parses a JSON string, yielding the path and value of each selected array item as it is parsed."""
+    return Parser(text, pattern).iter_matches()
+
+def _addresses_array(element: Optional[Element]) -> bool:
+    """Returns whether a pattern tree selects the items of an array with brackets."""
+    pending: List[Optional[Element]] = [element]
+    while pending:
+        element = pending.pop()
+        if isinstance(element, Array):
+            return True
+        if isinstance(element, Dictionary):
+            pending.extend(element.children.values())
+            pending.append(element.wildcard)
+        elif isinstance(element, Descendant):
+            pending.append(element.target)
+        elif isinstance(element, Filter):
+            pending.append(element.element)
+        elif isinstance(element, UnionElement):
+            pending.extend(element.members)
+    return False
+
+def _streams(element: Element) -> bool:
+    """Returns whether the items of an array in this element are yielded one by one."""
+    if isinstance(element, UnionElement):
+        return any(isinstance(member, Array) for member in element.members)
+    return isinstance(element, Array)
+
+def _full(container: Union[Dict[str, Any], List[Any]], is_dict: bool, element: Optional[Element], key: Union[str, int]) -> bool:
+    """Returns whether a container holds everything its element selects, with its member at key stored."""
+    return len(container) >= element.selected_keys if is_dict else element.exhausted(key + 1)
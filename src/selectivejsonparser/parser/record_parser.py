@@ -0,0 +1,301 @@
+import dataclasses
+import functools
+import types
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.column_parser import ColumnParser, _layout
+from selectivejsonparser.parser.parser import unexpected, _NUMBER, _STRING_BODY, _WHITESPACE
+from selectivejsonparser.pattern import compile
+from selectivejsonparser.pattern.element import Dictionary, Element, Value
+
+# The element values of fields without a fast path are parsed with, whole.
+_WHOLE = Value()
+_NUMBER_START = frozenset("-0123456789")
+
+
+class _Slot:
+    """A field of a record type: where its value goes, and how it is read."""
+    __slots__ = ("index", "kind")
+
+    def __init__(self, index: int, kind: Any) -> None:
+        self.index: int = index
+        # int, float, str or bool for the fast paths, a _Schema for a nested record, or None to parse the value whole.
+        self.kind: Any = kind
+
+class _Schema:
+    """How the objects selected for a record type are read and built into records."""
+    __slots__ = ("fields", "defaults", "factories", "build", "element")
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, _Slot] = {}
+        # The value of each field when an object lacks it, and the fields whose default is made per record.
+        self.defaults: List[Any] = []
+        self.factories: List[Tuple[int, Callable[[], Any]]] = []
+        self.build: Callable[[List[Any]], Any] = list
+        # The pattern tree the fields amount to: a Value per field, or the element of its nested record.
+        self.element: Dictionary = Dictionary()
+
+    def blank(self) -> List[Any]:
+        """Returns the values of a record with no field read yet."""
+        values: List[Any] = self.defaults.copy()
+        for index, factory in self.factories:
+            values[index] = factory()
+        return values
+
+_schemas: Dict[type, _Schema] = {}
+
+class RecordParser(ColumnParser):
+    """Reads the items of an array into instances of a record type.
+
+    The record type is a dataclass, a NamedTuple or a class with __slots__, and its
+    fields are the keys selected from each item: RecordParser(text, Product, "data")
+    selects what Parser(text, "data[id|name|price]") would, without building a dict per
+    item. Fields annotated int, float, str or bool, or Optional of one of them, are read
+    straight from the text, and numbers in float fields become floats; a field whose type
+    is itself a record type is read into a nested record. Values are not checked against
+    their annotations: anything else is stored as Parser would parse it.
+
+    A field an item lacks gets its default, or None, and a key repeated in an item keeps
+    its first value. Items that are not objects are records in which every field is
+    missing. Once an item has every field, the rest of it is skipped without being
+    validated.
+
+    Dataclasses and NamedTuples are built through their constructors; instances of other
+    slotted classes are created without calling __init__ and have their slots set.
+
+    Attributes:
+        text (str): The JSON string to parse.
+        record_type (type): The type of the records.
+        pattern (Pattern): The compiled pattern that leads to the array. Slices and predicates
+            in its brackets select the items, as in 'data[status="ok"]' or "data[0:100]".
+    """
+    def __init__(self, text: str, record_type: type, path: Optional[str] = None) -> None:
+        super().__init__(text, _array_pattern(path), False)
+        self.record_type: type = record_type
+        self.schema: _Schema = _schema(record_type)
+        self.records: List[Any] = []
+
+    def parse(self) -> List[Any]:
+        """Returns a record for every selected item, in the order of the array."""
+        keys, items, _ = _layout(self.pattern)
+        self.records = []
+        self._skip_whitespace()
+        char: Optional[str] = self._char()
+        if char != '{' and char != '[':
+            raise ValueError("No JSON object or array found")
+        if self._locate(keys):
+            self._read_items(items, self.schema.element, self.schema.fields)
+        return self.records
+
+    def _read_item(self, element: Element, item: Dictionary, fields: Dict[str, _Slot], row: int) -> bool:
+        """Reads the item at the current position into a record, returning whether it is selected."""
+        char: Optional[str] = self._char()
+        if element.predicates is not None and (char == '{' or char == '['):
+            if self._filter(element, self.position) is None:
+                return False
+        elif element.predicates is not None:
+            if self._skip_value() is None:
+                raise ValueError("Expected closing square brace")
+            return False
+        if char == '{':
+            self.records.append(self._read_record(self.schema))
+        else:
+            if self._skip_value() is None:
+                raise ValueError("Expected closing square brace")
+            self.records.append(self.schema.build(self.schema.blank()))
+        return True
+
+    def _read_record(self, schema: _Schema) -> Any:
+        """Reads the object at the current position into a record and moves past it."""
+        values: List[Any] = schema.blank()
+        fields: Dict[str, _Slot] = schema.fields
+        whitespace: Any = _WHITESPACE.match
+        text: str = self.text
+        position: int = whitespace(text, self.position + 1).end()
+        if text[position:position + 1] == '}':
+            self.position = position + 1
+            return schema.build(values)
+        # The fields read so far, as bits by index.
+        seen: int = 0
+        found: int = 0
+        while True:
+            if text[position:position + 1] != '"':
+                raise ValueError("Expected string key")
+            end: int = _STRING_BODY.match(text, position + 1).end()
+            if text[end:end + 1] != '"':
+                raise ValueError("Unterminated string")
+            slot: Optional[_Slot] = fields.get(text[position + 1:end])
+            position = end + 1
+            char: str = text[position:position + 1]
+            if char != ':':
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+                if char != ':':
+                    raise ValueError("Expected colon after key")
+            position += 1
+            char = text[position:position + 1]
+            if char in ' \t\n\r':
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+            if slot is None or seen >> slot.index & 1:
+                if char == '"':
+                    end = _STRING_BODY.match(text, position + 1).end()
+                    if text[end:end + 1] != '"':
+                        raise ValueError("Unterminated string")
+                    position = end + 1
+                else:
+                    self.position = position
+                    if self._skip_value() is None:
+                        raise ValueError("Expected value after colon")
+                    position = self.position
+            else:
+                value: Any = unexpected
+                kind: Any = slot.kind
+                if kind is int or kind is float:
+                    if char in _NUMBER_START:
+                        match: Any = _NUMBER.match(text, position)
+                        end = match.end()
+                        fraction: Optional[int] = match.lastindex
+                        if kind is float or fraction is None:
+                            if fraction == 3 and match.start(3) == end:
+                                raise ValueError("Invalid number format")
+                            number: str = text[position:end]
+                            try:
+                                value = float(number) if kind is float else int(number)
+                            except ValueError as exc:
+                                raise ValueError(f"Invalid number: {number}") from exc
+                            position = end
+                elif kind is str:
+                    if char == '"':
+                        end = _STRING_BODY.match(text, position + 1).end()
+                        if text[end:end + 1] == '"':
+                            value = text[position + 1:end]
+                            position = end + 1
+                elif kind is bool:
+                    if text.startswith("true", position):
+                        value = True
+                        position += 4
+                    elif text.startswith("false", position):
+                        value = False
+                        position += 5
+                elif kind is not None and char == '{':
+                    self.position = position
+                    value = self._read_record(kind)
+                    position = self.position
+                if value is unexpected:
+                    self.position = position
+                    value = self._parse_member(_WHOLE, char, True)
+                    position = self.position
+                values[slot.index] = value
+                seen |= 1 << slot.index
+                found += 1
+                if found == len(fields):
+                    # Every field is read, and a repeated key keeps its first value.
+                    self.position = position
+                    self._skip_container(1)
+                    return schema.build(values)
+            char = text[position:position + 1]
+            if char in ' \t\n\r':
+                position = whitespace(text, position).end()
+                char = text[position:position + 1]
+            if char == ',':
+                position += 1
+                char = text[position:position + 1]
+                if char in ' \t\n\r':
+                    position = whitespace(text, position).end()
+            elif char == '}':
+                self.position = position + 1
+                return schema.build(values)
+            else:
+                raise ValueError("Expected closing curly brace")
+
+def parse_records(text: str, record_type: type, path: Optional[str] = None) -> List[Any]:
+    """Parses a JSON string, returning the items of the array at path as instances of record_type."""
+    return RecordParser(text, record_type, path).parse()
+
+def _array_pattern(path: Optional[str]) -> Any:
+    """Compiles the pattern of the array at path, selecting every item unless its brackets say otherwise."""
+    if path is None:
+        return compile("[*]")
+    return compile(path if path.endswith("]") else f"{path}[*]")
+
+def _schema(record_type: type) -> _Schema:
+    """Returns the schema of a record type, building it the first time."""
+    if record_type in _schemas:
+        return _schemas[record_type]
+    if not isinstance(record_type, type):
+        raise TypeError(f"Not a record type: {record_type!r}")
+    names: List[str]
+    defaults: List[Any] = []
+    factories: List[Tuple[int, Callable[[], Any]]] = []
+    build: Callable[[List[Any]], Any]
+    if dataclasses.is_dataclass(record_type):
+        fields: List[dataclasses.Field] = [field for field in dataclasses.fields(record_type) if field.init]
+        names = [field.name for field in fields]
+        for index, field in enumerate(fields):
+            defaults.append(None if field.default is dataclasses.MISSING else field.default)
+            if field.default_factory is not dataclasses.MISSING:
+                factories.append((index, field.default_factory))
+        if any(field.kw_only for field in fields):
+            build = functools.partial(_keywords, record_type, tuple(names))
+        else:
+            build = functools.partial(_positional, record_type)
+    elif issubclass(record_type, tuple) and hasattr(record_type, "_fields"):
+        names = list(record_type._fields)
+        defaults = [record_type._field_defaults.get(name) for name in names]
+        build = functools.partial(tuple.__new__, record_type)
+    else:
+        names = _slot_names(record_type)
+        if not names:
+            raise TypeError(f"Not a dataclass, NamedTuple or slotted class: {record_type.__name__}")
+        defaults = [None] * len(names)
+        build = functools.partial(_slotted, record_type, tuple(getattr(record_type, name).__set__ for name in names))
+    hints: Dict[str, Any] = typing.get_type_hints(record_type)
+    schema: _Schema = _Schema()
+    schema.defaults = defaults
+    schema.factories = factories
+    schema.build = build
+    # Stored before the fields are resolved, so that a type may contain itself.
+    _schemas[record_type] = schema
+    for index, name in enumerate(names):
+        kind: Any = _kind(hints.get(name))
+        schema.fields[name] = _Slot(index, kind)
+        schema.element[name] = kind.element if isinstance(kind, _Schema) else Value()
+    return schema
+
+def _kind(annotation: Any) -> Any:
+    """Returns how a field with the annotation is read."""
+    if typing.get_origin(annotation) in (Union, types.UnionType):
+        arguments: Tuple[Any, ...] = tuple(argument for argument in typing.get_args(annotation) if argument is not type(None))
+        if len(arguments) != 1:
+            return None
+        annotation = arguments[0]
+    if annotation in (int, float, str, bool):
+        return annotation
+    if isinstance(annotation, type) and _is_record_type(annotation):
+        return _schema(annotation)
+    return None
+
+def _is_record_type(cls: type) -> bool:
+    return dataclasses.is_dataclass(cls) or (issubclass(cls, tuple) and hasattr(cls, "_fields")) or bool(_slot_names(cls))
+
+def _slot_names(cls: type) -> List[str]:
+    """Returns the public slots of a class and its bases, base classes first."""
+    names: List[str] = []
+    for base in reversed(cls.__mro__):
+        slots: Any = base.__dict__.get("__slots__", ())
+        names.extend(name for name in ((slots,) if isinstance(slots, str) else slots) if not name.startswith("_"))
+    return names
+
+def _positional(record_type: type, values: List[Any]) -> Any:
+    return record_type(*values)
+
+def _keywords(record_type: type, names: Tuple[str, ...], values: List[Any]) -> Any:
+    return record_type(**dict(zip(names, values)))
+
+def _slotted(record_type: type, setters: Tuple[Callable[[Any, Any], None], ...], values: List[Any]) -> Any:
+    record: Any = record_type.__new__(record_type)
+    for setter, value in zip(setters, values):
+        setter(record, value)
+    return record
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from selectivejsonparser.parser.multi_parser import _select
+from selectivejsonparser.parser.parser import Parser
+from selectivejsonparser.pattern import Pattern, compile
+
+# How many characters of text are encoded at a time to be hashed.
+_DIGEST_SPAN = 1 << 16
+# A digest of the text, and the compiled pattern, which equals any other with the same pattern tree.
+Key = Tuple[bytes, Pattern]
+
+
+class ResultCache:
+    """A bounded cache of parse results for documents that are parsed again and again.
+
+    Results are keyed by a SHA-256 digest of the text and by the compiled pattern, so
+    a cache hit costs one hash of the text; the text itself is not kept. Cached results
+    are shared by every caller and are returned as read-only FrozenDict and FrozenList
+    views, which wrap nested containers as they are accessed; materialize() gives a
+    private copy in plain dicts and lists. Text that fails to parse is not cached.
+
+    The cache may be shared across threads. Parsing happens outside its lock, so
+    threads that miss on the same document at once each parse it.
+
+    Attributes:
+        maxsize (int): How many results are kept. Beyond that, the least recently used is evicted.
+        ttl (float | None): How many seconds a result is kept, or None to keep it until it is evicted.
+        hits (int): How many parses were answered from the cache.
+        misses (int): How many parses were not.
+        evictions (int): How many results were dropped because the cache was full or they expired.
+    """
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache TTL must be positive")
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        # Each result with the time it expires at, or None, from least to most recently used.
+        self._entries: "OrderedDict[Key, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def parse(self, text: Union[str, bytes], pattern: Optional[Union[str, Pattern]] = None) -> Union["FrozenDict", "FrozenList"]:
+        """Returns what Parser(text, pattern).parse() returns, as a read-only view, parsing
+        the text only if the cache has no live result for it. Bytes are decoded as UTF-8."""
+        compiled: Pattern = pattern if isinstance(pattern, Pattern) else compile(pattern)
+        key: Key = (_digest(text), compiled)
+        now: float = time.monotonic() if self.ttl is not None else 0.0
+        with self._lock:
+            entry: Optional[Tuple[Any, Optional[float]]] = self._entries.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _frozen(entry[0])
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+        result: Any = Parser(text if isinstance(text, str) else str(text, "utf-8"), compiled).parse()
+        with self._lock:
+            self._entries[key] = (result, None if self.ttl is None else now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return _frozen(result)
+
+    def clear(self) -> None:
+        """Drops every result. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ResultCache(maxsize={self.maxsize}, ttl={self.ttl}, size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+class FrozenDict(Mapping):
+    """A read-only view of a cached object."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data: Dict[str, Any] = data
+
+    def __getitem__(self, key: str) -> Any:
+        return _frozen(self._data[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenDict):
+            other = other._data
+        return self._data == other if isinstance(other, dict) else NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def materialize(self) -> Dict[str, Any]:
+        """Copies the object into plain dicts and lists."""
+        return _select(self._data, None)
+
+class FrozenList(Sequence):
+    """A read-only view of a cached array."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: List[Any]) -> None:
+        self._data: List[Any] = data
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [_frozen(value) for value in self._data[index]]
+        return _frozen(self._data[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(_frozen, self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenList):
+            other = other._data
+        return self._data == other if isinstance(other, list) else NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def materialize(self) -> List[Any]:
+        """Copies the array into plain dicts and lists."""
+        return _select(self._data, None)
+
+def _frozen(value: Any) -> Any:
+    if value.__class__ is dict:
+        return FrozenDict(value)
+    if value.__class__ is list:
+        return FrozenList(value)
+    return value
+
+def _digest(text: Union[str, bytes]) -> bytes:
+    # SHA-256 is hardware accelerated on most current CPUs, and faster there than BLAKE2.
+    digest: Any = hashlib.sha256()
+    if not isinstance(text, str):
+        digest.update(text)
+        return digest.digest()
+    # Text is encoded a slice at a time, so that a hit does not copy the whole document.
+    # UTF-8 encodes each code point on its own, so the digest is the one of the whole text.
+    for start in range(0, len(text), _DIGEST_SPAN):
+        digest.update(text[start:start + _DIGEST_SPAN].encode("utf-8", "surrogatepass"))
+    return digest.digest()
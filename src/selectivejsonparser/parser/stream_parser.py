@@ -0,0 +1,80 @@
+import codecs
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, Union
+
+from selectivejsonparser.parser.parser import Parser
+from selectivejsonparser.pattern import Pattern
+
+Chunk = Union[bytes, bytearray, memoryview, str]
+
+
+class StreamParser(Parser):
+    """A selective JSON parser that reads its input incrementally.
+
+    The input is decoded as UTF-8 chunk by chunk, and text that has been parsed
+    or skipped is released, so memory grows with the selected output, the nesting
+    depth and the largest single token rather than with the size of the input.
+
+    Attributes:
+        source (BinaryIO | Iterable[bytes]): A binary file object or an iterable of byte chunks.
+        chunk_size (int): The number of bytes to read from a file object at a time.
+    """
+    _rewindable = False
+
+    def __init__(self, source: Union[BinaryIO, Iterable[Chunk]], pattern: Optional[Union[str, Pattern]] = None, chunk_size: int = 65536,
+                 early_exit: bool = False) -> None:
+        super().__init__("", pattern, early_exit)
+        self.chunk_size: int = chunk_size
+        self._chunks: Iterator[Chunk] = self._read(source)
+        self._decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder("utf-8")()
+        self._exhausted: bool = False
+
+    def _read(self, source: Union[BinaryIO, Iterable[Chunk]]) -> Iterator[Chunk]:
+        if not hasattr(source, "read"):
+            yield from source
+            return
+        while True:
+            chunk: Chunk = source.read(max(self.chunk_size, self._wanted()))
+            if not chunk:
+                return
+            yield chunk
+
+    def _fill(self) -> bool:
+        if self._exhausted:
+            return False
+        wanted: int = self._wanted()
+        pieces: list = []
+        size: int = 0
+        while size == 0 or size < wanted:
+            chunk: Optional[Chunk] = next(self._chunks, None)
+            if chunk is None:
+                pieces.append(self._decoder.decode(b"", final=True))
+                self._exhausted = True
+                break
+            piece: str = chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+            pieces.append(piece)
+            size += len(piece)
+        appended: str = "".join(pieces)
+        if not appended:
+            return False
+        self.text += appended
+        return True
+
+    def _wanted(self) -> int:
+        # Read at least as much as is already buffered past the position, so a token spanning
+        # many chunks is assembled in amortized linear time. While the buffer is pinned, none
+        # of it is released, so read as much as it holds for the same reason.
+        return len(self.text) if self._pinned else len(self.text) - self.position
+
+    def _contains(self, needles: Optional[Tuple[str, ...]]) -> bool:
+        # The input has not been read yet, so it cannot be searched.
+        return True
+
+    def _discard(self) -> None:
+        if self.position and not self._pinned:
+            self.text = self.text[self.position:]
+            self.position = 0
+
+    def _skip_whitespace(self) -> None:
+        super()._skip_whitespace()
+        if self.position >= self.chunk_size:
+            self._discard()
@@ -1,2 +1,2 @@
 from .pattern_parser import PatternParser
-from .pattern import Pattern
\ No newline at end of file
+from .pattern import Pattern, compile
\ No newline at end of file
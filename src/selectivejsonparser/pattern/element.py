@@ -1,47 +1,392 @@
-from typing import Dict, List, Optional
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union as TypingUnion
 from typing_extensions import Self
 
+# Transitions are cached per state up to this many keys. The caches live in compiled
+# patterns, which are shared, so they keep that many keys from parsed documents alive.
+_MAX_TRANSITIONS = 1024
+
 class Element:
+    """A node of a compiled pattern tree.
+
+    Nodes are slotted, and carry flags computed when they are built, so that the parser
+    decides what to do with a value from plain attribute lookups.
+    """
+    __slots__ = ("from_end", "accepts", "needles", "predicates", "passed", "failed",
+                 "leaf", "any_index", "items", "has_descendants", "selected_keys", "plain")
+
     def __init__(self) -> None:
-        self.parent: Optional[Element] = None
+        # Whether the element selects array items counting from the end of the array.
+        self.from_end: bool = False
+        # Whether a value reached in this element is kept: false for states that only search deeper,
+        # which drop scalars and containers in which nothing was found.
+        self.accepts: bool = True
+        # Quoted keys, one of which a container must contain to be searched, or None to search every container.
+        self.needles: Optional[Tuple[str, ...]] = None
+        # Conditions on the fields of an object that decide whether it continues in `passed` or in `failed`.
+        self.predicates: Optional[Tuple["Predicate", ...]] = None
+        self.passed: Optional[Element] = None
+        self.failed: Optional[Element] = None
+        # Whether the element selects the whole value.
+        self.leaf: bool = False
+        # Whether every array item continues in `items`, so no index needs to be looked up.
+        self.any_index: bool = False
+        self.items: Optional[Element] = None
+        # Whether a recursive search applies anywhere in the subtree.
+        self.has_descendants: bool = False
+        # How many members an object selected by the element can have at most.
+        self.selected_keys: int = sys.maxsize
+        # Whether a container reached in this element is simply entered: no slice, search or predicate applies.
+        self.plain: bool = True
+
+    def _settle(self) -> None:
+        self.plain = not (self.leaf or self.from_end or self.needles is not None or self.predicates is not None)
+
+    def __eq__(self, other: object) -> bool:
+        """Returns whether other is a tree that selects the same: the caches of states are not compared."""
+        return other.__class__ is self.__class__ and other._key() == self._key()
+
+    def __hash__(self) -> int:
+        return hash((self.__class__, self._key()))
+
+    def _key(self) -> Tuple[Any, ...]:
+        """Returns what the element is built from, for comparing and hashing it."""
+        return ()
+
+    def exhausted(self, index: int) -> bool:
+        """Returns whether no array item at or after index can be selected."""
+        return False
+
+    def indices(self, length: int) -> range:
+        """Returns the indices of the items an array of the given length may have selected."""
+        return range(length)
 
-    def set_parent(self, parent: Self) -> None:
-        self.parent = parent
+    def item(self, index: int, length: int) -> Optional["Element"]:
+        """Returns the element of the item at index of an array of the given length."""
+        return self[index]
 
 class Dictionary(Element):
+    __slots__ = ("children", "wildcard")
+
     def __init__(self) -> None:
         super().__init__()
         self.children: Dict[str, Element] = {}
+        self.wildcard: Optional[Element] = None
+        self.any_index = True
+        self.selected_keys = 0
 
     def __setitem__(self, key: str, child: Element) -> None:
-        self.children[key] = child
-        child.set_parent(self)
+        if key == '*':
+            self.wildcard = self.items = child
+            self.selected_keys = sys.maxsize
+        else:
+            self.children[key] = child
+            if self.wildcard is None:
+                self.selected_keys = len(self.children)
+        self.has_descendants = self.has_descendants or child.has_descendants
 
-    def __getitem__(self, key: str) -> Optional[Element]:
-        if key not in self.children:
-            return None
-        return self.children[key]
+    def __getitem__(self, key: TypingUnion[str, int]) -> Optional[Element]:
+        """Returns the element of the member at key, which the wildcard matches along with any array index."""
+        return self.children.get(key, self.wildcard)
 
     def __contains__(self, key: str) -> bool:
         return key in self.children
 
+    def _key(self) -> Tuple[Any, ...]:
+        return tuple(self.children.items()), self.wildcard
+
+    def __reduce__(self) -> Any:
+        members: List[Tuple[str, Element]] = list(self.children.items())
+        if self.wildcard is not None:
+            members.append(('*', self.wildcard))
+        return Dictionary, (), None, None, iter(members)
+
+    def map_keys(self, function: Callable[[str], str]) -> "Dictionary":
+        """Returns a copy of the subtree with every key replaced by function(key)."""
+        mapped: Dictionary = Dictionary()
+        for key, child in self.children.items():
+            mapped[function(key)] = child.map_keys(function)
+        if self.wildcard is not None:
+            mapped['*'] = self.wildcard.map_keys(function)
+        return mapped
+
 class Array(Element):
-    def __init__(self) -> None:
+    """Selects the items of an array, or only those in the slice [start:stop]."""
+    __slots__ = ("children", "start", "stop")
+
+    def __init__(self, start: Optional[int] = None, stop: Optional[int] = None) -> None:
         super().__init__()
         self.children: List[Element] = []
+        self.start: Optional[int] = start
+        self.stop: Optional[int] = stop
+        self.from_end = (start is not None and start < 0) or (stop is not None and stop < 0)
+        self.any_index = start is None and stop is None
+        self._settle()
 
     def append(self, element: Element) -> None:
         self.children.append(element)
-        element.set_parent(self)
+        if self.any_index and len(self.children) == 1:
+            self.items = element
+        self.has_descendants = self.has_descendants or element.has_descendants
 
     def __getitem__(self, index: int) -> Optional[Element]:
-        if index < len(self.children):
-            return self.children[index]
-        return None
+        """Returns the element of the array item at a non-negative index, or None if it is not selected."""
+        if index.__class__ is not int or not self.children:
+            return None
+        if (self.start is not None and index < self.start) or (self.stop is not None and index >= self.stop):
+            return None
+        return self.children[0]
+
+    def indices(self, length: int) -> range:
+        return range(length)[self.start:self.stop]
+
+    def item(self, index: int, length: int) -> Optional[Element]:
+        return self.children[0] if self.children and index in self.indices(length) else None
+
+    def exhausted(self, index: int) -> bool:
+        return self.stop is not None and 0 <= self.stop <= index
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.start, self.stop, tuple(self.children)
+
+    def __reduce__(self) -> Any:
+        return Array, (self.start, self.stop), None, iter(self.children)
+
+    def map_keys(self, function: Callable[[str], str]) -> "Array":
+        mapped: Array = Array(self.start, self.stop)
+        for child in self.children:
+            mapped.append(child.map_keys(function))
+        return mapped
 
 class Value(Element):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
+        self.leaf = True
+        self.any_index = True
+        self._settle()
 
     def __getitem__(self, key: str) -> Optional[Element]:
-        return None
\ No newline at end of file
+        return None
+
+    def __reduce__(self) -> Any:
+        return Value, ()
+
+    def map_keys(self, function: Callable[[str], str]) -> "Value":
+        return Value()
+
+class Descendant(Element):
+    """Searches for the keys of a dictionary at any depth, as in "..key".
+
+    A member whose key the target matches continues in the target's child, and the
+    search goes on inside it as well; every other member and array item is searched.
+    The states of matched keys are cached in transitions while parsing, which is the
+    only part of a compiled pattern that changes after it is built.
+    """
+    __slots__ = ("target", "transitions")
+
+    def __init__(self, target: Dictionary) -> None:
+        super().__init__()
+        self.accepts = False
+        self.target: Dictionary = target
+        if target.wildcard is None:
+            self.needles = tuple(f'"{key}"' for key in target.children)
+        self.transitions: Dict[Any, Optional[Element]] = {}
+        # Every array index leads to the same state.
+        self.has_descendants = True
+        self.any_index = True
+        self.items = self if target.wildcard is None else union((target.wildcard, self))
+        self._settle()
+
+    def __getitem__(self, key: TypingUnion[str, int]) -> Optional[Element]:
+        if key.__class__ is not str:
+            return self.items
+        if key in self.transitions:
+            return self.transitions[key]
+        child: Optional[Element] = self.target[key]
+        if child is None:
+            # The search goes on, which needs no cache, so that other keys of documents are not kept.
+            return self
+        state: Optional[Element] = union((child, self))
+        if len(self.transitions) < _MAX_TRANSITIONS:
+            self.transitions[key] = state
+        return state
+
+    def _key(self) -> Tuple[Any, ...]:
+        return (self.target,)
+
+    def __reduce__(self) -> Any:
+        # The transitions are a cache, and are rebuilt as they are needed.
+        return Descendant, (self.target,)
+
+    def map_keys(self, function: Callable[[str], str]) -> "Descendant":
+        return Descendant(self.target.map_keys(function))
+
+class Predicate:
+    """A condition on a field of an object: a comparison with a literal, or "?" for existence.
+
+    Strings are compared as they appear in the JSON text, without unescaping. Values
+    of different types never compare, except integers and floats.
+    """
+    OPERATORS = ("==", "!=", "<=", ">=", "=", "<", ">", "?")
+    __slots__ = ("field", "operator", "value")
+
+    def __init__(self, field: str, operator: str, value: Any = None) -> None:
+        self.field: str = field
+        self.operator: str = "==" if operator == "=" else operator
+        self.value: Any = value
+
+    def test(self, fields: Dict[str, Any]) -> bool:
+        """Returns whether the condition holds for the given fields; a missing field never holds."""
+        if self.field not in fields:
+            return False
+        if self.operator == "?":
+            return True
+        value: Any = fields[self.field]
+        if not _comparable(value, self.value):
+            return self.operator == "!="
+        if self.operator == "==":
+            return value == self.value
+        if self.operator == "!=":
+            return value != self.value
+        if value is None or isinstance(value, bool):
+            return False
+        if self.operator == "<":
+            return value < self.value
+        if self.operator == "<=":
+            return value <= self.value
+        if self.operator == ">":
+            return value > self.value
+        return value >= self.value
+
+    def map_keys(self, function: Callable[[str], str]) -> "Predicate":
+        return Predicate(function(self.field), self.operator, function(self.value) if isinstance(self.value, str) else self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Predicate) and other._key() == self._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __reduce__(self) -> Any:
+        return Predicate, (self.field, self.operator, self.value)
+
+    def _key(self) -> Tuple[Any, ...]:
+        # True == 1, but the two literals select different values.
+        return self.field, self.operator, self.value.__class__, self.value
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.field!r}, {self.operator!r}, {self.value!r})"
+
+def _comparable(value: Any, literal: Any) -> bool:
+    if isinstance(value, bool) or isinstance(literal, bool) or value is None or literal is None:
+        return type(value) is type(literal)
+    if isinstance(value, (int, float)):
+        return isinstance(literal, (int, float))
+    return type(value) is type(literal)
+
+class Filter(Element):
+    """Selects the objects whose fields satisfy every predicate, and continues in element inside them."""
+    __slots__ = ("element",)
+
+    def __init__(self, predicates: Tuple[Predicate, ...], element: Element) -> None:
+        super().__init__()
+        self.accepts = False
+        self.predicates = predicates
+        self.element: Element = element
+        self.passed = element
+        self.has_descendants = element.has_descendants
+        self._settle()
+
+    def __getitem__(self, key: TypingUnion[str, int]) -> Optional[Element]:
+        return self.element[key]
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.predicates, self.element
+
+    def __reduce__(self) -> Any:
+        return Filter, (self.predicates, self.element)
+
+    def map_keys(self, function: Callable[[str], str]) -> "Filter":
+        return Filter(tuple(predicate.map_keys(function) for predicate in self.predicates), self.element.map_keys(function))
+
+class Union(Element):
+    """The state of several elements that apply to the same value at once.
+
+    Unions are built on demand while parsing, when a recursive search matches inside
+    a value that is also selected otherwise, and cache their own transitions. Like
+    those of Descendant, the caches are filled while parsing and hold up to
+    _MAX_TRANSITIONS keys taken from documents.
+    """
+    __slots__ = ("members", "transitions", "_sliced")
+
+    def __init__(self, members: Tuple[Element, ...]) -> None:
+        super().__init__()
+        self.members: Tuple[Element, ...] = members
+        self.accepts = any(member.accepts for member in members)
+        self.from_end = any(member.from_end for member in members)
+        if not self.accepts and all(member.needles is not None for member in members):
+            self.needles = tuple({needle for member in members for needle in member.needles})
+        filters: List[Element] = [member for member in members if member.predicates is not None]
+        if filters:
+            others: List[Element] = [member for member in members if member.predicates is None]
+            self.predicates = tuple(predicate for member in filters for predicate in member.predicates)
+            self.passed = union([member.passed for member in filters] + others)
+            self.failed = union(others)
+        # Items of a sliced array lead to different states, so their transitions are not cached.
+        self._sliced: bool = any(isinstance(member, Array) and (member.start is not None or member.stop is not None)
+                                 for member in members)
+        self.transitions: Dict[Any, Optional[Element]] = {}
+        self.has_descendants = any(member.has_descendants for member in members)
+        self._settle()
+
+    def __getitem__(self, key: TypingUnion[str, int]) -> Optional[Element]:
+        if key.__class__ is str:
+            cached: Any = key
+        elif self._sliced:
+            return union(member[key] for member in self.members)
+        else:
+            cached = int
+        if cached in self.transitions:
+            return self.transitions[cached]
+        state: Optional[Element] = union(member[key] for member in self.members)
+        if len(self.transitions) < _MAX_TRANSITIONS:
+            self.transitions[cached] = state
+        return state
+
+    def item(self, index: int, length: int) -> Optional[Element]:
+        return union(member.item(index, length) for member in self.members)
+
+    def exhausted(self, index: int) -> bool:
+        return all(member.exhausted(index) for member in self.members)
+
+    def _key(self) -> Tuple[Any, ...]:
+        # The members apply at once, so their order does not matter.
+        return (frozenset(self.members),)
+
+    def __reduce__(self) -> Any:
+        return Union, (self.members,)
+
+    def map_keys(self, function: Callable[[str], str]) -> Optional[Element]:
+        return union(member.map_keys(function) for member in self.members)
+
+def union(elements: Iterable[Optional[Element]]) -> Optional[Element]:
+    """Returns the state for a value that all the given elements apply to.
+
+    A leaf selects the whole value, so it takes precedence over the others.
+    """
+    members: List[Element] = []
+    for element in elements:
+        if element is None:
+            continue
+        if element.leaf:
+            return element
+        for member in element.members if isinstance(element, Union) else (element,):
+            if not any(member is other for other in members):
+                members.append(member)
+    if not members:
+        return None
+    if len(members) == 1:
+        return members[0]
+    return Union(tuple(members))
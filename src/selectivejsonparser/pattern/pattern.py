@@ -1,23 +1,82 @@
-from typing import Optional, Union, List
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple
 
 from selectivejsonparser.pattern import PatternParser
-from selectivejsonparser.pattern.element import Element
+from selectivejsonparser.pattern.element import Dictionary, Element
 class Pattern:
+    """A compiled path pattern.
+
+    A compiled pattern is immutable and holds no parse state, so one instance can be
+    shared by any number of parsers and threads. Use compile() to get a cached instance.
+    The one exception is the states of recursive searches, which cache the state each
+    key leads to as documents are parsed. The caches are bounded, and only change how
+    fast a state is found, but a shared pattern keeps up to about a thousand keys from
+    parsed documents per state alive.
+    Patterns are equal when their pattern trees are, whatever their strings say.
+
+    Attributes:
+        pattern (str): The pattern string, or None to match everything.
+        element (Element): The root of the compiled pattern tree.
+    """
+    __slots__ = ("pattern", "element", "_hash")
+
     def __init__(self, pattern: Optional[str]) -> None:
-        self.element: Optional[Element] = PatternParser(pattern).parse() if pattern else None
-        self.has_pattern: bool = pattern is not None
-        self.stack: List[Optional[Element]] = []
-
-    def match(self, value: Optional[Union[str, int]] = None) -> None:
-        self.stack.append(self.element)
-        if self.element is None:
-            return
-        self.element = self.element[value]
-
-    def backtrack(self) -> None:
-        if not self.stack:
-            return
-        self.element = self.stack.pop()
-
-    def matched(self) -> bool:
-        return (len(self.stack) > 0 and self.stack[-1] is not None and self.element is not None) or (not self.has_pattern)
\ No newline at end of file
+        object.__setattr__(self, "pattern", pattern)
+        object.__setattr__(self, "element", PatternParser(pattern).parse() if pattern else None)
+        object.__setattr__(self, "_hash", None)
+
+    @property
+    def has_pattern(self) -> bool:
+        return self.pattern is not None
+
+    @property
+    def needles(self) -> Optional[Tuple[str, ...]]:
+        """The quoted keys one of which a document must contain for anything to be selected
+        from it, or None if a document without them can still have a non-empty result."""
+        if isinstance(self.element, Dictionary) and self.element.wildcard is None:
+            return tuple(f'"{key}"' for key in self.element.children)
+        return None if self.element is None else self.element.needles
+
+    @classmethod
+    def from_element(cls, pattern: Optional[str], element: Optional[Element]) -> "Pattern":
+        """Returns a pattern with an already built pattern tree, described by the pattern string."""
+        built: Pattern = object.__new__(cls)
+        object.__setattr__(built, "pattern", pattern)
+        object.__setattr__(built, "element", element)
+        object.__setattr__(built, "_hash", None)
+        return built
+
+    def map_keys(self, function: Callable[[str], str]) -> "Pattern":
+        """Returns a copy of the pattern that matches function(key) wherever this one matches key."""
+        return Pattern.from_element(self.pattern, self.element.map_keys(function) if self.element else None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Pattern is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Pattern):
+            return False
+        return other is self or (other.has_pattern == self.has_pattern and other.element == self.element)
+
+    def __hash__(self) -> int:
+        # The tree is hashed whole, so the hash is kept.
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash((self.has_pattern, self.element)))
+        return self._hash
+
+    def __reduce__(self) -> Any:
+        # A pattern its string compiles to is unpickled through the cache, anything else with its tree.
+        try:
+            if compile(self.pattern) == self:
+                return (compile, (self.pattern,))
+        except ValueError:
+            pass
+        return (Pattern.from_element, (self.pattern, self.element))
+
+    def __repr__(self) -> str:
+        return f"Pattern({self.pattern!r})"
+
+@lru_cache(maxsize=256)
+def compile(pattern: Optional[str]) -> Pattern:
+    """Compiles a pattern string, reusing the compiled pattern for repeated strings."""
+    return Pattern(pattern)
\ No newline at end of file
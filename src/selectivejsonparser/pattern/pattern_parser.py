@@ -1,6 +1,6 @@
-from typing import List, Optional, Set
+from typing import Any, Dict, List, Optional, Tuple
 
-from selectivejsonparser.pattern.element import Element, Dictionary, Array, Value
+from selectivejsonparser.pattern.element import Element, Dictionary, Array, Value, Descendant, Filter, Predicate
 
 class PatternParser:
     """Parses a pattern string into its component elements.
@@ -12,6 +12,11 @@ class PatternParser:
         "key1.key2[key3]" -> {"key1": {"key2": [{"key3": ...}]}}
         "key1|key2.key3" -> {"key1" or "key2": {"key3": ...}}
         "[key1]" -> [{"key1": ...}, {"key1": ...}, ...]
+        "key1[0:100].key2" -> {"key1": [{"key2": ...}, ... up to the item at index 99]}
+        "key1[-1]" -> {"key1": [last item]}
+        "key1.*.key2" -> {"key1": {any key: {"key2": ...}}}
+        "..key1" -> {"key1": ...} wherever it occurs
+        "key1[key2=\"a\"].key3" -> {"key1": [{"key3": ...} of the items whose key2 is "a"]}
     """
     def __init__(self, pattern: str) -> None:
         self.elements: List[Element] = []
@@ -24,20 +29,30 @@ class PatternParser:
             element = self._parse_array()
         return element
 
-    def _parse_dictionary(self) -> Optional[Dictionary]:
+    def _parse_dictionary(self) -> Optional[Element]:
+        descendant: bool = False
         if self._dot():
             self._advance()
+            if self._dot():
+                self._advance()
+                descendant = True
         parentheses: bool = self._opening_parenthesis()
         if parentheses:
             self._advance()
-        if not self._alphanumeric():
+        if not self._alphanumeric() and not self._star():
+            if descendant:
+                raise ValueError("Expected key after '..'")
             return None
-        keys: Set[str] = set()
+        # The keys, in the order the pattern names them.
+        keys: Dict[str, None] = {}
         while True:
             start: int = self.position
-            while self._alphanumeric():
+            if self._star():
                 self._advance()
-            keys.add(self.pattern[start:self.position])
+            else:
+                while self._alphanumeric():
+                    self._advance()
+            keys[self.pattern[start:self.position]] = None
             if not self._or():
                 break
             self._advance()
@@ -49,12 +64,19 @@ class PatternParser:
         child: Optional[Element] = self.parse()
         for key in keys:
             element[key] = child if child else Value()
-        return element
+        return Descendant(element) if descendant else element
 
     def _parse_array(self) -> Optional[Array]:
         if not self._opening_bracket():
             return None
         self._advance()
+        if self._index() or self._colon():
+            slice: Optional[Array] = self._parse_slice()
+            if slice is not None:
+                return slice
+        predicates: Optional[Tuple[Predicate, ...]] = self._parse_predicates()
+        if predicates is not None:
+            return self._parse_filter(predicates)
         element: Optional[Element] = self.parse()
         if not self._closing_bracket():
             raise ValueError("Expected closing bracket")
@@ -63,6 +85,111 @@ class PatternParser:
         array.append(element if element else Value())
         return array
 
+    def _parse_slice(self) -> Optional[Array]:
+        """Parses an index "[i]" or a slice "[start:stop]", followed by the pattern for the selected items.
+
+        Returns None for a key that starts with a digit, such as "[1st]".
+        """
+        position: int = self.position
+        start: Optional[int] = self._parse_integer()
+        stop: Optional[int] = None
+        if not self._colon() and not self._closing_bracket() and self._alphanumeric():
+            self.position = position
+            return None
+        if self._colon():
+            self._advance()
+            stop = self._parse_integer()
+        elif start != -1:
+            stop = start + 1
+        if not self._closing_bracket():
+            raise ValueError("Expected closing bracket")
+        self._advance()
+        element: Optional[Element] = self.parse()
+        array: Array = Array(start, stop)
+        array.append(element if element else Value())
+        return array
+
+    def _parse_filter(self, predicates: Tuple[Predicate, ...]) -> Array:
+        """Parses the pattern for the items that satisfy predicates, after the closing bracket."""
+        if not self._closing_bracket():
+            raise ValueError("Expected closing bracket")
+        self._advance()
+        element: Optional[Element] = self.parse()
+        array: Array = Array()
+        array.append(Filter(predicates, element if element else Value()))
+        return array
+
+    def _parse_predicates(self) -> Optional[Tuple[Predicate, ...]]:
+        """Parses predicates joined by "&", such as "status=\"active\"&age>=18" or "email?".
+
+        Returns None if the brackets hold a pattern rather than predicates.
+        """
+        position: int = self.position
+        predicates: List[Predicate] = []
+        while True:
+            start: int = self.position
+            while self._alphanumeric():
+                self._advance()
+            field: str = self.pattern[start:self.position]
+            operator: Optional[str] = self._parse_operator()
+            if not field or operator is None:
+                if predicates:
+                    raise ValueError("Expected predicate")
+                self.position = position
+                return None
+            value: Any = None if operator == '?' else self._parse_literal()
+            predicates.append(Predicate(field, operator, value))
+            if self._char() != '&':
+                return tuple(predicates)
+            self._advance()
+
+    def _parse_operator(self) -> Optional[str]:
+        for operator in Predicate.OPERATORS:
+            if self.pattern.startswith(operator, self.position):
+                self.position += len(operator)
+                return operator
+        return None
+
+    def _parse_literal(self) -> Any:
+        """Parses a string in double quotes, a number, true, false or null."""
+        start: int = self.position
+        if self._char() == '"':
+            self._advance()
+            while self._char() is not None and self._char() != '"':
+                if self._char() == '\\':
+                    self._advance()
+                self._advance()
+            if self._char() is None:
+                raise ValueError("Unterminated string")
+            self._advance()
+            return self.pattern[start + 1:self.position - 1]
+        while self._char() is not None and self._char() not in ']&':
+            self._advance()
+        literal: str = self.pattern[start:self.position]
+        constants: dict = {"true": True, "false": False, "null": None}
+        if literal in constants:
+            return constants[literal]
+        try:
+            return int(literal)
+        except ValueError:
+            pass
+        try:
+            return float(literal)
+        except ValueError:
+            raise ValueError(f"Invalid predicate value: {literal}") from None
+
+    def _parse_integer(self) -> Optional[int]:
+        start: int = self.position
+        if self._char() == '-':
+            self._advance()
+        while self._char() is not None and self._char().isdigit():
+            self._advance()
+        if self.position == start:
+            return None
+        if not self.pattern[self.position - 1].isdigit():
+            raise ValueError("Expected array index")
+        return int(self.pattern[start:self.position])
+
     def _char(self) -> Optional[str]:
         if self.position < len(self.pattern):
             return self.pattern[self.position]
@@ -83,6 +210,13 @@ class PatternParser:
     def _closing_parenthesis(self) -> bool:
         return self._char() == ')'
     
+    def _colon(self) -> bool:
+        return self._char() == ':'
+
+    def _index(self) -> bool:
+        char = self._char()
+        return char is not None and (char.isdigit() or char == '-')
+
     def _dot(self) -> bool:
         return self._char() == '.'
     
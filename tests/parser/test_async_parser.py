@@ -0,0 +1,58 @@
+import asyncio
+import json as jsonlib
+import unittest
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from selectivejsonparser.parser import AsyncParser, Parser
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+async def collect(parser: AsyncParser) -> List[Tuple[Any, Any]]:
+    return [match async for match in parser]
+
+class TestAsyncParser(unittest.IsolatedAsyncioTestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"timestamp": 1700000000, "source": "sénsor ☃ \"]}, 😀"},
+        "data": {"results": [{"id": i, "status": "ok" if i % 2 else "fail", "tags": ["a,]", {"b": i}]} for i in range(30)]},
+        "tail": [1, 2, 3],
+    }, ensure_ascii=False)
+
+    async def test_matches_iter_matches(self):
+        data: bytes = self.text.encode("utf-8")
+        patterns: List[Optional[str]] = [None, "metadata.timestamp", "data.results[id|status]", "data.results[-2:].id",
+                                         "data.results[1:3].tags[1]", 'data.results[status="ok"].id', "..tags[b]", "tail[0]"]
+        for pattern in patterns:
+            expected: List[Tuple[Any, Any]] = list(Parser(self.text, pattern).iter_matches())
+            for size in (1, 3, 64, 4096):
+                with self.subTest(pattern=pattern, size=size):
+                    self.assertEqual(await collect(AsyncParser(chunked(data, size), pattern)), expected)
+
+    async def test_feed(self):
+        parser: AsyncParser = AsyncParser(pattern="a[id]")
+        matches: AsyncIterator[Tuple[Any, Any]] = parser.__aiter__()
+        parser.feed(b'{"a": [{"id": 1}, {"id": 2')
+        self.assertEqual(await matches.__anext__(), (("a", 0), {"id": 1}))
+        pending: asyncio.Future = asyncio.ensure_future(matches.__anext__())
+        await asyncio.sleep(0.01)
+        self.assertFalse(pending.done())
+        parser.feed(b'}, 3')
+        self.assertEqual(await pending, (("a", 1), {"id": 2}))
+        parser.feed(b"]}")
+        parser.close()
+        self.assertEqual([match async for match in matches], [(("a", 2), 3)])
+        with self.assertRaises(ValueError):
+            parser.feed(b" ")
+
+    async def test_invalid_input(self):
+        for text in (b'{"a": [{"id": 1}, {"id": ', b'{"a": [1 2]}', b'{"a": [1]} x', b"", b'{"a": "\xe2\x98'):
+            with self.subTest(text=text):
+                parser: AsyncParser = AsyncParser(pattern="a[id]")
+                with self.assertRaises(ValueError):
+                    parser.feed(text)
+                    parser.close()
+                    await collect(parser)
+
+if __name__ == "__main__":
+    unittest.main()
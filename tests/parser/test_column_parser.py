@@ -0,0 +1,85 @@
+import json as jsonlib
+import unittest
+from array import array
+from typing import Any, Dict, List
+
+from selectivejsonparser.parser import Column, ColumnParser, Parser, parse_columns
+from selectivejsonparser.parser import column_parser
+
+def values(columns: Dict[str, Column]) -> Dict[str, List[Any]]:
+    return {name: [value if valid else None for value, valid in zip(column.values, column.valid)] for name, column in columns.items()}
+
+class TestColumnParser(unittest.TestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"count": 20, "tags": ["x"]},
+        "data": {"results": [{"id": i, "price": i / 2 if i % 3 else i, "name": f"n{i}", "meta": {"ts": i * 10, "tags": [i]},
+                              "status": "ok" if i % 2 else None} for i in range(20)] + [{"other": 1}, 5]},
+        "tail": 1,
+    })
+
+    def test_matches_parser(self):
+        patterns: List[str] = ["data.results[id|price|name]", "data.results[meta.ts]", "data.results[0:3].id",
+                               "data.results[-2:].id", 'data.results[status="ok"].id', "data.results[price>5]", "data.results[*]",
+                               "data.results[5]", "data.results[(meta|id).tags]", "data.results[(name|meta|status).ts]"]
+        for pattern in patterns:
+            with self.subTest(pattern=pattern):
+                columns: Dict[str, Column] = parse_columns(self.text, pattern, numpy=False)
+                items: List[Any] = Parser(self.text, pattern).parse()["data"]["results"]
+                expected: Dict[str, List[Any]] = {}
+                for name in columns:
+                    expected[name] = []
+                    for item in items:
+                        for key in name.split("."):
+                            item = item.get(key) if isinstance(item, dict) else None
+                        # The column of a nested field holds the values that are not objects.
+                        nested: bool = any(other.startswith(name + ".") for other in columns)
+                        expected[name].append(None if nested and isinstance(item, dict) else item)
+                self.assertEqual(values(columns), expected)
+
+    def test_nested_fields_with_other_values(self):
+        text: str = '[{"id": 1, "meta": {"ts": 3}}, {"id": "a", "meta": [{"ts": 4}]}, {"id": {"ts": 5}, "meta": null}, {"meta": 6}]'
+        self.assertEqual(Parser(text, "[id|meta.ts]").parse(), [{"id": 1, "meta": {"ts": 3}}, {"id": "a", "meta": []}, {"id": {"ts": 5}, "meta": None}, {"meta": 6}])
+        columns: Dict[str, Column] = parse_columns(text, "[id|meta.ts]", numpy=False)
+        self.assertEqual(list(columns), ["id.ts", "meta.ts", "id", "meta"])
+        self.assertEqual(values(columns), {"id.ts": [None, None, 5, None], "meta.ts": [3, None, None, None],
+                                           "id": [1, "a", None, None], "meta": [None, [], None, 6]})
+        columns = parse_columns(text, "[meta.ts|source]", numpy=False)
+        self.assertEqual(values(columns), {"meta.ts": [3, None, None, None], "meta.source": [None] * 4, "meta": [None, [], None, 6]})
+
+    def test_column_types(self):
+        columns: Dict[str, Column] = parse_columns(self.text, "data.results[id|price|name|status|meta]", numpy=False)
+        self.assertEqual(list(columns), ["id", "price", "name", "status", "meta"])
+        self.assertEqual(columns["id"].values.typecode, "q")
+        self.assertEqual(columns["price"].values.typecode, "d")
+        self.assertEqual(columns["id"].valid, bytearray([1] * 20 + [0, 0]))
+        self.assertEqual(columns["status"].values[:3], [None, "ok", None])
+        self.assertEqual(columns["meta"].values[1], {"ts": 10, "tags": [1]})
+        self.assertEqual(len(columns["id"]), 22)
+        self.assertEqual(parse_columns('[{"a": 1}, {"a": 18446744073709551616}]', "[a]")["a"].values, [1, 18446744073709551616])
+        self.assertEqual(parse_columns('[{"a": true, "a": 2}]', "[a]")["a"].values, [True])
+        for first in ("[1]", '{"b": 1}', "[]"):
+            with self.subTest(first=first):
+                columns = parse_columns('{"data": [{"price": %s}, {"price": 2}, {"price": 3}]}' % first, "data[price]", numpy=False)
+                self.assertEqual(columns["price"].values, [jsonlib.loads(first), 2, 3])
+        missing: Dict[str, Column] = parse_columns(self.text, "missing[id]", numpy=False)
+        self.assertEqual(missing["id"].values, array("q"))
+
+    @unittest.skipUnless(column_parser.numpy, "NumPy is not installed")
+    def test_numpy(self):
+        columns: Dict[str, Column] = ColumnParser(self.text, "data.results[id|name]", numpy=True).parse()
+        self.assertEqual(columns["id"].values.tolist(), list(range(20)) + [0, 0])
+        self.assertEqual(columns["id"].valid.tolist(), [True] * 20 + [False, False])
+        self.assertIsInstance(columns["name"].values, list)
+
+    def test_invalid_input(self):
+        for pattern in ("data", "data.*[id]", "..id", "a|b[id]"):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(ValueError):
+                    parse_columns(self.text, pattern)
+        for text in ('[{"b": 1,}]', '[{"a" 1}]', '[{"a": 1} {"a": 2}]', '[{"a": }]', '[{"a": [1, 2}]', '[1, ]'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_columns(text, "[a]")
+
+if __name__ == "__main__":
+    unittest.main()
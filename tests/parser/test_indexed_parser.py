@@ -0,0 +1,77 @@
+import json as jsonlib
+import os
+import tempfile
+import unittest
+from typing import List, Optional
+
+from selectivejsonparser.parser import IndexedParser, Parser, StructuralIndex, build_index
+
+class TestIndexedParser(unittest.TestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"timestamp": 1700000000, "source": {"name": "sénsor ☃ \"]}, 😀", "id": 7}},
+        "data": {"results": [{"id": i, "status": "ok" if i % 2 else "fail", "tags": ["a", {"id": -i}], "none": None} for i in range(20)]},
+        "empty": {},
+        "list": [],
+        "scalar": 1,
+    }, ensure_ascii=False, indent=1)
+    patterns: List[Optional[str]] = [
+        None, "metadata.timestamp", "metadata", "data.results[id|status]", "data.results[0:3].id", "data.results[-2:].status",
+        "data.results[5]", "..id", "*.source.name", "empty.missing", "scalar.x", "[id]", "metadata.*", "data..tags[1]",
+        'data.results[status="ok"&id>10].tags[1]', "data.results[none]", "list[0]", "data.results[*]",
+    ]
+
+    def setUp(self) -> None:
+        self.directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.directory.name, "data.json.idx")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_matches_parser(self):
+        index: StructuralIndex = build_index(self.text, self.path)
+        with StructuralIndex.load(self.path) as loaded:
+            for pattern in self.patterns:
+                expected = Parser(self.text, pattern).parse()
+                for current in (index, loaded, None):
+                    with self.subTest(pattern=pattern, loaded=current is loaded):
+                        self.assertEqual(IndexedParser(self.text, pattern, current).parse(), expected)
+        for text in ("[]", "{}", ' [1, "a", [2], {"b": null}] '):
+            with self.subTest(text=text):
+                self.assertEqual(IndexedParser(text, "[b]").parse(), Parser(text, "[b]").parse())
+
+    def test_tables(self):
+        index: StructuralIndex = StructuralIndex.build('{"a": [1, {"b": 2}], "c": "x"}')
+        self.assertEqual(list(index.starts), [0, 6, 10])
+        self.assertEqual(list(index.ends), [30, 19, 18])
+        self.assertEqual([(index.first[number], index.counts[number]) for number in range(3)], [(3, 2), (1, 2), (0, 1)])
+        self.assertEqual(list(index.children), [-1, -1, 2, 1, -1])
+        self.assertEqual(list(index.values), [16, 7, 10, 6, 26])
+        self.assertEqual(list(index.key_starts), [12, -1, -1, 2, 22])
+
+    def test_sidecar(self):
+        build_index(self.text, self.path)
+        with StructuralIndex.load(self.path) as loaded:
+            copy: str = self.path + ".copy"
+            loaded.save(copy)
+        with open(self.path, "rb") as original, open(copy, "rb") as saved:
+            self.assertEqual(original.read(), saved.read())
+        with StructuralIndex.load(self.path) as loaded:
+            with self.assertRaises(ValueError):
+                IndexedParser(self.text.replace("7", "8"), "metadata", loaded)
+        with open(self.path, "r+b") as file:
+            file.truncate(100)
+        with self.assertRaises(ValueError):
+            StructuralIndex.load(self.path)
+        with open(self.path, "wb") as file:
+            file.write(b"not an index file at all, but long enough for a header")
+        with self.assertRaises(ValueError):
+            StructuralIndex.load(self.path)
+
+    def test_invalid_input(self):
+        for text in ('{"a": [1, 2}', '{"a" 1}', '{"a": 1,}', "[1, ]", '{"a": "b}', "[1] x", "1", "", '{"a": [1 2]}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    StructuralIndex.build(text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import io
+import json as jsonlib
+import unittest
+from typing import Any, Iterator, List
+
+from selectivejsonparser.parser import LinesParser, Parser, ParseStats, StreamParser, instrument
+
+class TestInstrument(unittest.TestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"timestamp": 1700000000, "source": "sensor"},
+        "data": [{"id": i, "status": "ok" if i % 2 else "fail", "tags": ["a", {"q": i}]} for i in range(10)],
+    })
+
+    def test_results_unchanged(self):
+        for pattern in (None, "metadata.timestamp", "data[id]", "data[-2:].id", "..q", 'data[status="ok"].tags'):
+            with self.subTest(pattern=pattern):
+                parser: Parser = instrument(Parser(self.text, pattern))
+                self.assertEqual(type(parser).__name__, "InstrumentedParser")
+                self.assertEqual(parser.parse(), Parser(self.text, pattern).parse())
+                self.assertEqual(parser.stats.characters, len(self.text))
+                self.assertGreaterEqual(parser.stats.scanned, 0)
+                self.assertIn("parse", parser.stats.timings)
+        self.assertIs(type(Parser(self.text)), Parser)
+
+    def test_counters(self):
+        parser: Parser = instrument(Parser('{"a": [1, {"b": 2, "z": 3}], "c": "x", "d": {"e": null}}', "a[b]"))
+        self.assertEqual(parser.parse(), {"a": [1, {"b": 2}]})
+        stats: ParseStats = parser.stats
+        self.assertEqual((stats.containers, stats.atoms, stats.max_depth), (3, 2, 3))
+        self.assertEqual((stats.containers_skipped, stats.atoms_skipped, stats.skipped), (1, 2, len('3"x"{"e": null}')))
+        parser = instrument(Parser(self.text, 'data[status="ok"&id>4].id'))
+        self.assertEqual(parser.parse(), {"data": [{"id": 5}, {"id": 7}, {"id": 9}]})
+        self.assertEqual((parser.stats.tests, parser.stats.rejected, parser.stats.backtracks), (10, 7, 3))
+        self.assertIn("filter", parser.stats.timings)
+        parser = instrument(Parser(self.text, "data..q"))
+        parser.parse()
+        self.assertEqual((parser.stats.searches, parser.stats.misses), (31, 0))
+
+    def test_hook(self):
+        reports: List[ParseStats] = []
+        parser: Parser = instrument(StreamParser(io.BytesIO(self.text.encode()), "data[id]", chunk_size=16), reports.append)
+        matches: Iterator[Any] = parser.iter_matches()
+        self.assertEqual(next(matches), (("data", 0), {"id": 0}))
+        self.assertEqual(reports, [])
+        matches.close()
+        self.assertEqual(len(reports), 1)
+        self.assertIs(reports[0], parser.stats)
+        self.assertEqual((reports[0].containers, reports[0].atoms), (1, 1))
+        parser = instrument(StreamParser(io.BytesIO(self.text.encode()), "data[id]", chunk_size=16), reports.append)
+        self.assertEqual(len(list(parser.iter_matches())), 10)
+        self.assertEqual(reports[-1].characters, len(self.text))
+        self.assertEqual(reports[-1].as_dict()["atoms"], 10)
+        with self.assertRaises(ValueError):
+            instrument(Parser('{"a": [1, 2}', "a"), reports.append).parse()
+        self.assertEqual(len(reports), 3)
+
+    def test_invalid_parser(self):
+        with self.assertRaises(TypeError):
+            instrument(LinesParser(""))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json as jsonlib
+import unittest
+
+from selectivejsonparser.parser import LazyDict, LazyList, LazyParser, Parser
+
+class TestLazyParser(unittest.TestCase):
+    def setUp(self) -> None:
+        self.text: str = jsonlib.dumps({
+            "name": "John",
+            "age": 30,
+            "address": {"city": "New York", "zip": "10001", "tags": []},
+            "orders": [{"id": i, "total": i * 1.5, "paid": i % 2 == 0, "note": None} for i in range(5)],
+        })
+
+    def test_matches_eager_parser(self):
+        for pattern in (None, "name", "address.city", "orders[id|note]", "(name|address).city", "orders", "address.tags", "orders[1:3].id", "orders[-1]",
+                        "..id", "..city", "orders.*.paid"):
+            with self.subTest(pattern=pattern):
+                result = LazyParser(self.text, pattern).parse()
+                expected = Parser(self.text, pattern).parse()
+                self.assertEqual(result, expected)
+                self.assertEqual(result.materialize(), expected)
+                self.assertIs(type(result.materialize()), dict)
+
+    def test_searches_prune_like_eager_parser(self):
+        for text, pattern in (('{"c": 3.5, "a": {}}', "..(c|a)..*"), ('[{"a": {"b": {}}}, [{"d": 1}], {"x": "d"}, {"c": {"d": 2}}]', "[..*.*.d]"),
+                              ('{"a": {"s": "key"}, "b": [{"key": 1}, {"k": ["key"]}]}', "..key"), ('{"a": [[], {"b": {}}, {"b": 1}]}', "..a..b")):
+            with self.subTest(text=text, pattern=pattern):
+                result = LazyParser(text, pattern).parse()
+                expected = Parser(text, pattern).parse()
+                self.assertEqual(result.materialize(), expected)
+                self.assertEqual(len(result), len(expected))
+
+    def test_proxies(self):
+        result = LazyParser(self.text, "address|orders[id]").parse()
+        self.assertIsInstance(result, LazyDict)
+        self.assertEqual(list(result), ["address", "orders"])
+        orders = result["orders"]
+        self.assertIsInstance(orders, LazyList)
+        self.assertIs(orders, result["orders"])
+        self.assertEqual(len(orders), 5)
+        self.assertEqual(orders[-1], {"id": 4})
+        self.assertEqual(orders[1:3], [{"id": 1}, {"id": 2}])
+        self.assertNotIn("name", result)
+        with self.assertRaises(KeyError):
+            result["name"]
+
+    def test_errors_are_deferred_to_access(self):
+        result = LazyParser('{"good": 1, "bad": {"a" 1}}').parse()
+        self.assertEqual(result["good"], 1)
+        with self.assertRaisesRegex(ValueError, "Expected colon after key"):
+            result["bad"]["a"]
+        with self.assertRaisesRegex(ValueError, "Expected closing square brace"):
+            LazyParser('[1, 2, 3x]').parse()[2]
+
+    def test_structural_errors(self):
+        for text, message in (('{"a": [1, 2}', "Unterminated container"), ('{} 1', "Unexpected data after JSON value"),
+                              (' ', "No JSON object or array found")):
+            with self.subTest(text=text):
+                with self.assertRaisesRegex(ValueError, message):
+                    LazyParser(text).parse()
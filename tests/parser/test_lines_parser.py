@@ -0,0 +1,73 @@
+import io
+import unittest
+from typing import List
+
+from selectivejsonparser.parser import LinesParser, parse_lines, json
+
+class TestLinesParser(unittest.TestCase):
+    text: str = '{"id": 1, "user": {"name": "Ann"}}\n\n{"id": 2, "user": {"name": "Bø"}}\r\n  [1, 2]  \n{"id": 4}'
+
+    def test_sources(self):
+        expected: List[json] = [{"user": {"name": "Ann"}}, {"user": {"name": "Bø"}}, [], {}]
+        data: bytes = self.text.encode("utf-8")
+        sources = {
+            "str": self.text,
+            "bytes": data,
+            "bytearray": bytearray(data),
+            "memoryview": memoryview(data),
+            "file": io.BytesIO(data),
+        }
+        for name, source in sources.items():
+            for chunk_size in (1, 7, 1 << 20):
+                with self.subTest(source=name, chunk_size=chunk_size):
+                    if name == "file":
+                        source.seek(0)
+                    result: List[json] = list(LinesParser(source, "user.name", chunk_size=chunk_size))
+                    self.assertEqual(result, expected)
+
+    def test_full_records(self):
+        self.assertEqual(list(parse_lines('{"a": 1}\n{"b": [true, null]}\n')), [{"a": 1}, {"b": [True, None]}])
+
+    def test_prefilter(self):
+        text: str = '{"id": 1, "error": {"code": 7}}\n{"id": 2, "msg": "no error here"}\n[{"error": 1}]\n{"id": 4, "x": [tru\n{"id": 5}\n'
+        expected: List[json] = [{"error": {"code": 7}}, {}, [], {}, {}]
+        for source in (text, text.encode("utf-8")):
+            with self.subTest(source=type(source).__name__):
+                self.assertEqual(list(LinesParser(source, "error.code", prefilter=True)), expected)
+        with self.assertRaises(ValueError):
+            list(parse_lines(text, "error.code"))
+
+    def test_malformed_records(self):
+        text: str = '{"id": 1}\n{"id": \n{"id": 3} x\n"scalar"\n{"id": "unterminated}\n{"id": 6}\n'
+        with self.subTest("raise"):
+            with self.assertRaises(ValueError) as context:
+                list(parse_lines(text, "id"))
+            self.assertIn("line 2", str(context.exception))
+        with self.subTest("skip"):
+            self.assertEqual(list(parse_lines(text, "id", errors="skip")), [{"id": 1}, {"id": 6}])
+        with self.subTest("collect"):
+            parser: LinesParser = LinesParser(text.encode("utf-8"), "id", errors="collect")
+            self.assertEqual(list(parser), [{"id": 1}, {"id": 6}])
+            self.assertEqual([line for line, _ in parser.malformed], [2, 3, 4, 5])
+        with self.subTest("invalid UTF-8"):
+            parser = LinesParser(b'{"id": 1}\n{"id": "\xff"}\n{"id": 3}\n', "id", errors="collect")
+            self.assertEqual(list(parser), [{"id": 1}, {"id": 3}])
+            self.assertEqual([line for line, _ in parser.malformed], [2])
+        with self.subTest("unknown handling"):
+            with self.assertRaises(ValueError):
+                LinesParser(text, "id", errors="ignore")
+
+    def test_records_spanning_lines(self):
+        text: str = '{"a": 1,\n"b": 2}\n{"a": 3}\n'
+        for source in (text, text.encode(), io.BytesIO(text.encode())):
+            with self.subTest(source=type(source).__name__):
+                parser: LinesParser = LinesParser(source, "a", errors="collect")
+                self.assertEqual(list(parser), [{"a": 3}])
+                self.assertEqual([(line, str(exc)) for line, exc in parser.malformed],
+                                 [(1, "Unterminated record"), (2, "No JSON object or array found")])
+        self.assertEqual(list(LinesParser(text, "a", errors="skip")), [{"a": 3}])
+        with self.assertRaisesRegex(ValueError, "line 1: Unterminated record"):
+            list(LinesParser(text, "a"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import json as jsonlib
+import os
+import tempfile
+import unittest
+
+from selectivejsonparser.parser import MappedParser, Parser, json
+
+class TestMappedParser(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, data: bytes) -> str:
+        path: str = os.path.join(self.directory.name, "data.json")
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def test_matches_in_memory_parser(self):
+        text: str = jsonlib.dumps({
+            "métadonnées": {"horodatage": 1700000000, "source": "sénsor ☃ 😀"},
+            "data": [{"id": i, "名前": "名前%d" % i, "skip": "ø" * 10} for i in range(100)],
+        }, ensure_ascii=False)
+        path: str = self.write(text.encode("utf-8"))
+        for pattern in (None, "métadonnées.source", "data[名前]", "data[id]", "..名前", "métadonnées.*", 'data[名前="名前7"].id'):
+            for chunk_size in (3, 64, 1 << 20):
+                with self.subTest(pattern=pattern, chunk_size=chunk_size):
+                    result: json = MappedParser(path, pattern, chunk_size=chunk_size).parse()
+                    self.assertEqual(result, Parser(text, pattern).parse())
+
+    def test_iter_matches(self):
+        path: str = self.write('{"données": [{"名前": "ø", "id": 1}, "é"]}'.encode("utf-8"))
+        self.assertEqual(list(MappedParser(path, "données[名前]").iter_matches()), [(("données", 0), {"名前": "ø"}), (("données", 1), "é")])
+
+    def test_prefilter(self):
+        path: str = self.write('{"données": [1, 2], "名前": {"x": 1}}'.encode("utf-8"))
+        for pattern in ("名前.x", "données", "missing", "..x"):
+            with self.subTest(pattern=pattern):
+                self.assertEqual(MappedParser(path, pattern, prefilter=True).parse(), Parser(open(path, encoding="utf-8").read(), pattern).parse())
+        self.assertEqual(MappedParser(self.write(b'{"a": [tru]}'), "missing", prefilter=True).parse(), {})
+
+    def test_unselected_invalid_utf8_is_not_decoded(self):
+        path: str = self.write(b'{"skip": "\xff\xfe", "keep": "ok"}')
+        self.assertEqual(MappedParser(path, "keep").parse(), {"keep": "ok"})
+        with self.assertRaises(ValueError):
+            MappedParser(path).parse()
+
+    def test_empty_file(self):
+        with self.assertRaises(ValueError):
+            MappedParser(self.write(b"")).parse()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import json as jsonlib
+import unittest
+from typing import List
+
+from selectivejsonparser.parser import MultiParser, Parser, json, parse_many
+from selectivejsonparser.pattern import compile
+
+class TestMultiParser(unittest.TestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"timestamp": 1700000000, "source": {"name": "sensor", "id": 7}},
+        "data": {"results": [{"id": i, "status": "ok" if i % 2 else "fail", "tags": ["a", {"id": -i}]} for i in range(20)]},
+        "empty": {},
+        "scalar": 1,
+    })
+
+    def test_matches_separate_parses(self):
+        patterns: List[str] = [
+            None, "metadata.timestamp", "metadata", "data.results[id|status]", "data.results[0:3].id",
+            "data.results[-2:].status", "data.results[5]", "..id", "*.source.name", "empty.missing", "scalar.x",
+            "[id]", "metadata.*", "data..tags[1]",
+        ]
+        expected: List[json] = [Parser(self.text, pattern).parse() for pattern in patterns]
+        self.assertEqual(MultiParser(self.text, patterns).parse(), expected)
+        for pattern, result in zip(patterns, expected):
+            with self.subTest(pattern=pattern):
+                self.assertEqual(parse_many(self.text, [pattern, "scalar"]), [result, {"scalar": 1}])
+
+    def test_slices_with_searches(self):
+        text: str = '[1, {"x": 1}, {"a": 1}, [{"a": 2}]]'
+        patterns: List[str] = ["[2]..a", "[0:2]..a", "[-1]..a", "[1:]..a", "[3]"]
+        self.assertEqual(parse_many(text, patterns), [Parser(text, pattern).parse() for pattern in patterns])
+        self.assertEqual(parse_many(text, ["[2]..a", "[0:2]..a"]), [[{"a": 1}], []])
+
+    def test_results_are_independent(self):
+        for patterns in (["metadata", compile("metadata.source")], ["metadata.source", "metadata"], ["metadata", "metadata", "*"]):
+            with self.subTest(patterns=patterns):
+                results: List[json] = parse_many(self.text, patterns)
+                self.assertEqual(results, [Parser(self.text, pattern).parse() for pattern in patterns])
+                sources = [result["metadata"]["source"] for result in results]
+                self.assertEqual(len({id(source) for source in sources}), len(sources))
+
+    def test_no_patterns(self):
+        self.assertEqual(parse_many(self.text, []), [])
+
+    def test_invalid_document(self):
+        with self.assertRaises(ValueError):
+            parse_many('{"a": [1, 2}', ["a", "b"])
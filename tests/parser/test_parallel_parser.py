@@ -0,0 +1,45 @@
+import json as jsonlib
+import unittest
+from typing import Any, List
+
+from selectivejsonparser.parser import ParallelParser, Parser, parse_lines
+
+class TestParallelParser(unittest.TestCase):
+    records: List[Any] = [{"id": i, "name": "n%d" % i, "tags": [{"t": i}, {"t": "},{"}], "note": "a, b"} for i in range(300)]
+
+    def test_array_matches_sequential_parse(self):
+        text: str = jsonlib.dumps(self.records)
+        for pattern in (None, "[id|tags[t]]", "[name]"):
+            expected = Parser(text, pattern).parse()
+            for source in (text, text.encode("utf-8")):
+                for workers, chunk_size in ((1, 64), (3, 64), (3, 1 << 20)):
+                    with self.subTest(pattern=pattern, bytes=isinstance(source, bytes), workers=workers, chunk_size=chunk_size):
+                        result = ParallelParser(source, pattern, workers=workers, chunk_size=chunk_size).parse()
+                        self.assertEqual(result, expected)
+
+    def test_falls_back_to_exact_split(self):
+        # Every separator the speculative split finds lies inside a nested array.
+        text: str = jsonlib.dumps([{"rows": [[i], [i + 1], [i + 2]]} for i in range(50)])
+        result = ParallelParser(text, "[rows]", workers=2, chunk_size=16).parse()
+        self.assertEqual(result, Parser(text, "[rows]").parse())
+
+    def test_scalar_array(self):
+        text: str = jsonlib.dumps(["a,b", 1, 2.5, True, None, "]"] * 20)
+        self.assertEqual(ParallelParser(text, workers=2, chunk_size=8).parse(), jsonlib.loads(text))
+
+    def test_non_array_source(self):
+        self.assertEqual(ParallelParser('{"id": 1, "x": 2}', "id", workers=2).parse(), {"id": 1})
+        self.assertEqual(ParallelParser(' [ ] ', workers=2).parse(), [])
+
+    def test_malformed_array(self):
+        with self.assertRaises(ValueError):
+            ParallelParser('[{"id": 1}, {"id": 2}, {"id": ]', workers=2, chunk_size=4).parse()
+
+    def test_lines(self):
+        text: str = "\n".join(jsonlib.dumps(record) for record in self.records) + "\n{broken\n"
+        parser: ParallelParser = ParallelParser(text.encode("utf-8"), "id", workers=3, chunk_size=500, lines=True, errors="collect")
+        self.assertEqual(parser.parse(), list(parse_lines(text, "id", errors="skip")))
+        self.assertEqual([line for line, _ in parser.malformed], [301])
+
+if __name__ == "__main__":
+    unittest.main()
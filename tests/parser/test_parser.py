@@ -1,6 +1,9 @@
+import json as jsonlib
 import unittest
+from typing import List, Optional, Tuple
 
-from selectivejsonparser.parser import Parser, json
+from selectivejsonparser.parser import Parser, json, parse, iter_matches
+from selectivejsonparser.pattern import compile
 class TestParser(unittest.TestCase):
     def test_parse_empty_string(self):
         with self.assertRaises(ValueError):
@@ -151,6 +154,209 @@ class TestParser(unittest.TestCase):
             pattern: str = "company.employees[name]"
             result: json = Parser(text, pattern).parse()
             self.assertEqual(result, {"company": {"employees": [{"name": "Ivan"}, {"name": "Judy"}]}})
+    def test_skip_unmatched_subtrees(self):
+        with self.subTest("Unmatched containers are omitted"):
+            text: str = '{"name": "Alice", "other": {"y": [1, {"z": 2}]}, "tags": ["a", "b"]}'
+            result: json = Parser(text, "name").parse()
+            self.assertEqual(result, {"name": "Alice"})
+        with self.subTest("Brackets inside skipped strings are ignored"):
+            text: str = r'{"other": {"s": "]}\"[{", "t": ["}"]}, "name": "Bob"}'
+            result: json = Parser(text, "name").parse()
+            self.assertEqual(result, {"name": "Bob"})
+        with self.subTest("Skipped array items"):
+            text: str = '{"users": [{"name": "Grace", "tags": [[1], {"a": []}]}], "meta": [[], {}]}'
+            result: json = Parser(text, "users[name]").parse()
+            self.assertEqual(result, {"users": [{"name": "Grace"}]})
+        with self.subTest("Unterminated skipped container"):
+            with self.assertRaises(ValueError):
+                Parser('{"other": {"y": [1, 2}, "name": "Carol"', "name").parse()
+        with self.subTest("Unterminated skipped string"):
+            with self.assertRaises(ValueError):
+                Parser('{"other": {"y": "abc}}', "name").parse()
+    def test_escaped_backslash_before_quote(self):
+        result: json = Parser(r'{"path": "C:\\", "next": "x"}').parse()
+        self.assertEqual(result, {"path": r"C:\\", "next": "x"})
+
+    def test_number_formats(self):
+        result: json = Parser('[0, -12, 3.5, -0.25e-3, 1.5E+2, 2.]').parse()
+        self.assertEqual(result, [0, -12, 3.5, -0.25e-3, 1.5e+2, 2.0])
+        for text in ('[1.5e]', '[1.5e-]', '[-]', '[.]'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    Parser(text).parse()
+
+    def test_deeply_nested(self):
+        depth: int = 100000
+        result: json = Parser('[' * depth + ']' * depth).parse()
+        for _ in range(depth - 1):
+            result = result[0]
+        self.assertEqual(result, [])
+        text: str = '{"a": ' * depth + '1' + '}' * depth
+        self.assertEqual(Parser(text, "a.a.b").parse(), {"a": {"a": {}}})
+
+    def test_trailing_comma_in_list(self):
+        self.assertEqual(Parser('[1, 2,]').parse(), [1, 2])
+
+    def test_compiled_pattern(self):
+        text: str = '{"name": "Alice", "age": 25}'
+        self.assertEqual(Parser(text, compile("name")).parse(), {"name": "Alice"})
+        self.assertEqual(parse(text, "age"), {"age": 25})
+        self.assertEqual(parse(text), {"name": "Alice", "age": 25})
+
+    def test_array_slices(self):
+        items: List[dict] = [{"id": i, "name": "n%d" % i} for i in range(10)]
+        text: str = jsonlib.dumps({"items": items, "scalars": list(range(10))})
+        slices: List[Tuple[Optional[int], Optional[int]]] = [(0, 3), (None, 1), (4, None), (-1, None), (-3, -1), (2, -2), (-20, 20), (5, 2), (None, None)]
+        for start, stop in slices:
+            bounds: str = "%s:%s" % ("" if start is None else start, "" if stop is None else stop)
+            for early_exit in (False, True):
+                with self.subTest(slice=bounds, early_exit=early_exit):
+                    result: json = Parser(text, "items[%s].id" % bounds, early_exit=early_exit).parse()
+                    self.assertEqual(result, {"items": [{"id": item["id"]} for item in items[start:stop]]})
+                    result = Parser(text, "scalars[%s]" % bounds, early_exit=early_exit).parse()
+                    self.assertEqual(result, {"scalars": list(range(10))[start:stop]})
+        self.assertEqual(Parser(text, "items[-1]").parse(), {"items": [items[-1]]})
+        self.assertEqual(Parser(text, "items[3].name").parse(), {"items": [{"name": "n3"}]})
+        self.assertEqual(Parser('[[1, 2], [3, 4], [5, 6]]', "[1:][0]").parse(), [[3], [5]])
+
+    def test_negative_slices_on_objects(self):
+        cases: List[Tuple[str, str, json, list]] = [
+            ('{"x": {"a": 1}}', "x[-1]", {"x": {}}, []),
+            ('{"x": {"a": 1}}', "x[-2:].a", {"x": {}}, []),
+            ('{"c": {"a": 1, "b": 2}, "d": [1, 2, 3]}', "(c|*)[1:-1]", {"c": {}, "d": [2]}, [(("d", 1), 2)]),
+            ('{"d": {"e": [[1, 2], {"f": 3}]}}', "..d[[-1]]", {"d": {}}, []),
+        ]
+        for text, pattern, expected, matches in cases:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(Parser(text, pattern).parse(), expected)
+                self.assertEqual(list(Parser(text, pattern).iter_matches()), matches)
+        self.assertEqual(Parser('{"x": {"a": 1}}', "x[0]").parse(), {"x": {}})
+
+    def test_leaf_selects_whole_container(self):
+        text: str = '{"a": {"b": [1, {"c": 2}]}, "d": [{"e": null}], "f": 1}'
+        self.assertEqual(Parser(text, "a|d").parse(), {"a": {"b": [1, {"c": 2}]}, "d": [{"e": None}]})
+        self.assertEqual(Parser(text, "d[]").parse(), {"d": [{"e": None}]})
+
+    def test_array_slice_stops_at_upper_bound(self):
+        self.assertEqual(Parser('[1, 2, 3, {"broken": tru}]', "[0:2]").parse(), [1, 2])
+        self.assertEqual(Parser('{"items": [1, 2, {"x": tru}], "tail": 1}', "items[0:2]").parse(), {"items": [1, 2]})
+
+    def test_wildcard(self):
+        text: str = '{"a": {"x": {"id": 1, "n": 2}, "y": {"id": 3}}, "b": [{"id": 4}, {"n": 5}]}'
+        self.assertEqual(Parser(text, "a.*.id").parse(), {"a": {"x": {"id": 1}, "y": {"id": 3}}})
+        self.assertEqual(Parser(text, "b.*.id").parse(), {"b": [{"id": 4}, {}]})
+        self.assertEqual(Parser(text, "*").parse(), Parser(text).parse())
+
+    def test_recursive_descent(self):
+        text: str = '{"id": 0, "a": {"id": {"id": 1, "x": 2}, "b": [{"id": 3}, {"c": 4}, 5]}, "d": {"e": {"f": 6}}}'
+        cases = {
+            "..id": {"id": 0, "a": {"id": {"id": 1, "x": 2}, "b": [{"id": 3}]}},
+            "..f": {"d": {"e": {"f": 6}}},
+            "a..id": {"a": {"id": {"id": 1, "x": 2}, "b": [{"id": 3}]}},
+            "..(c|f)": {"a": {"b": [{"c": 4}]}, "d": {"e": {"f": 6}}},
+            "..b[-1]": {"a": {"b": [5]}},
+            "..missing": {},
+        }
+        for pattern, expected in cases.items():
+            for early_exit in (False, True):
+                with self.subTest(pattern=pattern, early_exit=early_exit):
+                    self.assertEqual(Parser(text, pattern, early_exit=early_exit).parse(), expected)
+
+    def test_recursive_descent_skips_subtrees_without_the_key(self):
+        text: str = '{"skipped": {"x": [tru, {"y": nul}]}, "kept": {"id": 1}}'
+        self.assertEqual(Parser(text, "..id").parse(), {"kept": {"id": 1}})
+        with self.assertRaises(ValueError):
+            Parser(text, "..x").parse()
+
+    def test_early_exit(self):
+        text: str = '{"metadata": {"timestamp": 1, "source": "a"}, "data": [{"id": 1, "x": 2, "y": [3]}, {"x": 4}], "tail": 5}'
+        for pattern in (None, "metadata.timestamp", "metadata|tail", "data[id]", "(metadata|data).source", "data[id|x]", "tail|missing", "data[y]"):
+            with self.subTest(pattern=pattern):
+                self.assertEqual(Parser(text, pattern, early_exit=True).parse(), Parser(text, pattern).parse())
+        with self.subTest("Stops before invalid trailing content"):
+            truncated: str = '{"metadata": {"timestamp": 1, "source": "a"}, "data": [{"id": '
+            self.assertEqual(Parser(truncated, "metadata.timestamp", early_exit=True).parse(), {"metadata": {"timestamp": 1}})
+            with self.assertRaises(ValueError):
+                Parser(truncated, "metadata.timestamp").parse()
+        with self.subTest("Keeps the first of repeated keys"):
+            self.assertEqual(Parser('{"a": 1, "a": 2}', "a", early_exit=True).parse(), {"a": 1})
+
+    def test_predicates(self):
+        text: str = ('{"users": [{"name": "a", "status": "active", "age": 30, "tags": []}, {"status": "gone", "age": 12, "name": "b"},'
+                     ' {"name": "c", "age": 50.5, "status": "active"}, {"name": "d", "age": null}, [1], 3]}')
+        cases = {
+            'users[status="active"].name': {"users": [{"name": "a"}, {"name": "c"}]},
+            'users[status="active"]': {"users": [{"name": "a", "status": "active", "age": 30, "tags": []}, {"name": "c", "age": 50.5, "status": "active"}]},
+            'users[status!="active"].name': {"users": [{"name": "b"}]},
+            'users[age>=30].name': {"users": [{"name": "a"}, {"name": "c"}]},
+            'users[age<30].name': {"users": [{"name": "b"}]},
+            'users[age=null].name': {"users": [{"name": "d"}]},
+            'users[tags?].name': {"users": [{"name": "a"}]},
+            'users[age>20&status="active"].name': {"users": [{"name": "a"}, {"name": "c"}]},
+            'users[age>40&status="gone"].name': {"users": []},
+            'users[status="active"].missing': {"users": [{}, {}]},
+            '..users[age=12].name': {"users": [{"name": "b"}]},
+        }
+        for pattern, expected in cases.items():
+            for early_exit in (False, True):
+                with self.subTest(pattern=pattern, early_exit=early_exit):
+                    self.assertEqual(Parser(text, pattern, early_exit=early_exit).parse(), expected)
+
+    def test_predicates_skip_rejected_items(self):
+        text: str = '[{"ok": false, "x": [tru, nul]}, {"x": 1, "ok": true}]'
+        self.assertEqual(Parser(text, "[ok=true].x").parse(), [{"x": 1}])
+        with self.assertRaises(ValueError):
+            Parser(text, "[x]").parse()
+
+    def test_prefilter(self):
+        text: str = '{"a": {"b": 1}, "c": [1, 2], "d": "\\"e\\""}'
+        for pattern in ("a.b", "c|x", "e", "..b", "..e", "x.y", "*.b", "[a]"):
+            with self.subTest(pattern=pattern):
+                self.assertEqual(Parser(text, pattern, prefilter=True).parse(), Parser(text, pattern).parse())
+        with self.subTest("Rejected documents are not validated"):
+            self.assertEqual(Parser('{"a": [tru]}', "x", prefilter=True).parse(), {})
+            self.assertEqual(Parser(' [{"a": nul}]', "..x", prefilter=True).parse(), [])
+            with self.assertRaises(ValueError):
+                Parser('{"x": [tru]}', "x", prefilter=True).parse()
+
+    def test_iter_matches(self):
+        text: str = ('{"meta": {"ts": 1}, "data": {"results": [{"id": 1, "s": "a", "n": [1, 2]}, {"id": 2}, 3],'
+                     ' "other": [{"id": 4}]}, "users": [{"ok": true, "e": 5}, {"ok": false, "e": 6}]}')
+        cases = {
+            "data.results[id]": [(("data", "results", 0), {"id": 1}), (("data", "results", 1), {"id": 2}), (("data", "results", 2), 3)],
+            "data.results[n[-1]]": [(("data", "results", 0), {"n": [2]}), (("data", "results", 1), {}), (("data", "results", 2), 3)],
+            "data.results[-2:]": [(("data", "results", 1), {"id": 2}), (("data", "results", 2), 3)],
+            "data.(results|other)[0].id": [(("data", "results", 0), {"id": 1}), (("data", "other", 0), {"id": 4})],
+            "..other[id]": [(("data", "other", 0), {"id": 4})],
+            "users[ok=true].e": [(("users", 0), {"e": 5})],
+            "meta.ts": [((), {"meta": {"ts": 1}})],
+        }
+        for pattern, expected in cases.items():
+            with self.subTest(pattern=pattern):
+                self.assertEqual(list(Parser(text, pattern).iter_matches()), expected)
+        with self.subTest("Top-level array without a pattern"):
+            self.assertEqual(list(iter_matches('[1, {"a": [2]}, "b"]')), [((0,), 1), ((1,), {"a": [2]}), ((2,), "b")])
+        with self.subTest("Yields items before reaching malformed content"):
+            matches = Parser('{"a": [{"id": 1}, {"id": 2}, {"id": ]}', "a[id]").iter_matches()
+            self.assertEqual(next(matches), (("a", 0), {"id": 1}))
+            self.assertEqual(next(matches), (("a", 1), {"id": 2}))
+            with self.assertRaises(ValueError):
+                next(matches)
+        for invalid in ('{"a": [1 2]}', '{"a": [1]} x', '{"a" [1]}', '"a"'):
+            with self.subTest(invalid=invalid):
+                with self.assertRaises(ValueError):
+                    list(Parser(invalid, "a[0:1]").iter_matches())
+
+    def test_shared_keys(self):
+        text: str = jsonlib.dumps([{"id": i, "name": str(i), "tags": {"name": i}} for i in range(3)])
+        for pattern in (None, "[id|name]", "[name|tags.name]"):
+            with self.subTest(pattern=pattern):
+                result: List[dict] = Parser(text, pattern).parse()
+                self.assertEqual(result, parse(text, pattern))
+                names: List[str] = [key for record in result for key in record if key == "name"]
+                names += [key for record in result for key in record.get("tags", {})]
+                self.assertEqual(len(names), 3 if pattern == "[id|name]" else 6)
+                self.assertTrue(all(name is names[0] for name in names))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
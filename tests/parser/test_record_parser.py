@@ -0,0 +1,106 @@
+import dataclasses
+import json as jsonlib
+import unittest
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from selectivejsonparser.parser import Parser, RecordParser, parse_records
+
+@dataclasses.dataclass
+class Meta:
+    ts: int
+    source: Optional[str] = None
+
+@dataclasses.dataclass
+class Product:
+    id: int
+    name: str
+    price: float
+    meta: Optional[Meta] = None
+    tags: List[Any] = dataclasses.field(default_factory=list)
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Frozen:
+    id: int
+    ok: bool = False
+
+class Point(NamedTuple):
+    x: float
+    y: float = 0.0
+    label: str = "origin"
+
+class Slotted:
+    __slots__ = ("id", "status", "_cache")
+    id: int
+
+class Node(NamedTuple):
+    value: int
+    child: Optional["Node"] = None
+
+class TestRecordParser(unittest.TestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"count": 4},
+        "data": [
+            {"id": 1, "name": "a", "price": 9.5, "status": "ok", "meta": {"ts": 10, "source": "s"}, "tags": ["x", {"y": 1}]},
+            {"price": 3, "id": 2, "name": 'b "q"', "status": "fail", "meta": None},
+            {"id": 3, "name": "c", "price": -1.5e3, "status": "ok", "ok": True, "extra": [1, 2, {"id": 9}]},
+            {"id": 4, "name": "d", "price": 0, "status": "ok", "meta": {"ts": 1.5}},
+        ],
+    })
+
+    def test_dataclass(self):
+        records: List[Product] = RecordParser(self.text, Product, "data").parse()
+        self.assertEqual(records, [
+            Product(1, "a", 9.5, Meta(10, "s"), ["x", {"y": 1}]),
+            Product(2, 'b \\"q\\"', 3.0, None),
+            Product(3, "c", -1500.0),
+            Product(4, "d", 0.0, Meta(1.5)),
+        ])
+        self.assertIsInstance(records[1].price, float)
+        self.assertIsNot(records[1].tags, records[2].tags)
+        expected: List[Dict[str, Any]] = Parser(self.text, "data[id|name|price]").parse()["data"]
+        self.assertEqual([(record.id, record.name, record.price) for record in records],
+                         [(item["id"], item["name"], item["price"]) for item in expected])
+        self.assertEqual(parse_records(self.text, Frozen, "data"), [Frozen(id=1), Frozen(id=2), Frozen(id=3, ok=True), Frozen(id=4)])
+
+    def test_record_types(self):
+        cases: Dict[str, Any] = {
+            "NamedTuple": (Point, '[{"x": 1, "y": 2, "label": "p"}, {"x": 3}, 5, {"label": "q", "z": 1}]',
+                           [Point(1.0, 2.0, "p"), Point(3.0), Point(None), Point(None, label="q")]),
+            "Repeated keys": (Point, '[{"x": 1, "x": 2, "y": 3}, {"y": 1, "y": [], "x": 2, "label": "a", "x": 3}]', [Point(1.0, 3.0), Point(2.0, 1.0, "a")]),
+            "Recursive": (Node, '[{"value": 1, "child": {"value": 2, "child": {"value": 3}}}, {"child": null, "value": 4}]',
+                          [Node(1, Node(2, Node(3))), Node(4)]),
+        }
+        for name, (record_type, text, expected) in cases.items():
+            with self.subTest(name):
+                self.assertEqual(RecordParser(text, record_type).parse(), expected)
+        records: List[Slotted] = RecordParser(self.text, Slotted, "data").parse()
+        self.assertEqual([(record.id, record.status) for record in records], [(1, "ok"), (2, "fail"), (3, "ok"), (4, "ok")])
+        with self.assertRaises(AttributeError):
+            records[0]._cache
+
+    def test_selection(self):
+        cases: Dict[Optional[str], List[int]] = {
+            "data": [1, 2, 3, 4],
+            "data[1:3]": [2, 3],
+            "data[-1]": [4],
+            'data[status="ok"&price>0]': [1],
+            "metadata": [],
+            "missing.data": [],
+        }
+        for path, ids in cases.items():
+            with self.subTest(path=path):
+                self.assertEqual([record.id for record in RecordParser(self.text, Frozen, path).parse()], ids)
+        self.assertEqual(RecordParser("[]", Point).parse(), [])
+
+    def test_invalid_input(self):
+        for text in ('[{"x": 1.e}]', '[{"x": 1 "y": 2}]', '[{"x": -}]', '[{"x": 1,}]', '[{"x" 1}]', '[{"label": "a}]', '"a"'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    RecordParser(text, Point).parse()
+        for record_type in (dict, int, "Point"):
+            with self.subTest(record_type=record_type):
+                with self.assertRaises(TypeError):
+                    RecordParser("[]", record_type)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json as jsonlib
+import time
+import tracemalloc
+import unittest
+from typing import Any
+
+from selectivejsonparser.parser import FrozenDict, FrozenList, Parser, ResultCache
+from selectivejsonparser.pattern import compile
+
+class TestResultCache(unittest.TestCase):
+    text: str = jsonlib.dumps({"config": {"name": "gateway", "routes": [{"path": "/a", "methods": ["GET"]}, {"path": "/b"}]}, "version": 3})
+
+    def test_hits_and_misses(self):
+        cache: ResultCache = ResultCache()
+        for pattern in (None, "config.routes[path]", compile("version"), "missing"):
+            with self.subTest(pattern=pattern):
+                first: Any = cache.parse(self.text, pattern)
+                second: Any = cache.parse(self.text.encode(), pattern)
+                self.assertEqual(first, Parser(self.text, pattern).parse())
+                self.assertEqual(second, first)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (4, 4, 4))
+        cache.parse(self.text, "config.routes[path]")
+        cache.parse(self.text.replace("3", "4"), "config.routes[path]")
+        self.assertEqual((cache.hits, cache.misses), (5, 5))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(ValueError):
+            cache.parse('{"a": [1, 2}')
+        self.assertEqual(len(cache), 0)
+
+    def test_large_text_is_hashed_in_slices(self):
+        text: str = jsonlib.dumps([{"id": 1}, "ü☃😀" * 300000], ensure_ascii=False)
+        data: bytes = text.encode("utf-8")
+        cache: ResultCache = ResultCache()
+        first: Any = cache.parse(text, "[id]")
+        tracemalloc.start()
+        second: Any = cache.parse(data, "[id]")
+        third: Any = cache.parse(text, "[id]")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(second, first)
+        self.assertEqual(third, first)
+        # Encoding the whole text would take three times its length in bytes.
+        self.assertLess(peak, len(text))
+
+    def test_read_only(self):
+        cache: ResultCache = ResultCache()
+        result: Any = cache.parse(self.text)
+        routes: Any = result["config"]["routes"]
+        self.assertIsInstance(result, FrozenDict)
+        self.assertIsInstance(routes, FrozenList)
+        self.assertEqual(routes[0]["methods"], ["GET"])
+        self.assertEqual([route["path"] for route in routes], ["/a", "/b"])
+        self.assertEqual(routes[-1:], [{"path": "/b"}])
+        for mutate in (lambda: result.__setitem__("version", 4), lambda: routes.append({}), lambda: routes[0]["methods"].pop()):
+            with self.assertRaises((TypeError, AttributeError)):
+                mutate()
+        copy: Any = result.materialize()
+        copy["config"]["routes"][0]["methods"].append("POST")
+        self.assertIsInstance(copy["config"]["routes"], list)
+        self.assertEqual(cache.parse(self.text), jsonlib.loads(self.text))
+
+    def test_eviction(self):
+        cache: ResultCache = ResultCache(maxsize=2)
+        for value in (1, 2, 1, 3):
+            cache.parse(f'[{value}]')
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        cache.parse("[1]")
+        cache.parse("[2]")
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        cache = ResultCache(ttl=0.05)
+        cache.parse("[1]")
+        cache.parse("[1]")
+        time.sleep(0.06)
+        cache.parse("[1]")
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 2, 1))
+        for maxsize, ttl in ((0, None), (1, 0)):
+            with self.subTest(maxsize=maxsize, ttl=ttl):
+                with self.assertRaises(ValueError):
+                    ResultCache(maxsize, ttl)
+
+if __name__ == "__main__":
+    unittest.main()
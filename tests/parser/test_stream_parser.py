@@ -0,0 +1,93 @@
+import io
+import json as jsonlib
+import unittest
+from typing import Iterator, List
+
+from selectivejsonparser.parser import Parser, StreamParser, json
+
+def chunked(data: bytes, size: int) -> Iterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+class TestStreamParser(unittest.TestCase):
+    text: str = jsonlib.dumps({
+        "metadata": {"timestamp": 1700000000, "source": "sénsor ☃ 😀"},
+        "data": {"results": [{"id": i, "status": "ok" if i % 2 else "fail", "score": i * 1.5e-3, "flag": i % 3 == 0, "note": None} for i in range(50)]},
+        "escaped": "quote \" and backslash \\\\ and ]}",
+    }, ensure_ascii=False)
+
+    def test_matches_in_memory_parser(self):
+        data: bytes = self.text.encode("utf-8")
+        patterns: List[str] = [None, "metadata.timestamp", "data.results[id|status]", "escaped", "metadata",
+                               "data.results[2:5].id", "data.results[-2:]", "data.results[-1].status",
+                               "..id", "data.results.*.flag", "..source", 'data.results[status="ok"&id>40].score']
+        for pattern in patterns:
+            expected: json = Parser(self.text, pattern).parse()
+            for size in (1, 2, 3, 7, 64, 4096):
+                with self.subTest(pattern=pattern, size=size):
+                    result: json = StreamParser(chunked(data, size), pattern).parse()
+                    self.assertEqual(result, expected)
+
+    def test_file_object(self):
+        data: bytes = self.text.encode("utf-8")
+        result: json = StreamParser(io.BytesIO(data), "data.results[id]", chunk_size=5).parse()
+        self.assertEqual(result, Parser(self.text, "data.results[id]").parse())
+
+    def test_releases_consumed_input(self):
+        records: str = ",".join('{"id": %d, "payload": "%s"}' % (i, "x" * 100) for i in range(2000))
+        data: bytes = ('{"records": [%s], "last": 1}' % records).encode("utf-8")
+        parser: StreamParser = StreamParser(chunked(data, 1024), "last", chunk_size=1024)
+        self.assertEqual(parser.parse(), {"last": 1})
+        self.assertLess(len(parser.text), 4096)
+
+    def test_pinned_buffer_grows_geometrically(self):
+        class Counting(StreamParser):
+            fills: int = 0
+
+            def _fill(self) -> bool:
+                self.fills += 1
+                return super()._fill()
+
+        data: bytes = b'{"data": [' + b','.join(b'{"id": %d, "pad": "%s"}' % (i, b"x" * 60) for i in range(20000)) + b']}'
+        for name, source in (("iterable", chunked(data, 90)), ("file", io.BytesIO(data))):
+            with self.subTest(source=name):
+                parser: Counting = Counting(source, "data[-1].id", chunk_size=90)
+                self.assertEqual(parser.parse(), {"data": [{"id": 19999}]})
+                # Each fill copies the buffer, so reading a chunk at a time would take quadratic time.
+                self.assertLess(parser.fills, 64)
+
+    def test_early_exit_stops_reading(self):
+        chunks: List[bytes] = [b'{"metadata": {"timestamp": 1}, "data": [']
+        stream: Iterator[bytes] = iter(chunks + [b'{"id": %d},' % i for i in range(1000)])
+        self.assertEqual(StreamParser(stream, "metadata.timestamp", early_exit=True).parse(), {"metadata": {"timestamp": 1}})
+        self.assertEqual(len(list(stream)), 1000)
+
+    def test_iter_matches_releases_yielded_items(self):
+        data: bytes = self.text.encode("utf-8")
+        for pattern in ("data.results[id|status]", "data.results[-3:].id", 'data.results[status="ok"].score'):
+            expected: json = Parser(self.text, pattern).parse()["data"]["results"]
+            for size in (1, 7, 4096):
+                with self.subTest(pattern=pattern, size=size):
+                    matches = list(StreamParser(chunked(data, size), pattern).iter_matches())
+                    self.assertEqual([value for _, value in matches], expected)
+        parser: StreamParser = StreamParser(chunked(b'[' + b','.join(b'{"id": %d, "pad": "%s"}' % (i, b"x" * 100) for i in range(2000)) + b']', 64), "[id]", chunk_size=256)
+        for path, value in parser.iter_matches():
+            self.assertEqual(value, {"id": path[0]})
+            self.assertLess(len(parser.text), 1024)
+
+    def test_invalid_input(self):
+        with self.subTest("Truncated document"):
+            with self.assertRaises(ValueError):
+                StreamParser(chunked(b'{"key": [1, 2', 3)).parse()
+        with self.subTest("Truncated skipped container"):
+            with self.assertRaises(ValueError):
+                StreamParser(chunked(b'{"other": {"a": [1, 2}', 3), "key").parse()
+        with self.subTest("Truncated UTF-8 sequence"):
+            with self.assertRaises(ValueError):
+                StreamParser(chunked('{"key": "é"}'.encode("utf-8")[:-3], 2)).parse()
+        with self.subTest("Trailing data"):
+            with self.assertRaises(ValueError):
+                StreamParser(chunked(b'{"key": 1} x', 4)).parse()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import pickle
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from selectivejsonparser.pattern import Pattern, compile
 from selectivejsonparser.pattern.pattern_parser import PatternParser
-from selectivejsonparser.pattern.element import Element, Dictionary, Array, Value
+from selectivejsonparser.pattern.element import Element, Dictionary, Array, Value, Union
 
 class TestPattern(unittest.TestCase):
     def test_single_key(self):
@@ -20,3 +23,94 @@ class TestPattern(unittest.TestCase):
         self.assertIsInstance(result["key1"], Dictionary)
         self.assertIn("key2", result["key1"])
         self.assertIsInstance(result["key1"]["key2"], Value)
+
+    def test_compile_is_cached(self):
+        pattern: Pattern = compile("key1.key2")
+        self.assertIs(compile("key1.key2"), pattern)
+        self.assertEqual(pattern, Pattern("key1.key2"))
+        self.assertIsInstance(pattern.element, Dictionary)
+        self.assertTrue(pattern.has_pattern)
+        self.assertFalse(compile(None).has_pattern)
+
+    def test_equality_follows_the_tree(self):
+        self.assertEqual(compile("a|b.c"), compile("(a|b).c"))
+        self.assertEqual(hash(compile("a|b.c")), hash(compile("(a|b).c")))
+        self.assertEqual(compile('..a[x="1"&y?][-2:]'), Pattern('..a[x="1"&y?][-2:]'))
+        for first, second in (("a.b", "a.c"), ("[0:2]", "[0:3]"), ("[x=1]", "[x=true]"), ("..a", "a"), ("*", "a"), (None, "")):
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(compile(first), compile(second))
+        upper: Pattern = compile("a.b").map_keys(str.upper)
+        self.assertEqual(upper, compile("A.B"))
+        self.assertNotEqual(upper, compile("a.b"))
+        self.assertEqual(Pattern.from_element("a.b", compile("c").element), compile("c"))
+
+    def test_map_keys(self):
+        cases = {
+            "a|b.c": "A|B.C",
+            "[a][1:].b": "[A][1:].B",
+            "*.a": "*.A",
+            '[a="x"&b?].c': '[A="X"&B?].C',
+            "..a.b": "..A.B",
+        }
+        for pattern, expected in cases.items():
+            with self.subTest(pattern=pattern):
+                self.assertEqual(compile(pattern).map_keys(str.upper), compile(expected))
+        # Recursive searches build unions of states as they are entered.
+        state: Element = compile("..a.b").element["a"]
+        self.assertIsInstance(state, Union)
+        self.assertEqual(state.map_keys(str.upper), compile("..A.B").element["A"])
+
+    def test_pickle(self):
+        for pattern in (compile("a[0:2].b"), compile(None), compile("..a[x=1]"), compile("a|b").map_keys(str.upper),
+                        Pattern.from_element("a", compile("b").element)):
+            with self.subTest(pattern=pattern):
+                copy: Pattern = pickle.loads(pickle.dumps(pattern))
+                self.assertEqual(copy, pattern)
+                self.assertEqual(copy.pattern, pattern.pattern)
+        self.assertIs(pickle.loads(pickle.dumps(compile("a.b"))), compile("a.b"))
+        self.assertNotEqual(pickle.loads(pickle.dumps(Pattern.from_element("a", compile("b").element))), compile("a"))
+
+    def test_needles(self):
+        cases = {
+            None: None,
+            "a|c.b": ('"a"', '"c"'),
+            "(a|b).c": ('"a"', '"b"'),
+            "..id": ('"id"',),
+            "*.id": None,
+            "[id]": None,
+        }
+        for pattern, expected in cases.items():
+            with self.subTest(pattern=pattern):
+                needles = compile(pattern).needles
+                self.assertEqual(None if needles is None else tuple(sorted(needles)), expected)
+
+    def test_compiled_pattern_is_immutable(self):
+        pattern: Pattern = compile("key")
+        with self.assertRaises(AttributeError):
+            pattern.element = None
+        with self.assertRaises(AttributeError):
+            pattern.stack = []
+
+    def test_search_caches_are_bounded(self):
+        from selectivejsonparser.parser import Parser
+        from selectivejsonparser.pattern import element
+        text: str = "{" + ", ".join('"k%d": {"id": %d, "x%d": [%d]}' % (i, i, i, i) for i in range(3000)) + "}"
+        for pattern in ("..id", "..*.id"):
+            with self.subTest(pattern=pattern):
+                compiled: Pattern = Pattern(pattern)
+                Parser(text, compiled).parse()
+                self.assertLessEqual(len(compiled.element.transitions), element._MAX_TRANSITIONS)
+        named: Pattern = Pattern("..id")
+        self.assertEqual(len(Parser(text, named).parse()["k0"]), 1)
+        # Keys the search does not name lead back to it, and are not kept.
+        self.assertEqual(list(named.element.transitions), ["id"])
+
+    def test_compiled_pattern_shared_across_threads(self):
+        from selectivejsonparser.parser import Parser
+        pattern: Pattern = compile("users[name]")
+        text: str = '{"users": [' + ", ".join('{"name": "n%d", "age": %d}' % (i, i) for i in range(200)) + ']}'
+        expected = {"users": [{"name": "n%d" % i} for i in range(200)]}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: Parser(text, pattern).parse(), range(32)))
+        for result in results:
+            self.assertEqual(result, expected)
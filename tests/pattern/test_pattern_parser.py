@@ -1,6 +1,6 @@
 import unittest
 from selectivejsonparser.pattern import PatternParser
-from selectivejsonparser.pattern.element import Element, Dictionary, Array, Value
+from selectivejsonparser.pattern.element import Element, Dictionary, Array, Value, Descendant, Filter, Union
 from typing import List
 
 class TestPattern(unittest.TestCase):
@@ -54,7 +54,87 @@ class TestPattern(unittest.TestCase):
         self.assertIsInstance(array[0]["key3"], Dictionary)
         self.assertIn("key5", array[0]["key3"])
         self.assertIsInstance(array[0]["key3"]["key5"], Value)
-        
+
+    def test_slices(self):
+        cases = {"items[0:100].id": (0, 100), "items[5]": (5, 6), "items[-1]": (-1, None), "items[-3:-1]": (-3, -1),
+                 "items[:10]": (None, 10), "items[2:]": (2, None), "items[:]": (None, None)}
+        for pattern, (start, stop) in cases.items():
+            with self.subTest(pattern=pattern):
+                array: Element = PatternParser(pattern).parse()["items"]
+                self.assertIsInstance(array, Array)
+                self.assertEqual((array.start, array.stop), (start, stop))
+        array = PatternParser("items[0:100].id").parse()["items"]
+        self.assertIsInstance(array[99], Dictionary)
+        self.assertIsNone(array[100])
+        self.assertTrue(array.exhausted(100))
+        self.assertIsInstance(PatternParser("items[1st]").parse()["items"][0], Dictionary)
+        with self.assertRaises(ValueError):
+            PatternParser("items[-]").parse()
+
+    def test_wildcard(self):
+        result: Element = PatternParser("a.*.b").parse()
+        self.assertIsInstance(result["a"]["anything"], Dictionary)
+        self.assertIs(result["a"]["x"], result["a"][0])
+        self.assertIsInstance(result["a"]["x"]["b"], Value)
+        self.assertIsNone(result["a"]["x"]["c"])
+
+    def test_descendant(self):
+        result: Element = PatternParser("a..id.x").parse()
+        search: Element = result["a"]
+        self.assertIsInstance(search, Descendant)
+        self.assertFalse(search.accepts)
+        self.assertEqual(search.needles, ('"id"',))
+        self.assertIs(search["other"], search)
+        self.assertIs(search[3], search)
+        found: Element = search["id"]
+        self.assertIsInstance(found, Union)
+        self.assertTrue(found.accepts)
+        self.assertIs(search["id"], found)
+        self.assertIsInstance(found["x"], Value)
+        self.assertIs(found["y"], search)
+        with self.assertRaises(ValueError):
+            PatternParser("a..").parse()
+
+    def test_predicates(self):
+        result: Element = PatternParser('users[status="a b"&age>=18.5&email?&ok=true].name').parse()
+        selected: Element = result["users"][0]
+        self.assertIsInstance(selected, Filter)
+        self.assertFalse(selected.accepts)
+        self.assertEqual([(predicate.field, predicate.operator, predicate.value) for predicate in selected.predicates],
+                         [("status", "==", "a b"), ("age", ">=", 18.5), ("email", "?", None), ("ok", "==", True)])
+        self.assertIsInstance(selected.passed["name"], Value)
+        self.assertIsNone(selected.failed)
+        self.assertIsInstance(PatternParser("[name]").parse()[0], Dictionary)
+        for pattern in ("a[b=]", "a[b=x]", 'a[b="x"', "a[b=1&]"):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(ValueError):
+                    PatternParser(pattern).parse()
+
+    def test_flags(self):
+        result: Element = PatternParser("a[b|c.d[1:3]..e]").parse()
+        self.assertTrue(result.any_index)
+        self.assertEqual(result.selected_keys, 1)
+        self.assertTrue(result.has_descendants)
+        array: Element = result["a"]
+        self.assertTrue(array.any_index)
+        self.assertIs(array.items, array[0])
+        self.assertTrue(array.plain)
+        self.assertEqual(array.items.selected_keys, 2)
+        sliced: Element = array.items["b"]["d"]
+        self.assertFalse(sliced.any_index)
+        self.assertIsNone(sliced.items)
+        descendant: Element = sliced[1]
+        self.assertIsInstance(descendant, Descendant)
+        self.assertTrue(descendant.any_index)
+        self.assertIs(descendant.items, descendant)
+        self.assertFalse(descendant.plain)
+        leaf: Element = PatternParser("a.b").parse()["a"]["b"]
+        self.assertTrue(leaf.leaf)
+        self.assertFalse(leaf.has_descendants)
+        self.assertFalse(PatternParser("a[b=1]").parse()["a"][0].plain)
+        with self.assertRaises(AttributeError):
+            result.extra = None
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file